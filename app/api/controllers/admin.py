@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 import json
 import secrets
 from typing import List, Optional
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session
 from app.api.models.user import AdminUser
 from app.api.models.warehouse import AdminWarehouse
 from app.api.repositories.admin import AdminRepository
+from app.api.repositories.analytics import AnalyticsRepository
 from app.api.schemas.user import (
     AdminDashboardResponse,
     AdminUserCreate,
@@ -25,7 +26,7 @@ from app.api.utils.user import AuthUtils
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core import settings
 from app.core.databases.postgres import get_general_session
-from models.admin_model import OrderBaseModel
+from app.core.models.enums import HistogramBucketEnum, HistogramMetricEnum
 
 settings = settings.get_settings()
 
@@ -263,30 +264,16 @@ class AdminController:
         return await self.__admin_repo.get_admin_dashboard(warehouse_id)
 
     async def get_hourly_orders_today_formatted(self, warehouse_id: int):
-        hourly_orders = await self.__admin_repo.get_hourly_orders_today(warehouse_id)
-
         tashkent_tz = ZoneInfo('Asia/Tashkent')
-        now_tashkent = datetime.now(timezone.utc).astimezone(tashkent_tz)
-
-        now_temp = now_tashkent
-
-        start_of_day_tashkent = now_temp.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_of_day_tashkent = now_tashkent
-
-        result = {}
-        current_time = start_of_day_tashkent
-        while current_time <= end_of_day_tashkent:
-            display_hour_key = current_time.strftime("%H:00")
-            result[display_hour_key] = get_hour_order_count(time=current_time, orders=hourly_orders)
-            current_time += timedelta(hours=1)
+        now_tashkent = datetime.now(timezone.utc).astimezone(tashkent_tz).replace(tzinfo=None)
 
-        return result
-
-
-def get_hour_order_count(time: datetime, orders: List[OrderBaseModel]):
-    counter = 0
-    for order in orders:
-        if order.updated_at.hour == time.hour:
-            counter += 1
+        hourly_orders = await AnalyticsRepository(self.__session).get_order_histogram(
+            warehouse_id=warehouse_id,
+            start_date=now_tashkent.replace(hour=0, minute=0, second=0, microsecond=0),
+            end_date=now_tashkent,
+            bucket=HistogramBucketEnum.hour,
+            metric=HistogramMetricEnum.orders,
+            timezone='Asia/Tashkent',
+        )
 
-    return counter
+        return {point.bucket.strftime("%H:00"): int(point.value) for point in hourly_orders}
@@ -1,4 +1,5 @@
-from typing import Any, Coroutine, List
+from datetime import datetime
+from typing import Any, Coroutine, List, Optional
 
 from fastapi import HTTPException
 
@@ -6,11 +7,12 @@ from fastapi import Depends
 
 from app.api.models import AdminOrder
 from app.api.repositories.adminorder import AdminOrderRepository
-from app.api.schemas.order import AdminOrderResponse, OrderItemRequest, AdminOrderUpdate
+from app.api.schemas.order import AdminOrderItemResponse, AdminOrderResponse, AdminOrderSummaryResponse, OrderItemRequest, AdminOrderUpdate, OfflineOrderSyncRequest, OfflineOrderSyncResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.utils.check_language import check_language
 from app.core.databases.postgres import get_general_session
+from app.core.models.enums import PaymentMethodEnum
 
 
 class AdminOrderController:
@@ -36,6 +38,37 @@ class AdminOrderController:
             return result
         return []
 
+    async def get_closed_order_summaries(
+            self,
+            admin_id: int,
+            limit: int,
+            offset: int,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            payment_type: Optional[PaymentMethodEnum] = None,
+            seller_id: Optional[int] = None,
+    ) -> List[AdminOrderSummaryResponse]:
+        return await self.__admin_order_repository.get_closed_order_summaries(
+            admin_id=admin_id,
+            limit=limit,
+            offset=offset,
+            start_date=start_date,
+            end_date=end_date,
+            payment_type=payment_type,
+            seller_id=seller_id,
+        )
+
+    async def get_order_items(self, admin_id: int, order_id: int, language: str) -> List[AdminOrderItemResponse]:
+        await check_language(language)
+        result = await self.__admin_order_repository.get_order_items(admin_id, order_id, language)
+
+        if result is not None:
+            return result
+        raise HTTPException(
+            status_code=400,
+            detail="Order not found."
+        )
+
     async def get_order_by_id(self, order_id: int, language: str) -> AdminOrderResponse | None:
         await check_language(language)
         result = await self.__admin_order_repository.get_order_by_id(order_id, language)
@@ -71,6 +104,16 @@ class AdminOrderController:
 
         return results
 
+    async def sync_offline_orders(self, admin_id: int, data: List[OfflineOrderSyncRequest], language: str, warehouse_id: int) -> List[OfflineOrderSyncResult]:
+        await check_language(language)
+        if not data:
+            return []
+        return await self.__admin_order_repository.sync_offline_orders(
+            admin_id=admin_id,
+            orders=data,
+            warehouse_id=warehouse_id
+        )
+
     async def close_current_order(self, admin_id: int, data: AdminOrderUpdate, language: str) -> dict | None:
         await check_language(language)
         if await self.__admin_order_repository.get_admin_current_order(admin_id=admin_id, language=language):
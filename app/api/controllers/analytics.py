@@ -0,0 +1,603 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from typing import List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.repositories.analytics import BUCKET_STEPS, STORAGE_TIMEZONE, AnalyticsRepository
+from app.api.repositories.product.forecast import DemandForecastRepository
+from app.api.repositories.product.low_stock import LowStockAlertRepository
+from app.api.repositories.product.valuation import InventoryValuationRepository
+from app.api.schemas.analytics import (
+    ComparisonPoint,
+    ComparisonValue,
+    DeadStockItem,
+    DeadStockResponse,
+    HistogramResponse,
+    InventoryClassificationResponse,
+    InventoryClassItem,
+    InventoryValuationEntry,
+    InventoryValuationHistoryResponse,
+    InventoryValuationPoint,
+    InventoryValuationResponse,
+    LowStockAlertResponse,
+    LowStockThresholdResponse,
+    LowStockThresholdUpdate,
+    MultiWarehouseKpiResponse,
+    PeriodComparisonResponse,
+    ReorderSuggestion,
+    SalesHeatmapResponse,
+    SellerLeaderboardEntry,
+    SellerLeaderboardResponse,
+    WarehouseKpis,
+)
+from app.api.services.inventory_classification import build_matrices, classify
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import (
+    AdminOrderStatusEnum,
+    ClassificationPeriodEnum,
+    ComparisonBucketEnum,
+    ComparisonModeEnum,
+    DeadStockSortEnum,
+    HistogramBucketEnum,
+    HistogramMetricEnum,
+    LeaderboardSortEnum,
+)
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+MAX_HISTOGRAM_BUCKETS = 5000
+DEFAULT_LEADERBOARD_DAYS = 30
+DEFAULT_KPI_DAYS = 30
+DEFAULT_VALUATION_HISTORY_DAYS = 90
+MAX_KPI_WAREHOUSES = 50
+
+DEFAULT_HEATMAP_DAYS = 28
+MAX_HEATMAP_DAYS = 366
+# (warehouse_id, start_date, end_date, metric, timezone, seller_id) -> SalesHeatmapResponse
+heatmap_cache = TTLCache(maxsize=1024, ttl=settings.SALES_HEATMAP_CACHE_TTL_SECONDS)
+
+MAX_COMPARISON_BUCKETS = 1000
+DEFAULT_COMPARISON_BUCKETS = 12
+# Approximate bucket lengths, only used for defaults and the bucket limit.
+COMPARISON_BUCKET_DAYS = {
+    ComparisonBucketEnum.day: 1,
+    ComparisonBucketEnum.week: 7,
+    ComparisonBucketEnum.month: 30,
+    ComparisonBucketEnum.quarter: 91,
+    ComparisonBucketEnum.year: 365,
+}
+# Buckets back to the same period last year; 364 days and 52 weeks keep weekdays aligned.
+PREVIOUS_YEAR_LAGS = {
+    ComparisonBucketEnum.day: 364,
+    ComparisonBucketEnum.week: 52,
+    ComparisonBucketEnum.month: 12,
+    ComparisonBucketEnum.quarter: 4,
+    ComparisonBucketEnum.year: 1,
+}
+
+# (warehouse_id, start_day, end_day, sort_by, limit) -> SellerLeaderboardResponse
+leaderboard_cache = TTLCache(maxsize=1024, ttl=settings.LEADERBOARD_CACHE_TTL_SECONDS)
+
+CLASSIFICATION_PERIOD_DAYS = {
+    ClassificationPeriodEnum.week: 7,
+    ClassificationPeriodEnum.month: 30,
+}
+# (warehouse_id, end_date, period, periods, language) -> InventoryClassificationResponse
+classification_cache = TTLCache(maxsize=256, ttl=settings.INVENTORY_CLASSIFICATION_CACHE_TTL_SECONDS)
+
+
+class AnalyticsController:
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.__session = session
+        self.__analytics_repository = AnalyticsRepository(session=self.__session)
+        self.__forecast_repository = DemandForecastRepository(session=self.__session)
+        self.__low_stock_repository = LowStockAlertRepository(session=self.__session)
+        self.__valuation_repository = InventoryValuationRepository(session=self.__session)
+
+    async def get_order_histogram(
+            self,
+            warehouse_id: int,
+            start_date: Optional[datetime],
+            end_date: Optional[datetime],
+            bucket: HistogramBucketEnum,
+            metric: HistogramMetricEnum,
+            timezone: str,
+            status: Optional[AdminOrderStatusEnum] = None,
+    ) -> HistogramResponse:
+        try:
+            tz = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Unknown timezone {timezone}")
+
+        now_local = datetime.now(dt_timezone.utc).astimezone(tz).replace(tzinfo=None)
+        end_date = self._to_local(end_date, tz) if end_date else now_local
+        start_date = self._to_local(start_date, tz) if start_date else end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+
+        if start_date >= end_date:
+            raise HTTPException(status_code=400, detail="start_date must be before end_date")
+        if (end_date - start_date) / BUCKET_STEPS[bucket] > MAX_HISTOGRAM_BUCKETS:
+            raise HTTPException(status_code=400, detail="Too many buckets, choose a larger bucket or a shorter range")
+
+        points = await self.__analytics_repository.get_order_histogram(
+            warehouse_id=warehouse_id,
+            start_date=start_date,
+            end_date=end_date,
+            bucket=bucket,
+            metric=metric,
+            timezone=timezone,
+            status=status,
+        )
+
+        return HistogramResponse(
+            warehouse_id=warehouse_id,
+            bucket=bucket,
+            metric=metric,
+            status=status,
+            timezone=timezone,
+            start_date=start_date,
+            end_date=end_date,
+            points=points,
+        )
+
+    async def get_sales_heatmap(
+            self,
+            warehouse_id: int,
+            start_date: Optional[date],
+            end_date: Optional[date],
+            metric: HistogramMetricEnum,
+            timezone: str,
+            seller_id: Optional[int] = None,
+    ) -> SalesHeatmapResponse:
+        try:
+            tz = ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise HTTPException(status_code=400, detail=f"Unknown timezone {timezone}")
+
+        end_date = end_date or datetime.now(tz).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_HEATMAP_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+        if (end_date - start_date).days >= MAX_HEATMAP_DAYS:
+            raise HTTPException(status_code=400, detail=f"Range must not exceed {MAX_HEATMAP_DAYS} days")
+
+        key = (warehouse_id, start_date, end_date, metric, timezone, seller_id)
+        cached = heatmap_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = await self.__analytics_repository.get_sales_heatmap(
+            warehouse_id=warehouse_id,
+            start_date=datetime.combine(start_date, datetime.min.time()),
+            end_date=datetime.combine(end_date + timedelta(days=1), datetime.min.time()),
+            metric=metric,
+            timezone=timezone,
+            seller_id=seller_id,
+        )
+
+        matrix = [[0.0] * 24 for _ in range(7)]
+        for row in rows:
+            matrix[row.weekday][row.hour] = float(row.value)
+
+        response = SalesHeatmapResponse(
+            warehouse_id=warehouse_id,
+            metric=metric,
+            timezone=timezone,
+            seller_id=seller_id,
+            start_date=start_date,
+            end_date=end_date,
+            matrix=matrix,
+            total=sum(map(sum, matrix)),
+        )
+
+        heatmap_cache[key] = response
+        return response
+
+    async def get_period_comparison(
+            self,
+            warehouse_id: int,
+            start_date: Optional[date],
+            end_date: Optional[date],
+            bucket: ComparisonBucketEnum,
+            compare: ComparisonModeEnum,
+    ) -> PeriodComparisonResponse:
+        bucket_days = COMPARISON_BUCKET_DAYS[bucket]
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        start_date = start_date or end_date - timedelta(days=bucket_days * DEFAULT_COMPARISON_BUCKETS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+        if (end_date - start_date).days / bucket_days > MAX_COMPARISON_BUCKETS:
+            raise HTTPException(status_code=400, detail="Too many buckets, choose a larger bucket or a shorter range")
+
+        rows = await self.__analytics_repository.get_period_comparison(
+            warehouse_id=warehouse_id,
+            start_day=start_date,
+            end_day=end_date,
+            bucket=bucket,
+            lag=1 if compare == ComparisonModeEnum.previous_bucket else PREVIOUS_YEAR_LAGS[bucket],
+        )
+
+        points = [
+            ComparisonPoint(
+                bucket=row.bucket.date(),
+                previous_bucket=row.previous_bucket.date(),
+                **self._compare_metrics(
+                    row.revenue, row.previous_revenue,
+                    row.orders, row.previous_orders,
+                    row.items, row.previous_items,
+                ),
+            )
+            for row in rows
+        ]
+
+        return PeriodComparisonResponse(
+            warehouse_id=warehouse_id,
+            bucket=bucket,
+            compare=compare,
+            start_date=start_date,
+            end_date=end_date,
+            totals=self._compare_metrics(
+                sum(row.revenue for row in rows), sum(row.previous_revenue for row in rows),
+                sum(row.orders for row in rows), sum(row.previous_orders for row in rows),
+                sum(row.items for row in rows), sum(row.previous_items for row in rows),
+            ),
+            points=points,
+        )
+
+    async def get_seller_leaderboard(
+            self,
+            warehouse_id: int,
+            start_date: Optional[date],
+            end_date: Optional[date],
+            sort_by: LeaderboardSortEnum,
+            limit: int,
+    ) -> SellerLeaderboardResponse:
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_LEADERBOARD_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+        key = (warehouse_id, start_date, end_date, sort_by, limit)
+        cached = leaderboard_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = await self.__analytics_repository.get_seller_leaderboard(
+            warehouse_id=warehouse_id,
+            start_day=start_date,
+            end_day=end_date,
+            sort_by=sort_by,
+            limit=limit,
+        )
+
+        response = SellerLeaderboardResponse(
+            warehouse_id=warehouse_id,
+            start_date=start_date,
+            end_date=end_date,
+            sort_by=sort_by,
+            sellers=[
+                SellerLeaderboardEntry(
+                    rank=row.rank,
+                    id=row.id,
+                    full_name=row.full_name,
+                    phone_number=row.phone_number,
+                    profile_picture=row.profile_picture,
+                    role_name=row.role_name,
+                    order_count=row.order_count or 0,
+                    items_sold=float(row.items_sold or 0),
+                    total_revenue=row.total_revenue or 0,
+                    total_revenue_with_discount=row.total_revenue_with_discount or 0,
+                    average_basket=row.average_basket,
+                    margin=row.margin or 0,
+                    margin_percent=float(row.margin_percent),
+                )
+                for row in rows
+            ],
+        )
+
+        leaderboard_cache[key] = response
+        return response
+
+    async def get_warehouse_kpis(
+            self,
+            warehouse_ids: List[int],
+            start_date: Optional[date],
+            end_date: Optional[date],
+    ) -> MultiWarehouseKpiResponse:
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_KPI_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+        rows = await self.__analytics_repository.get_warehouse_kpis(
+            warehouse_ids=warehouse_ids,
+            start_day=start_date,
+            end_day=end_date,
+        )
+
+        warehouses = [WarehouseKpis(**row._asdict()) for row in rows if row.warehouse_id is not None]
+        total = next(row for row in rows if row.warehouse_id is None)
+
+        return MultiWarehouseKpiResponse(
+            start_date=start_date,
+            end_date=end_date,
+            warehouses=warehouses,
+            total=WarehouseKpis(**{**total._asdict(), "warehouse_name": None}),
+        )
+
+    async def get_inventory_classification(
+            self,
+            warehouse_id: int,
+            end_date: Optional[date],
+            period: ClassificationPeriodEnum,
+            periods: int,
+            language: str,
+    ) -> InventoryClassificationResponse:
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        period_days = CLASSIFICATION_PERIOD_DAYS[period]
+        # Whole periods only, so the last one is not artificially short.
+        start_date = end_date - timedelta(days=period_days * periods - 1)
+
+        key = (warehouse_id, end_date, period, periods, language)
+        cached = classification_cache.get(key)
+        if cached is not None:
+            return cached
+
+        rows = await self.__analytics_repository.get_variant_period_sales(
+            warehouse_id=warehouse_id,
+            start_day=start_date,
+            end_day=end_date,
+            period_days=period_days,
+            language=language,
+        )
+        labels = {row.id: (str(row.barcode), row.product_name or "") for row in rows}
+        result = await asyncio.to_thread(self._classify_rows, rows, periods)
+
+        items = [
+            InventoryClassItem(
+                variant_id=variant_id,
+                barcode=labels[variant_id][0],
+                product_name=labels[variant_id][1],
+                revenue=revenue,
+                revenue_share=share,
+                cumulative_share=cumulative,
+                quantity=quantity,
+                mean_demand=mean,
+                cv=None if cv != cv else cv,
+                abc=abc,
+                xyz=xyz,
+            )
+            for variant_id, revenue, share, cumulative, quantity, mean, cv, abc, xyz in zip(
+                result.variant_ids.tolist(),
+                result.revenue.tolist(),
+                result.revenue_share.tolist(),
+                result.cumulative_share.tolist(),
+                result.quantity.tolist(),
+                result.mean_demand.tolist(),
+                result.cv.tolist(),
+                result.abc.tolist(),
+                result.xyz.tolist(),
+            )
+        ]
+
+        groups, counts = np.unique(np.char.add(result.abc, result.xyz), return_counts=True)
+        response = InventoryClassificationResponse(
+            warehouse_id=warehouse_id,
+            start_date=start_date,
+            end_date=end_date,
+            period=period,
+            periods=periods,
+            summary=dict(zip(groups.tolist(), counts.tolist())),
+            items=items,
+        )
+
+        classification_cache[key] = response
+        return response
+
+    async def get_reorder_suggestions(self, warehouse_id: int, limit: int, offset: int, language: str) -> List[ReorderSuggestion]:
+        rows = await self.__forecast_repository.get_reorder_list(warehouse_id, limit, offset)
+
+        return [
+            ReorderSuggestion(
+                variant_id=forecast.product_variant_id,
+                barcode=str(barcode),
+                product_name=(name or {}).get(language, ""),
+                stock=amount,
+                daily_demand=forecast.daily_demand,
+                days_of_cover=forecast.days_of_cover,
+                stockout_date=forecast.stockout_date,
+                reorder_point=forecast.reorder_point,
+                suggested_order_quantity=forecast.suggested_order_quantity,
+                computed_at=forecast.computed_at,
+            )
+            for forecast, barcode, amount, name in rows
+        ]
+
+    async def get_low_stock_alerts(self, warehouse_id: int, limit: int, offset: int, language: str) -> List[LowStockAlertResponse]:
+        rows = await self.__low_stock_repository.get_active_alerts(warehouse_id, limit, offset)
+
+        return [
+            LowStockAlertResponse(
+                id=alert.id,
+                variant_id=alert.product_variant_id,
+                product_id=product_id,
+                barcode=str(barcode),
+                product_name=(name or {}).get(language, ""),
+                amount=alert.amount,
+                threshold=alert.threshold,
+                triggered_at=alert.triggered_at,
+                notified_at=alert.notified_at,
+            )
+            for alert, barcode, product_id, name in rows
+        ]
+
+    async def set_low_stock_threshold(self, warehouse_id: int, data: LowStockThresholdUpdate) -> LowStockThresholdResponse:
+        if (data.variant_ids is None) == (data.subcategory_id is None):
+            raise HTTPException(status_code=400, detail="Provide either variant_ids or subcategory_id")
+
+        if data.variant_ids is not None:
+            evaluated = await self.__low_stock_repository.set_variant_thresholds(
+                warehouse_id, data.variant_ids, data.min_stock
+            )
+        else:
+            evaluated = await self.__low_stock_repository.set_subcategory_threshold(
+                warehouse_id, data.subcategory_id, data.min_stock
+            )
+
+        return LowStockThresholdResponse(evaluated_variant_ids=evaluated)
+
+    async def get_dead_stock(
+            self,
+            warehouse_id: int,
+            days: int,
+            max_sold: Optional[float],
+            sort_by: DeadStockSortEnum,
+            limit: int,
+            offset: int,
+            language: str,
+    ) -> DeadStockResponse:
+        now = datetime.now(ZoneInfo(STORAGE_TIMEZONE)).replace(tzinfo=None)
+        cutoff = now - timedelta(days=days)
+
+        rows = await self.__analytics_repository.get_dead_stock(
+            warehouse_id=warehouse_id,
+            cutoff=cutoff,
+            start_day=now.date() - timedelta(days=days - 1),
+            end_day=now.date(),
+            max_sold=max_sold,
+            sort_by=sort_by,
+            language=language,
+            limit=limit,
+            offset=offset,
+        )
+
+        return DeadStockResponse(
+            warehouse_id=warehouse_id,
+            days=days,
+            max_sold=max_sold,
+            sort_by=sort_by,
+            total_count=rows[0].total_count if rows else 0,
+            total_capital=float(rows[0].total_capital or 0) if rows else 0,
+            total_retail_value=float(rows[0].total_retail_value or 0) if rows else 0,
+            items=[
+                DeadStockItem(
+                    variant_id=row.id,
+                    product_id=row.product_id,
+                    barcode=str(row.barcode),
+                    product_name=row.product_name or "",
+                    amount=row.amount,
+                    come_in_price=row.come_in_price,
+                    current_price=row.current_price,
+                    capital=row.capital,
+                    retail_value=row.retail_value,
+                    sold_quantity=float(row.sold_quantity or 0),
+                    last_sold_at=row.last_sold_at,
+                    days_since_last_sale=(now - row.last_sold_at).days if row.last_sold_at else None,
+                )
+                for row in rows
+            ],
+        )
+
+    async def get_inventory_valuation(self, warehouse_id: int, language: str) -> InventoryValuationResponse:
+        rows = await self.__valuation_repository.get_current(warehouse_id, language)
+        subcategories = [
+            InventoryValuationEntry(
+                subcategory_id=row.subcategory_id,
+                subcategory_name=row.subcategory_name or "",
+                variants=row.variants,
+                quantity=row.quantity,
+                cost_value=row.cost_value,
+                retail_value=row.retail_value,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ]
+
+        return InventoryValuationResponse(
+            warehouse_id=warehouse_id,
+            variants=sum(entry.variants for entry in subcategories),
+            quantity=sum((entry.quantity for entry in subcategories), Decimal(0)),
+            cost_value=sum((entry.cost_value for entry in subcategories), Decimal(0)),
+            retail_value=sum((entry.retail_value for entry in subcategories), Decimal(0)),
+            subcategories=subcategories,
+        )
+
+    async def get_inventory_valuation_history(
+            self,
+            warehouse_id: int,
+            start_date: Optional[date],
+            end_date: Optional[date],
+            subcategory_id: Optional[int],
+    ) -> InventoryValuationHistoryResponse:
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_VALUATION_HISTORY_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+        rows = await self.__valuation_repository.get_history(warehouse_id, start_date, end_date, subcategory_id)
+
+        return InventoryValuationHistoryResponse(
+            warehouse_id=warehouse_id,
+            subcategory_id=subcategory_id,
+            start_date=start_date,
+            end_date=end_date,
+            points=[
+                InventoryValuationPoint(
+                    day=row.day,
+                    variants=row.variants,
+                    quantity=row.quantity,
+                    cost_value=row.cost_value,
+                    retail_value=row.retail_value,
+                )
+                for row in rows
+            ],
+        )
+
+    @staticmethod
+    def _compare(current, previous) -> ComparisonValue:
+        current, previous = float(current or 0), float(previous or 0)
+        return ComparisonValue(
+            current=current,
+            previous=previous,
+            delta=current - previous,
+            delta_percent=(current - previous) * 100 / previous if previous else None,
+        )
+
+    @classmethod
+    def _compare_metrics(cls, revenue, previous_revenue, orders, previous_orders, items, previous_items):
+        return {
+            "revenue": cls._compare(revenue, previous_revenue),
+            "orders": cls._compare(orders, previous_orders),
+            "items": cls._compare(items, previous_items),
+            "average_basket": cls._compare(
+                revenue / orders if orders else 0,
+                previous_revenue / previous_orders if previous_orders else 0,
+            ),
+        }
+
+    @staticmethod
+    def _classify_rows(rows, periods: int):
+        count = len(rows)
+        ids, quantity, revenue = build_matrices(
+            np.fromiter((row.id for row in rows), dtype=np.int64, count=count),
+            np.fromiter((-1 if row.period_index is None else row.period_index for row in rows), dtype=np.int64, count=count),
+            np.fromiter((row.quantity or 0 for row in rows), dtype=np.float64, count=count),
+            np.fromiter((row.revenue or 0 for row in rows), dtype=np.float64, count=count),
+            periods,
+        )
+        return classify(ids, quantity, revenue)
+
+    @staticmethod
+    def _to_local(value: datetime, tz: ZoneInfo) -> datetime:
+        return value if value.tzinfo is None else value.astimezone(tz).replace(tzinfo=None)
@@ -0,0 +1,74 @@
+import importlib.util
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.api.repositories.analytics import STORAGE_TIMEZONE
+from app.api.repositories.export import ExportRepository
+from app.api.utils.export_writer import csv_gzip_chunks, xlsx_chunks
+from app.core.databases.postgres import get_session_without_depends
+from app.core.models.enums import ExportFormatEnum, ExportReportEnum
+
+DEFAULT_EXPORT_DAYS = 30
+
+MEDIA_TYPES = {
+    ExportFormatEnum.csv: "application/gzip",
+    ExportFormatEnum.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXTENSIONS = {
+    ExportFormatEnum.csv: "csv.gz",
+    ExportFormatEnum.xlsx: "xlsx",
+}
+
+
+class ExportController:
+    async def export_report(
+            self,
+            warehouse_id: int,
+            report: ExportReportEnum,
+            export_format: ExportFormatEnum,
+            start_date: Optional[date],
+            end_date: Optional[date],
+            language: str,
+            revision_id: Optional[int] = None,
+    ) -> StreamingResponse:
+        end_date = end_date or datetime.now(ZoneInfo(STORAGE_TIMEZONE)).date()
+        start_date = start_date or end_date - timedelta(days=DEFAULT_EXPORT_DAYS - 1)
+
+        if start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+        if export_format == ExportFormatEnum.xlsx and importlib.util.find_spec("openpyxl") is None:
+            raise HTTPException(status_code=501, detail="XLSX export is not available, use csv")
+
+        if report == ExportReportEnum.variant_sales:
+            headers, stmt = ExportRepository.variant_sales_query(warehouse_id, start_date, end_date, language)
+        elif report == ExportReportEnum.orders:
+            headers, stmt = ExportRepository.order_lines_query(warehouse_id, start_date, end_date, language)
+        elif report == ExportReportEnum.stock_valuation:
+            headers, stmt = ExportRepository.stock_valuation_query(warehouse_id, language)
+        else:
+            headers, stmt = ExportRepository.revision_items_query(warehouse_id, start_date, end_date, language, revision_id)
+
+        rows = self._snapshot_rows(stmt)
+        body = xlsx_chunks(headers, rows) if export_format == ExportFormatEnum.xlsx else csv_gzip_chunks(headers, rows)
+        filename = f"{report.value}_{warehouse_id}_{start_date}_{end_date}.{EXTENSIONS[export_format]}"
+
+        return StreamingResponse(
+            body,
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    @staticmethod
+    async def _snapshot_rows(stmt) -> AsyncIterator[tuple]:
+        # The request session is closed before the body is streamed, so the
+        # export reads through its own read-only repeatable-read transaction.
+        async with get_session_without_depends() as session:
+            await session.connection(
+                execution_options={"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+            )
+            async for row in ExportRepository(session).stream(stmt):
+                yield row
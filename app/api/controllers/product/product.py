@@ -56,11 +56,11 @@ class ProductController:
         return await self.repository.get_all_products(warehouse_id, language)
 
     async def get_little_products_left(
-            self, warehouse_id: int, limit: int, offset: int, language: str | None, amount: int
+            self, warehouse_id: int, limit: int, offset: int, language: str | None, days: int = 14
     ) -> Sequence[ProductResponseSchema | ProductLanguageResponseSchema]:
         await check_language(language)
         return await self.repository.get_little_products_left(
-            warehouse_id, limit, offset, language, amount=amount
+            warehouse_id, limit, offset, language, days=days
         )
 
     async def get_product_variant_sales(
@@ -221,10 +221,10 @@ class ProductController:
         return stats
 
     async def get_warehouse_stats(
-            self, warehouse_id: int, start_date: datetime, end_date: datetime
+            self, warehouse_id: int, start_date: datetime, end_date: datetime, year: Optional[int] = None
     ):
         stats = await self.repository.get_warehouse_stats(
-            warehouse_id, start_date, end_date
+            warehouse_id, start_date, end_date, year
         )
 
         return stats
@@ -17,4 +17,7 @@ class PromotionController:
         return await self.promotion_repository.get_promotions(warehouse_id)
     
     async def create_promotion(self, data: PromotionCreate, warehouse_id: int) -> PromotionResponse:
-        return await self.promotion_repository.create_promotion(data, warehouse_id)
\ No newline at end of file
+        return await self.promotion_repository.create_promotion(data, warehouse_id)
+
+    async def update_promotion(self, promotion_id: int, data: PromotionUpdate, warehouse_id: int) -> PromotionResponse:
+        return await self.promotion_repository.update_promotion(promotion_id, data, warehouse_id)
\ No newline at end of file
@@ -1,10 +1,15 @@
+from decimal import Decimal
 from typing import Optional
 
 from fastapi import HTTPException
 from app.api.repositories.revision import RevisionRepository
-from app.api.schemas.revision import CreateRevisionSchema, RevisionItemCreate, RevisionItemResponse, RevisionResponse, RevisionDetailResponse
+from app.api.schemas.revision import CreateRevisionSchema, RevisionItemCreate, RevisionItemResponse, RevisionProgressResponse, RevisionResponse, RevisionDetailResponse, RevisionScanBatch, RevisionScanBatchResponse, RevisionUnscannedItem, RevisionUnscannedResponse
+from app.core.models.enums import RevisionStatus
+from app.core.settings import get_settings
 from sqlalchemy.ext.asyncio import AsyncSession
 
+settings = get_settings()
+
 
 class RevisionController:
     def __init__(self, session: AsyncSession):
@@ -29,8 +34,10 @@ class RevisionController:
             completed_by=revision.completed_by,
             cancelled_by=revision.cancelled_by,
             notes=revision.notes,
-            items_count=len(revision.items),
-            discrepancy_count=sum(1 for item in revision.items if item.difference != 0)
+            items_count=revision.scanned_items,
+            discrepancy_count=revision.discrepancy_count,
+            surplus_value=revision.surplus_value,
+            shortage_value=revision.shortage_value
         )
     
     async def create_revision(self, schema: CreateRevisionSchema, admin_id: int) -> RevisionResponse:
@@ -47,8 +54,10 @@ class RevisionController:
             completed_by=revision.completed_by,
             cancelled_by=revision.cancelled_by,
             notes=revision.notes,
-            items_count=len(revision.items),
-            discrepancy_count=sum(1 for item in revision.items if item.difference != 0)
+            items_count=revision.scanned_items,
+            discrepancy_count=revision.discrepancy_count,
+            surplus_value=revision.surplus_value,
+            shortage_value=revision.shortage_value
         )
     
     async def get_revision_detail(self, revision_id: int) -> Optional[RevisionDetailResponse]:
@@ -84,13 +93,18 @@ class RevisionController:
             completed_by=revision.completed_by,
             cancelled_by=revision.cancelled_by,
             notes=revision.notes,
-            items_count=len(revision.items),
-            discrepancy_count=sum(1 for item in revision.items if item.difference != 0),
+            items_count=revision.scanned_items,
+            discrepancy_count=revision.discrepancy_count,
+            surplus_value=revision.surplus_value,
+            shortage_value=revision.shortage_value,
             items=items
         )
 
     async def add_revision_item(self, revision_id: int, warehouse_id: int, schema: RevisionItemCreate) -> RevisionItemResponse:
-        variant = await self.repository.get_product_variant_by_barcode(schema.barcode, warehouse_id)
+        await self._check_scannable(revision_id, warehouse_id)
+
+        barcode = schema.barcode_value
+        variant = await self.repository.get_product_variant_by_barcode(barcode, warehouse_id) if barcode is not None else None
         if not variant:
             raise HTTPException(status_code=404, detail="Product variant not found")
 
@@ -99,6 +113,7 @@ class RevisionController:
             product_variant_id=variant.id,
             actual_quantity=schema.actual_quantity,
             system_quantity=variant.amount,
+            unit_cost=variant.come_in_price,
             notes=schema.notes
         )
 
@@ -115,11 +130,42 @@ class RevisionController:
             scanned_at=item.scanned_at
         )
 
+    async def add_revision_items_batch(self, revision_id: int, warehouse_id: int, schema: RevisionScanBatch) -> RevisionScanBatchResponse:
+        await self._check_scannable(revision_id, warehouse_id)
+
+        barcodes = {item.barcode_value for item in schema.items} - {None}
+        variants = {}
+        if barcodes:
+            variants = {row.barcode: row for row in await self.repository.get_variants_by_barcodes(barcodes, warehouse_id)}
+
+        # Keyed by variant so that one upsert never touches a row twice
+        # ("0123" and "123" are the same variant); the last scan wins.
+        rows = {}
+        not_found = {}
+        for item in schema.items:
+            variant = variants.get(item.barcode_value)
+            if not variant:
+                not_found[item.barcode] = None
+                continue
+            rows[variant.id] = {
+                "product_variant_id": variant.id,
+                "actual_quantity": Decimal(str(item.actual_quantity)),
+                "system_quantity": Decimal(str(variant.amount)),
+                "unit_cost": Decimal(str(variant.come_in_price)),
+                "notes": item.notes,
+            }
+
+        scanned = await self.repository.upsert_revision_items(revision_id, list(rows.values())) if rows else 0
+
+        return RevisionScanBatchResponse(revision_id=revision_id, scanned=scanned, not_found=list(not_found))
+
     async def complete_revision(self, revision_id: int, admin_id: int) -> RevisionResponse:
-        revision = await self.repository.complete_revision(revision_id, admin_id)
+        revision = await self.repository.complete_revision(
+            revision_id, admin_id, settings.REVISION_COMPLETION_CHUNK_SIZE
+        )
         if not revision:
             raise HTTPException(status_code=404, detail="Revision not found")
-        
+
         return RevisionResponse(
             id=revision.id,
             warehouse_id=revision.warehouse_id,
@@ -132,10 +178,55 @@ class RevisionController:
             completed_by=revision.completed_by,
             cancelled_by=revision.cancelled_by,
             notes=revision.notes,
-            items_count=len(revision.items),
-            discrepancy_count=sum(1 for item in revision.items if item.difference != 0)
+            items_count=revision.scanned_items,
+            discrepancy_count=revision.discrepancy_count,
+            surplus_value=revision.surplus_value,
+            shortage_value=revision.shortage_value
         )
 
+    async def get_revision_progress(self, revision_id: int, warehouse_id: int) -> RevisionProgressResponse:
+        state = await self.repository.get_revision_state(revision_id, warehouse_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Revision not found")
+
+        return RevisionProgressResponse(
+            revision_id=revision_id,
+            status=state.status,
+            items_count=state.scanned_items,
+            applied_items=state.applied_items
+        )
+
+    async def get_unscanned_items(
+        self, revision_id: int, warehouse_id: int, limit: int, offset: int, language: str
+    ) -> RevisionUnscannedResponse:
+        state = await self.repository.get_revision_state(revision_id, warehouse_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Revision not found")
+
+        rows = await self.repository.get_unscanned_variants(revision_id, warehouse_id, limit, offset, language)
+
+        return RevisionUnscannedResponse(
+            revision_id=revision_id,
+            total=rows[0].total if rows else 0,
+            items=[
+                RevisionUnscannedItem(
+                    variant_id=row.id,
+                    product_id=row.product_id,
+                    barcode=str(row.barcode),
+                    product_name=row.product_name or "",
+                    system_quantity=row.amount
+                )
+                for row in rows
+            ]
+        )
+
+    async def _check_scannable(self, revision_id: int, warehouse_id: int) -> None:
+        state = await self.repository.get_revision_state(revision_id, warehouse_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        if state.status != RevisionStatus.created or state.applied_items:
+            raise HTTPException(status_code=400, detail="Revision is not active")
+
     async def cancel_revision(self, revision_id: int, admin_id: int) -> RevisionResponse:
         revision = await self.repository.cancel_revision(revision_id, admin_id)
         if not revision:
@@ -153,6 +244,8 @@ class RevisionController:
             completed_by=revision.completed_by,
             cancelled_by=revision.cancelled_by,
             notes=revision.notes,
-            items_count=len(revision.items),
-            discrepancy_count=sum(1 for item in revision.items if item.difference != 0)
+            items_count=revision.scanned_items,
+            discrepancy_count=revision.discrepancy_count,
+            surplus_value=revision.surplus_value,
+            shortage_value=revision.shortage_value
         )
\ No newline at end of file
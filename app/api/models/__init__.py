@@ -1,9 +1,9 @@
 from app.core.models.base import Base
 from app.api.models.user import User, SMSCode, AdminUser, ChatHistory, UserDB
-from app.api.models.order import Order, OrderItem, AdminOrderItem, AdminOrder
+from app.api.models.order import Order, OrderItem, AdminOrderItem, AdminOrder, StockReservation, DailySalesRollup
 from app.api.models.notification import Notification
 from app.api.models.device import Device
-from app.api.models.revision import Revision, RevisionItem
+from app.api.models.revision import Revision, RevisionItem, StockAdjustment
 from app.api.models.address import Address
 from app.api.models.warehouse import Warehouse
 from app.api.models.warehouse import AdminWarehouse
@@ -25,6 +25,11 @@ from app.api.models.product import (
     ProductImage,
     Banner,
     Promotion,
+    VariantEffectivePrice,
+    VariantDemandForecast,
+    LowStockAlert,
+    InventoryValuation,
+    InventoryValuationSnapshot,
 )
 
 __all__ = (
@@ -35,6 +40,8 @@ __all__ = (
     "SMSCode",
     "AdminOrder",
     "AdminOrderItem",
+    "StockReservation",
+    "DailySalesRollup",
     "Notification",
     "Address",
     "Warehouse",
@@ -55,7 +62,13 @@ __all__ = (
     "Device",
     "Revision",
     "RevisionItem",
+    "StockAdjustment",
     "Promotion",
+    "VariantEffectivePrice",
+    "VariantDemandForecast",
+    "LowStockAlert",
+    "InventoryValuation",
+    "InventoryValuationSnapshot",
     "ChatHistory",
     "UserDB",
 )
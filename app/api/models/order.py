@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DECIMAL, Column, Integer, Float, DateTime, ForeignKey, func, text, String, Numeric, Text
+from sqlalchemy import DECIMAL, Column, Date, Index, UniqueConstraint, Integer, Float, DateTime, ForeignKey, func, text, String, Numeric, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ENUM
 from app.api.schemas.order import OrderStatusEnum, OrderTypeEnum
@@ -69,6 +69,7 @@ class AdminOrder(Base):
     notes = Column(Text, nullable=True)
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
     payment_type = Column(ENUM(PaymentMethodEnum, name="payment_type"), nullable=False, default="cash")
+    idempotency_key = Column(String(64), nullable=True)  # Unique per warehouse, see __table_args__
 
     created_at = Column(DateTime, default=now_time(), nullable=False)
     updated_at = Column(DateTime, default=now_time(), onupdate=now_time(), nullable=False)
@@ -80,6 +81,13 @@ class AdminOrder(Base):
     product_variants = relationship("AdminOrderItem", back_populates="order", overlaps="items", viewonly=True)
     warehouse = relationship("Warehouse", back_populates="admin_order")
 
+    __table_args__ = (
+        Index("ix_admin_orders_by_status_updated_at", "by", "status", "updated_at"),
+        Index("ix_admin_orders_warehouse_created_at", "warehouse_id", "created_at"),
+        Index("ix_admin_orders_warehouse_status_created_at", "warehouse_id", "status", "created_at"),
+        Index("uq_admin_orders_warehouse_idempotency_key", "warehouse_id", "idempotency_key", unique=True),
+    )
+
     def __repr__(self):
         return f"<AdminOrder id={self.id} by={self.by} status={self.status}>"
 
@@ -88,12 +96,13 @@ class AdminOrderItem(Base):
     __tablename__ = "admin_order_items"
 
     id = Column(Integer, primary_key=True)
-    order_id = Column(Integer, ForeignKey("admin_orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("admin_orders.id"), nullable=False, index=True)
     product_variant_id = Column(Integer, ForeignKey("product_variants.id"), nullable=False)
     quantity = Column(Numeric, nullable=False, default=1)
     notes = Column(Text, nullable=True)
     price_per_unit = Column(DECIMAL(10, 2), nullable=False)
     price_with_discount = Column(DECIMAL(10, 2), nullable=True)
+    unit_cost = Column(DECIMAL(10, 2), nullable=False)  # come_in_price at the time of sale
     total_amount = Column(DECIMAL(10, 2), nullable=False)
     total_amount_with_discount = Column(DECIMAL(10, 2), nullable=True, default=0)
 
@@ -111,3 +120,47 @@ class AdminOrderItem(Base):
 
     def __repr__(self):
         return f"<AdminOrderItem id={self.id} order_id={self.order_id}>"
+
+
+class StockReservation(Base):
+    __tablename__ = "stock_reservations"
+
+    id = Column(Integer, primary_key=True)
+    order_id = Column(Integer, ForeignKey("admin_orders.id", ondelete="CASCADE"), nullable=False)
+    product_variant_id = Column(Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Numeric, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    created_at = Column(DateTime, default=now_time(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("order_id", "product_variant_id", name="uq_stock_reservation_order_variant"),
+        Index("ix_stock_reservations_variant_expires_at", "product_variant_id", "expires_at"),
+    )
+
+    def __repr__(self):
+        return f"<StockReservation order_id={self.order_id} product_variant_id={self.product_variant_id} quantity={self.quantity}>"
+
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollups"
+
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    product_variant_id = Column(Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), primary_key=True)
+    seller_id = Column(Integer, ForeignKey("admin_users.id"), primary_key=True)  # coalesce(seller, by)
+    payment_type = Column(ENUM(PaymentMethodEnum, name="payment_type", create_type=False), primary_key=True)
+
+    quantity = Column(Numeric, nullable=False, default=0)
+    revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+    discounted_revenue = Column(DECIMAL(14, 2), nullable=False, default=0)
+    cost = Column(DECIMAL(14, 2), nullable=False, default=0)
+    order_count = Column(Integer, nullable=False, default=0)  # Orders containing this variant
+    orders_attributed = Column(Integer, nullable=False, default=0)  # Each order counted once, on its lowest variant id
+
+    __table_args__ = (
+        Index("ix_daily_sales_rollups_warehouse_day", "warehouse_id", "day"),
+    )
+
+    def __repr__(self):
+        return f"<DailySalesRollup warehouse_id={self.warehouse_id} day={self.day} product_variant_id={self.product_variant_id}>"
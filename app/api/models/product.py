@@ -1,5 +1,6 @@
 from sqlalchemy import (
     Column,
+    Date,
     DateTime,
     Integer,
     String,
@@ -8,6 +9,9 @@ from sqlalchemy import (
     Boolean,
     ForeignKey,
     BigInteger,
+    Index,
+    Numeric,
+    and_,
 )
 from sqlalchemy.orm import relationship
 from app.core.models.base import Base
@@ -19,7 +23,8 @@ banner_products = Table(
     'banner_products',
     Base.metadata,
     Column('banner_id', Integer, ForeignKey('banners.id'), primary_key=True),
-    Column('product_variant_id', Integer, ForeignKey('product_variants.id'), primary_key=True)
+    Column('product_variant_id', Integer, ForeignKey('product_variants.id'), primary_key=True),
+    Column('original_price', Float, nullable=True)  # current_price before the banner discount was applied
 )
 
 promotion_product_variants = Table(
@@ -75,7 +80,7 @@ class Product(Base):
     )
     product_information = relationship("ProductInformation", back_populates="products")
 
-    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False, index=True)
     warehouse = relationship("Warehouse", back_populates="products")
 
     subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False)
@@ -259,6 +264,7 @@ class ProductVariant(Base):
     discount = Column(Float, nullable=True)
     is_main = Column(Boolean, default=False)
     amount = Column(Float, nullable=False)
+    min_stock = Column(Float, nullable=True)  # Low-stock threshold; falls back to the warehouse subcategory
     weight = Column(Float, nullable=True)
 
     color_id = Column(Integer, ForeignKey("colors.id", ondelete="SET NULL"), nullable=True)
@@ -279,9 +285,19 @@ class ProductVariant(Base):
         "ProductImage", back_populates="product_variant", cascade="all, delete-orphan"
     )
 
-    created_at = Column(DateTime, default=now_time())
+    last_sold_at = Column(DateTime, nullable=True)  # Set when an order containing the variant is completed
+
+    created_at = Column(DateTime, default=now_time(), index=True)
     updated_at = Column(DateTime, default=now_time(), onupdate=now_time())
 
+    __table_args__ = (
+        Index(
+            "ix_product_variants_in_stock_product_last_sold_at",
+            "product_id", "last_sold_at",
+            postgresql_where=amount > 0,
+        ),
+    )
+
     def __repr__(self):
         return f"<ProductVariant id={self.id} product_id={self.product_id}>"
 
@@ -294,6 +310,10 @@ class Promotion(Base):
     discount = Column(Float, nullable=False)  # Discount percentage
     product_limit = Column(Integer, nullable=False)  # Number of products the promotion applies to
     is_active = Column(Boolean, default=True)
+    start_date = Column(DateTime, nullable=True)
+    end_date = Column(DateTime, nullable=True)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    is_stackable = Column(Boolean, nullable=False, default=False, server_default="false")
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
     warehouse = relationship("Warehouse", back_populates="promotions")
 
@@ -308,6 +328,124 @@ class Promotion(Base):
     updated_at = Column(DateTime, default=now_time(), onupdate=now_time())
 
 
+class VariantEffectivePrice(Base):
+    __tablename__ = "variant_effective_prices"
+
+    product_variant_id = Column(Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), primary_key=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False, index=True)
+    discount = Column(Float, nullable=False, default=0)  # Combined discount percentage
+    promotion_id = Column(Integer, ForeignKey("promotions.id", ondelete="SET NULL"), nullable=True)  # Winning non-stackable promotion
+    valid_until = Column(DateTime, nullable=True, index=True)  # Next promotion window boundary
+
+    updated_at = Column(DateTime, default=now_time(), onupdate=now_time())
+
+    def __repr__(self):
+        return f"<VariantEffectivePrice product_variant_id={self.product_variant_id} discount={self.discount}>"
+
+
+class VariantDemandForecast(Base):
+    __tablename__ = "variant_demand_forecasts"
+
+    product_variant_id = Column(Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), primary_key=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False)
+    daily_demand = Column(Float, nullable=False, default=0)  # Exponentially smoothed units per day
+    demand_std = Column(Float, nullable=False, default=0)
+    stock = Column(Float, nullable=False, default=0)  # amount at computation time
+    days_of_cover = Column(Float, nullable=True)  # NULL when there is no demand
+    stockout_date = Column(Date, nullable=True)
+    reorder_point = Column(Float, nullable=False, default=0)
+    suggested_order_quantity = Column(Float, nullable=False, default=0)
+
+    computed_at = Column(DateTime, nullable=False, default=now_time())
+
+    __table_args__ = (
+        Index("ix_variant_demand_forecasts_warehouse_stockout", "warehouse_id", "stockout_date"),
+    )
+
+    def __repr__(self):
+        return f"<VariantDemandForecast product_variant_id={self.product_variant_id} stockout_date={self.stockout_date}>"
+
+
+class LowStockAlert(Base):
+    """
+    One row per variant, maintained by the ``product_variants`` trigger from
+    the ``low_stock_alerts`` migration. ``is_active`` rows are the alert feed.
+    """
+    __tablename__ = "low_stock_alerts"
+
+    id = Column(Integer, primary_key=True)
+    product_variant_id = Column(
+        Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False)
+    threshold = Column(Float, nullable=False)
+    amount = Column(Float, nullable=False)
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    triggered_at = Column(DateTime, nullable=False, default=now_time())
+    resolved_at = Column(DateTime, nullable=True)
+    notified_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_low_stock_alerts_active_warehouse_triggered_at",
+            "warehouse_id", "triggered_at",
+            postgresql_where=is_active,
+        ),
+        Index(
+            "ix_low_stock_alerts_unnotified",
+            "id",
+            postgresql_where=and_(is_active, notified_at.is_(None)),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<LowStockAlert product_variant_id={self.product_variant_id} amount={self.amount} threshold={self.threshold}>"
+
+
+class InventoryValuation(Base):
+    """
+    Current stock value per warehouse and subcategory, kept up to date by the
+    ``product_variants`` and ``products`` triggers from the
+    ``inventory_valuations`` migration.
+    """
+    __tablename__ = "inventory_valuations"
+
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), primary_key=True)
+    subcategory_id = Column(Integer, ForeignKey("subcategories.id", ondelete="CASCADE"), primary_key=True)
+    variants = Column(Integer, nullable=False, default=0)
+    quantity = Column(Numeric, nullable=False, default=0)
+    cost_value = Column(Numeric, nullable=False, default=0)  # amount * come_in_price
+    retail_value = Column(Numeric, nullable=False, default=0)  # amount * current_price
+
+    updated_at = Column(DateTime, nullable=False, default=now_time())
+
+    def __repr__(self):
+        return f"<InventoryValuation warehouse_id={self.warehouse_id} subcategory_id={self.subcategory_id} cost_value={self.cost_value}>"
+
+
+class InventoryValuationSnapshot(Base):
+    __tablename__ = "inventory_valuation_snapshots"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False)
+    subcategory_id = Column(Integer, ForeignKey("subcategories.id", ondelete="CASCADE"), nullable=True)  # NULL: whole warehouse
+    variants = Column(Integer, nullable=False, default=0)
+    quantity = Column(Numeric, nullable=False, default=0)
+    cost_value = Column(Numeric, nullable=False, default=0)
+    retail_value = Column(Numeric, nullable=False, default=0)
+
+    created_at = Column(DateTime, nullable=False, default=now_time())
+
+    __table_args__ = (
+        Index("ix_inventory_valuation_snapshots_warehouse_subcategory_day", "warehouse_id", "subcategory_id", "day"),
+    )
+
+    def __repr__(self):
+        return f"<InventoryValuationSnapshot day={self.day} warehouse_id={self.warehouse_id} subcategory_id={self.subcategory_id}>"
+
+
 # Add relationship to ProductVariant model
 ProductVariant.promotions = relationship(
     "Promotion",
@@ -345,6 +483,7 @@ class Banner(Base):
     image_url = Column(String, nullable=False)
     discount_percentage = Column(Float, nullable=False)
     is_active = Column(Boolean, default=True)
+    is_applied = Column(Boolean, nullable=False, default=False, server_default="false")  # Discount currently written to variants
 
     # Banner va ProductVariant o'rtasidagi ko'p-ko'plik bog'lanish
     product_variants = relationship(
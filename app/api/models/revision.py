@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime, String
+from sqlalchemy import Column, Float, Integer, Numeric, ForeignKey, DateTime, String, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ENUM
 
@@ -21,6 +21,16 @@ class Revision(Base):
     completed_by = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
     cancelled_by = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
     notes = Column(String, nullable=True)
+
+    # Scan counters, kept up to date by triggers on revision_items.
+    scanned_items = Column(Integer, nullable=False, default=0, server_default="0")
+    discrepancy_count = Column(Integer, nullable=False, default=0, server_default="0")
+    surplus_value = Column(Numeric, nullable=False, default=0, server_default="0")
+    shortage_value = Column(Numeric, nullable=False, default=0, server_default="0")
+
+    # Completion progress: items are applied to stock in id order, in chunks.
+    applied_items = Column(Integer, nullable=False, default=0, server_default="0")
+    last_applied_item_id = Column(Integer, nullable=True)
     
     # Relationships
     items = relationship("RevisionItem", back_populates="revision", cascade="all, delete-orphan")
@@ -39,9 +49,34 @@ class RevisionItem(Base):
     system_quantity = Column(Numeric(10, 2), nullable=False)
     actual_quantity = Column(Numeric(10, 2), nullable=False)
     difference = Column(Numeric(10, 2), nullable=False)
+    unit_cost = Column(Numeric(10, 2), nullable=False)  # come_in_price at the first scan
     notes = Column(String, nullable=True)
     scanned_at = Column(DateTime, default=now_time())
-    
+
+    __table_args__ = (
+        UniqueConstraint("revision_id", "product_variant_id", name="uq_revision_items_revision_variant"),
+    )
+
     # Relationships
     revision = relationship("Revision", back_populates="items")
-    product_variant = relationship("ProductVariant")
\ No newline at end of file
+    product_variant = relationship("ProductVariant")
+
+
+class StockAdjustment(Base):
+    """Ledger of stock changes written when a revision is completed."""
+    __tablename__ = "stock_adjustments"
+
+    id = Column(Integer, primary_key=True)
+    revision_id = Column(Integer, ForeignKey("revisions.id", ondelete="CASCADE"), nullable=False)
+    product_variant_id = Column(Integer, ForeignKey("product_variants.id", ondelete="CASCADE"), nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id", ondelete="CASCADE"), nullable=False)
+    previous_amount = Column(Float, nullable=False)
+    new_amount = Column(Float, nullable=False)
+    difference = Column(Float, nullable=False)
+    created_by = Column(Integer, ForeignKey("admin_users.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=now_time())
+
+    __table_args__ = (
+        Index("ix_stock_adjustments_revision_id", "revision_id"),
+        Index("ix_stock_adjustments_variant_created_at", "product_variant_id", "created_at"),
+    )
@@ -132,6 +132,7 @@ class WarehouseSubcategory(Base):
     name = Column(JSONB, default={}, nullable=False)
     description = Column(JSONB, default={}, nullable=True)
     is_active = Column(Boolean, default=True, nullable=False)
+    min_stock = Column(Float, nullable=True)  # Low-stock threshold for variants without their own
     
     warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
     subcategory_id = Column(Integer, ForeignKey("subcategories.id"), nullable=False)
@@ -5,10 +5,10 @@ from zoneinfo import ZoneInfo
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import Date, and_, cast, distinct, func, select, text
+from sqlalchemy import Date, and_, cast, func, select
 from sqlalchemy.orm import joinedload, selectinload
 
-from app.api.models.order import AdminOrder, AdminOrderItem
+from app.api.models.order import AdminOrder, DailySalesRollup
 from app.api.models.product import Product, ProductVariant
 from app.api.models.user import AdminUser, User
 from app.api.models.warehouse import AdminWarehouse, Warehouse
@@ -16,7 +16,6 @@ from app.api.schemas.user import AdminDashboardResponse, BaseStats
 from app.core.databases.postgres import get_general_session
 from app.api.models.warehouse import admin_warehouse_roles
 from app.core.models.enums import AdminOrderStatusEnum
-from database.order_database import OrderDB
 
 
 class AdminRepository:
@@ -112,7 +111,25 @@ class AdminRepository:
         if not end_date:
             end_date = datetime.now()
 
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        sales = (
+            select(
+                DailySalesRollup.seller_id,
+                func.sum(DailySalesRollup.orders_attributed).label("order_count"),
+                func.sum(DailySalesRollup.quantity).label("items_sold"),
+                func.sum(DailySalesRollup.revenue).label("total_revenue"),
+                func.sum(DailySalesRollup.discounted_revenue).label("total_revenue_with_discount"),
+                func.sum(DailySalesRollup.discounted_revenue - DailySalesRollup.cost).label("total_profit"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= start_date.date(),
+                    DailySalesRollup.day <= end_date.date(),
+                )
+            )
+            .group_by(DailySalesRollup.seller_id)
+            .subquery()
+        )
 
         query = (
             select(
@@ -122,42 +139,22 @@ class AdminRepository:
                 AdminUser.is_global_admin,
                 AdminUser.profile_picture,
                 AdminWarehouse.name.label("role_name"),
-                func.count(distinct(AdminOrder.id)).label("order_count"),
-                func.sum(AdminOrderItem.quantity).label("items_sold"),
-                func.sum(AdminOrderItem.total_amount).label("total_revenue"),
-                func.sum(AdminOrderItem.total_amount_with_discount).label("total_revenue_with_discount"),
-                func.sum(
-                    AdminOrderItem.total_amount_with_discount -
-                    (AdminOrderItem.quantity * ProductVariant.current_price)
-                ).label("total_profit"),
-                (func.sum(AdminOrderItem.total_amount_with_discount) /
-                 func.count(distinct(AdminOrder.id))).label("average_order_value")
+                sales.c.order_count,
+                sales.c.items_sold,
+                sales.c.total_revenue,
+                sales.c.total_revenue_with_discount,
+                sales.c.total_profit,
+                func.coalesce(
+                    sales.c.total_revenue_with_discount / func.nullif(sales.c.order_count, 0), 0
+                ).label("average_order_value")
             )
-            .join(AdminOrder, AdminOrder.by == AdminUser.id)
-            .join(AdminOrderItem, AdminOrderItem.order_id == AdminOrder.id)
-            .join(ProductVariant, ProductVariant.id == AdminOrderItem.product_variant_id)
+            .join(sales, sales.c.seller_id == AdminUser.id)
             .join(admin_warehouse_roles, admin_warehouse_roles.c.admin_id == AdminUser.id)
             .join(AdminWarehouse, and_(
                 AdminWarehouse.id == admin_warehouse_roles.c.warehouse_role_id,
                 AdminWarehouse.warehouse_id == warehouse_id
             ))
-            .where(
-                and_(
-                    AdminOrder.status == AdminOrderStatusEnum.completed,
-                    AdminOrder.warehouse_id == warehouse_id,
-                    # AdminOrder.created_at >= start_date,
-                    # AdminOrder.created_at <= end_date
-                )
-            )
-            .group_by(
-                AdminUser.id,
-                AdminUser.full_name,
-                AdminUser.phone_number,
-                AdminUser.is_global_admin,
-                AdminUser.profile_picture,
-                AdminWarehouse.name
-            )
-            .order_by(text("total_revenue_with_discount DESC"))
+            .order_by(sales.c.total_revenue_with_discount.desc(), AdminUser.id)
             .limit(10)
         )
 
@@ -197,97 +194,53 @@ class AdminRepository:
 
         tashkent_tz = ZoneInfo('Asia/Tashkent')
         today = datetime.now(timezone.utc).astimezone(tashkent_tz)
-        yesterday = today - timedelta(days=1)
-
-        products_today = (await self.__session.execute(
-            select(func.count(ProductVariant.id))
-            .join(Product, ProductVariant.product_id == Product.id)
-            .where(and_(
-                func.date(ProductVariant.created_at) == today.date(),
-                Product.warehouse_id == warehouse_id
-            ))
-        )).scalar()
-
-        products_yesterday = (await self.__session.execute(
-            select(func.count(ProductVariant.id))
-            .join(Product, ProductVariant.product_id == Product.id)
-            .where(and_(
-                func.date(ProductVariant.created_at) == yesterday.date(),
-                Product.warehouse_id == warehouse_id
-            ))
-        )).scalar()
+        today_start = datetime.combine(today.date(), datetime.min.time())
+        yesterday_start = today_start - timedelta(days=1)
+        tomorrow_start = today_start + timedelta(days=1)
 
-        orders_today = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
-            .where(and_(
-                # AdminOrder.status == AdminOrderStatusEnum.completed,
-                func.date(AdminOrder.created_at) == today.date(),
-                Product.warehouse_id == warehouse_id
-            ))
-        )).scalar()
+        is_today = AdminOrder.created_at >= today_start
+        is_yesterday = AdminOrder.created_at < today_start
+        is_opened = AdminOrder.status == AdminOrderStatusEnum.opened
+        is_completed = AdminOrder.status == AdminOrderStatusEnum.completed
 
-        orders_yesterday = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
-            .where(and_(
-                # AdminOrder.status == AdminOrderStatusEnum.completed,
-                func.date(AdminOrder.created_at) == yesterday.date(),
-                Product.warehouse_id == warehouse_id
-            ))
-        )).scalar()
-
-        pending_today = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
+        orders = (
+            select(
+                func.count().filter(is_today).label("orders_today"),
+                func.count().filter(is_yesterday).label("orders_yesterday"),
+                func.count().filter(and_(is_opened, is_today)).label("pending_today"),
+                func.count().filter(and_(is_opened, is_yesterday)).label("pending_yesterday"),
+                func.count().filter(and_(is_completed, is_today)).label("completed_today"),
+                func.count().filter(and_(is_completed, is_yesterday)).label("completed_yesterday"),
+            )
             .where(and_(
-                AdminOrder.status == AdminOrderStatusEnum.opened,
-                func.date(AdminOrder.created_at) == today.date(),
-                AdminOrder.warehouse_id == warehouse_id
+                AdminOrder.warehouse_id == warehouse_id,
+                AdminOrder.created_at >= yesterday_start,
+                AdminOrder.created_at < tomorrow_start,
             ))
-        )).scalar()
+            .subquery()
+        )
 
-        pending_yesterday = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
+        products = (
+            select(
+                func.count().filter(ProductVariant.created_at >= today_start).label("products_today"),
+                func.count().filter(ProductVariant.created_at < today_start).label("products_yesterday"),
+            )
+            .select_from(ProductVariant)
+            .join(Product, ProductVariant.product_id == Product.id)
             .where(and_(
-                AdminOrder.status == AdminOrderStatusEnum.opened,
-                func.date(AdminOrder.created_at) == yesterday.date(),
-                AdminOrder.warehouse_id == warehouse_id
+                Product.warehouse_id == warehouse_id,
+                ProductVariant.created_at >= yesterday_start,
+                ProductVariant.created_at < tomorrow_start,
             ))
-        )).scalar()
+            .subquery()
+        )
 
-        completed_today = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
-            .where(and_(
-                AdminOrder.status == AdminOrderStatusEnum.completed,
-                func.date(AdminOrder.created_at) == today.date(),
-                Product.warehouse_id == warehouse_id
-            ))
-        )).scalar()
+        stats = (await self.__session.execute(select(orders, products))).one()
 
-        completed_yesterday = (await self.__session.execute(
-            select(func.count(AdminOrder.id))
-            .join(AdminOrder.items)
-            .join(AdminOrderItem.product_variant)
-            .join(ProductVariant.product)
-            .where(and_(
-                AdminOrder.status == AdminOrderStatusEnum.completed,
-                func.date(AdminOrder.created_at) == yesterday.date(),
-                AdminOrder.warehouse_id == warehouse_id
-            ))
-        )).scalar()
+        products_today, products_yesterday = stats.products_today, stats.products_yesterday
+        orders_today, orders_yesterday = stats.orders_today, stats.orders_yesterday
+        pending_today, pending_yesterday = stats.pending_today, stats.pending_yesterday
+        completed_today, completed_yesterday = stats.completed_today, stats.completed_yesterday
 
         def calculate_growth(today_count: int, yesterday_count: int) -> float:
             if yesterday_count == 0:
@@ -312,11 +265,3 @@ class AdminRepository:
                 total_count=completed_today
             )
         )
-
-    async def get_hourly_orders_today(self, warehouse_id: int):
-        order_db = OrderDB()
-        tashkent_tz = ZoneInfo('Asia/Tashkent')
-        now_tashkent = datetime.now(timezone.utc).astimezone(tashkent_tz)
-        custom_fetch = await order_db.get_orders_by_datetime(target_datetime=now_tashkent, warehouse_id=warehouse_id)
-
-        return custom_fetch
@@ -2,13 +2,19 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import List, Optional
 from fastapi import Depends, HTTPException
-from sqlalchemy import Enum, and_, or_, DECIMAL
-from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy import Enum, Float, Integer, Text, and_, cast, column, func, literal_column, update, values, DECIMAL
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by, insert
+from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.api.models.order import AdminOrder, AdminOrderItem
-from app.api.models.product import Product, ProductVariant, Promotion, promotion_product_variants
-from app.api.schemas.order import AdminOrderItemResponse, AdminOrderItemSchema, AdminOrderResponse, AdminProductVariantResponse, CompleteOrderRequest, AdminOrderUpdate
+from app.api.models.product import Color, Measure, Product, ProductImage, ProductVariant, Size, VariantEffectivePrice
+from app.api.models.user import AdminUser
+from app.api.repositories.product.pricing import PricingRepository
+from app.api.repositories.sales_rollup import SalesRollupRepository
+from app.api.repositories.stock_reservation import StockReservationRepository
+from app.api.schemas.order import AdminOrderItemResponse, AdminOrderItemSchema, AdminOrderResponse, AdminOrderSummaryResponse, CompleteOrderRequest, AdminOrderUpdate, OfflineOrderSyncRequest, OfflineOrderSyncResult
+from app.api.utils.barcode import parse_barcode
 from app.core.databases.postgres import get_general_session
 from app.core.models.enums import AdminOrderStatusEnum, PaymentMethodEnum
 from utils.time_utils import now_time
@@ -17,36 +23,19 @@ from utils.time_utils import now_time
 class AdminOrderRepository:
     def __init__(self, session: AsyncSession = Depends(get_general_session)):
         self.__session = session
+        self.__pricing_repository = PricingRepository(session=session)
+        self.__stock_reservation_repository = StockReservationRepository(session=session)
+        self.__sales_rollup_repository = SalesRollupRepository(session=session)
 
     async def get_admin_current_order(self, admin_id: int, language: str) -> AdminOrderResponse | None:
         result = await self.__session.execute(
-            select(AdminOrder)
+            self._hydrated_order_query(language)
             .where(
                 and_(
                     AdminOrder.by == admin_id,
                     AdminOrder.status == AdminOrderStatusEnum.opened
                 )
             )
-            .options(
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.product),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.color),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.size),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.measure),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.images),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.promotions)
-            )
         )
 
         opened_order = result.scalars().first()
@@ -54,105 +43,126 @@ class AdminOrderRepository:
         if not opened_order:
             return None
 
-        return AdminOrderResponse(
-            id=opened_order.id,
-            by=opened_order.by,
-            seller_id=opened_order.seller,
-            status=opened_order.status,
-            user_name=opened_order.user_name,
-            user_phone=opened_order.user_phone,
-            total_amount_with_discount=opened_order.total_amount_with_discount,
-            total_amount=opened_order.total_amount,
-            payment_type=opened_order.payment_type,
-            notes=opened_order.notes,
-            created_at=opened_order.created_at,
-            updated_at=opened_order.updated_at,
-            canceled_at=opened_order.canceled_at,
-            product_variants=[
-                AdminOrderItemResponse(
-                    id=item.id,
-                    order_id=item.order_id,
-                    product_variant=AdminProductVariantResponse.from_variant(
-                        item.product_variant,
-                        language
-                    ),
-                    quantity=item.quantity,
-                    price_per_unit=item.price_per_unit,
-                    price_with_discount=item.price_with_discount,
-                    total_amount_with_discount=item.total_amount_with_discount,
-                    total_amount=item.total_amount,
-                    notes=item.notes,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at
-                ) for item in opened_order.items
-            ]
-        )
+        return AdminOrderResponse.model_validate(opened_order)
 
     async def get_order_by_id(self, order_id: int, language: str) -> AdminOrderResponse | None:
         result = await self.__session.execute(
-            select(AdminOrder)
-            .where(
-                AdminOrder.id == order_id,
-            )
-            .options(
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.product),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.color),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.size),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.measure),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.images),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.promotions)
-            )
+            self._hydrated_order_query(language)
+            .where(AdminOrder.id == order_id)
         )
 
-        opened_order = result.scalars().first()
+        order = result.scalars().first()
 
-        if not opened_order:
+        if not order:
             return None
 
-        return AdminOrderResponse(
-            id=opened_order.id,
-            by=opened_order.by,
-            seller_id=opened_order.seller,
-            status=opened_order.status,
-            user_name=opened_order.user_name,
-            user_phone=opened_order.user_phone,
-            total_amount_with_discount=opened_order.total_amount_with_discount,
-            total_amount=opened_order.total_amount,
-            payment_type=opened_order.payment_type,
-            notes=opened_order.notes,
-            created_at=opened_order.created_at,
-            updated_at=opened_order.updated_at,
-            canceled_at=opened_order.canceled_at,
-            product_variants=[
-                AdminOrderItemResponse(
-                    id=item.id,
-                    order_id=item.order_id,
-                    product_variant=AdminProductVariantResponse.from_variant(
-                        item.product_variant,
-                        language
-                    ),
-                    quantity=item.quantity,
-                    price_per_unit=item.price_per_unit,
-                    price_with_discount=item.price_with_discount,
-                    total_amount_with_discount=item.total_amount_with_discount,
-                    total_amount=item.total_amount,
-                    notes=item.notes,
-                    created_at=item.created_at,
-                    updated_at=item.updated_at
-                ) for item in opened_order.items
-            ]
+        return AdminOrderResponse.model_validate(order)
+
+    def _hydrated_order_query(self, language: str | None):
+        """
+        Builds one statement that returns the whole order as nested JSON shaped like
+        AdminOrderResponse, so the order, its lines and the variant display fields
+        come back in a single round trip instead of one selectinload per relation.
+        """
+        return select(
+            func.json_build_object(
+                "id", AdminOrder.id,
+                "by", AdminOrder.by,
+                "seller_id", AdminOrder.seller,
+                "status", AdminOrder.status,
+                "user_name", AdminOrder.user_name,
+                "user_phone", AdminOrder.user_phone,
+                "total_amount", func.coalesce(AdminOrder.total_amount, 0),
+                "total_amount_with_discount", func.coalesce(AdminOrder.total_amount_with_discount, 0),
+                "payment_type", AdminOrder.payment_type,
+                "notes", AdminOrder.notes,
+                "created_at", AdminOrder.created_at,
+                "updated_at", AdminOrder.updated_at,
+                "canceled_at", AdminOrder.canceled_at,
+                "product_variants", self._order_items_json(language),
+                type_=JSON,
+            )
+        )
+
+    def _order_items_json(self, language: str | None):
+        item_json = func.json_build_object(
+            "id", AdminOrderItem.id,
+            "order_id", AdminOrderItem.order_id,
+            "product_variant", self._variant_json(language),
+            "quantity", AdminOrderItem.quantity,
+            "price_per_unit", AdminOrderItem.price_per_unit,
+            "price_with_discount", func.coalesce(AdminOrderItem.price_with_discount, AdminOrderItem.price_per_unit),
+            "total_amount", AdminOrderItem.total_amount,
+            "total_amount_with_discount", func.coalesce(AdminOrderItem.total_amount_with_discount, 0),
+            "payment_type", AdminOrder.payment_type,
+            "notes", AdminOrderItem.notes,
+            "created_at", AdminOrderItem.created_at,
+            "updated_at", AdminOrderItem.updated_at,
+        )
+
+        return (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(item_json, AdminOrderItem.id)),
+                    literal_column("'[]'::json"),
+                    type_=JSON,
+                )
+            )
+            .select_from(AdminOrderItem)
+            .join(ProductVariant, ProductVariant.id == AdminOrderItem.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(Color, Color.id == ProductVariant.color_id)
+            .outerjoin(Size, Size.id == ProductVariant.size_id)
+            .outerjoin(Measure, Measure.id == ProductVariant.measure_id)
+            .where(AdminOrderItem.order_id == AdminOrder.id)
+            .correlate(AdminOrder)
+            .scalar_subquery()
+        )
+
+    def _variant_json(self, language: str | None):
+        images = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(ProductImage.image, ProductImage.id)),
+                    literal_column("'[]'::json"),
+                )
+            )
+            .where(ProductImage.product_variant_id == ProductVariant.id)
+            .correlate(ProductVariant)
+            .scalar_subquery()
+        )
+        main_image = (
+            select(ProductImage.image)
+            .where(ProductImage.product_variant_id == ProductVariant.id)
+            .order_by(ProductImage.is_main.desc(), ProductImage.id)
+            .limit(1)
+            .correlate(ProductVariant)
+            .scalar_subquery()
+        )
+        promotion_discount = (
+            select(VariantEffectivePrice.discount)
+            .where(
+                and_(
+                    VariantEffectivePrice.product_variant_id == ProductVariant.id,
+                    VariantEffectivePrice.discount > 0,
+                )
+            )
+            .correlate(ProductVariant)
+            .scalar_subquery()
+        )
+
+        return func.json_build_object(
+            "id", ProductVariant.id,
+            "barcode", cast(ProductVariant.barcode, Text),
+            "name", func.coalesce(Product.name[language].astext, "") if language else "",
+            "current_price", ProductVariant.current_price,
+            "color", Color.name[language].astext if language else None,
+            "color_hex", Color.hex_code,
+            "size", Size.size,
+            "measure", func.coalesce(Measure.name, ""),
+            "main_image", main_image,
+            "images", images,
+            "discount", promotion_discount,
         )
 
     async def create_complete_order(self, admin_id: int, data: CompleteOrderRequest, warehouse_id: int, language: str):
@@ -173,6 +183,7 @@ class AdminOrderRepository:
 
         total_amount = Decimal('0')
         total_discount_amount = Decimal('0')
+        sold: dict[int, Decimal] = {}
 
         for item in data.items:
             product_variant = await self.__session.execute(
@@ -193,11 +204,11 @@ class AdminOrderRepository:
 
             original_price = Decimal(str(item.custom_price or product_variant.current_price))
 
-            active_promotion = await self.get_active_promotion(product_variant.id)
+            discount = await self.__pricing_repository.get_discount(product_variant.id)
             discounted_price = original_price
 
-            if active_promotion:
-                discount_multiplier = Decimal(str((100 - active_promotion.discount) / 100))
+            if discount:
+                discount_multiplier = Decimal(str((100 - discount) / 100))
                 discounted_price = (original_price * discount_multiplier).quantize(Decimal('0.01'))
 
             item_quantity = Decimal(str(item.quantity))
@@ -208,11 +219,13 @@ class AdminOrderRepository:
                 quantity=item.quantity,
                 price_per_unit=original_price,
                 price_with_discount=discounted_price,
+                unit_cost=Decimal(str(product_variant.come_in_price)),
                 total_amount=original_price * item_quantity,
                 total_amount_with_discount=discounted_price * item_quantity,
             )
 
             self.__session.add(order_item)
+            sold[product_variant.id] = sold.get(product_variant.id, Decimal('0')) + item_quantity
 
             total_amount += original_price * item_quantity
             total_discount_amount += discounted_price * item_quantity
@@ -221,22 +234,10 @@ class AdminOrderRepository:
         admin_order.total_amount_with_discount = total_discount_amount
 
         if data.status == "completed":
-            for item_request in data.items:
-                product_variant = await self.__session.execute(
-                    select(ProductVariant)
-                    .where(ProductVariant.barcode == int(item_request.barcode))
-                )
-                product_variant = product_variant.scalar_one_or_none()
-
-                if product_variant:
-                    if product_variant.amount < item_request.quantity:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Insufficient stock for product {product_variant.id} {product_variant.amount}"
-                        )
+            await self.__stock_reservation_repository.deduct(sold)
 
-                    product_variant.amount -= item_request.quantity
-                    self.__session.add(product_variant)
+        await self.__session.flush()
+        await self.__sales_rollup_repository.apply_orders([admin_order.id])
 
         await self.__session.commit()
         await self.__session.refresh(admin_order)
@@ -256,6 +257,184 @@ class AdminOrderRepository:
             "updated_at": admin_order.updated_at,
         }
 
+    async def sync_offline_orders(self, admin_id: int, orders: List[OfflineOrderSyncRequest], warehouse_id: int) -> List[OfflineOrderSyncResult]:
+        results: dict[str, OfflineOrderSyncResult] = {}
+        pending: List[OfflineOrderSyncRequest] = []
+        seen_keys = set()
+        repeated = set()
+
+        for index, order in enumerate(orders):
+            if order.idempotency_key in seen_keys:
+                repeated.add(index)
+                continue
+            seen_keys.add(order.idempotency_key)
+            pending.append(order)
+
+        existing = await self.__session.execute(
+            select(AdminOrder.idempotency_key, AdminOrder.id)
+            .where(and_(
+                AdminOrder.warehouse_id == warehouse_id,
+                AdminOrder.idempotency_key.in_([order.idempotency_key for order in pending])
+            ))
+        )
+        for key, order_id in existing.all():
+            results[key] = OfflineOrderSyncResult(idempotency_key=key, result="duplicate", order_id=order_id)
+        pending = [order for order in pending if order.idempotency_key not in results]
+
+        barcodes = {parse_barcode(item.barcode) for order in pending for item in order.items} - {None}
+
+        variants = {}
+        if barcodes:
+            variant_rows = await self.__session.execute(
+                select(ProductVariant.id, ProductVariant.barcode, ProductVariant.current_price, ProductVariant.come_in_price)
+                .join(Product)
+                .where(and_(
+                    ProductVariant.barcode.in_(barcodes),
+                    Product.warehouse_id == warehouse_id
+                ))
+            )
+            variants = {row.barcode: row for row in variant_rows.all()}
+
+        # Locked first, read after: stock held by open orders' reservations is not for sale.
+        stock_left = {}
+        if variants:
+            variant_ids = [row.id for row in variants.values()]
+            await self.__stock_reservation_repository.lock_variants(variant_ids)
+            stock_left = await self.__stock_reservation_repository.get_available(variant_ids)
+
+        discounts = await self.__pricing_repository.get_discounts(row.id for row in variants.values())
+
+        prepared = []
+
+        for order in pending:
+            try:
+                payment_type = PaymentMethodEnum(order.payment_type)
+            except ValueError:
+                results[order.idempotency_key] = OfflineOrderSyncResult(
+                    idempotency_key=order.idempotency_key, result="failed", detail=f"Invalid payment type {order.payment_type}"
+                )
+                continue
+
+            lines = []
+            consumed: dict[int, Decimal] = {}
+            error = None
+
+            for item in order.items:
+                variant = variants.get(parse_barcode(item.barcode))
+                if not variant:
+                    error = f"Product variant not found for barcode {item.barcode}"
+                    break
+
+                original_price = Decimal(str(item.custom_price or variant.current_price))
+                discounted_price = original_price
+                if variant.id in discounts:
+                    discount_multiplier = Decimal(str((100 - discounts[variant.id]) / 100))
+                    discounted_price = (original_price * discount_multiplier).quantize(Decimal('0.01'))
+
+                item_quantity = Decimal(str(item.quantity))
+                lines.append({
+                    "product_variant_id": variant.id,
+                    "quantity": item.quantity,
+                    "price_per_unit": original_price,
+                    "price_with_discount": discounted_price,
+                    "unit_cost": Decimal(str(variant.come_in_price)),
+                    "total_amount": original_price * item_quantity,
+                    "total_amount_with_discount": discounted_price * item_quantity,
+                })
+                consumed[variant.id] = consumed.get(variant.id, Decimal('0')) + item_quantity
+
+            if error is None and order.status == "completed":
+                for variant_id, quantity in consumed.items():
+                    if stock_left[variant_id] < quantity:
+                        error = f"Insufficient stock for product {variant_id} {stock_left[variant_id]}"
+                        break
+
+            if error:
+                results[order.idempotency_key] = OfflineOrderSyncResult(
+                    idempotency_key=order.idempotency_key, result="failed", detail=error
+                )
+                continue
+
+            if order.status == "completed":
+                for variant_id, quantity in consumed.items():
+                    stock_left[variant_id] -= quantity
+
+            prepared.append((order, payment_type, lines, consumed))
+
+        if prepared:
+            current_time = now_time()
+            inserted = await self.__session.execute(
+                insert(AdminOrder)
+                .values([
+                    {
+                        "by": admin_id,
+                        "seller": order.seller_id,
+                        "status": AdminOrderStatusEnum.cancelled if order.status == "canceled" else AdminOrderStatusEnum.completed,
+                        "user_name": order.user_name,
+                        "user_phone": order.user_phone,
+                        "warehouse_id": warehouse_id,
+                        "payment_type": payment_type,
+                        "idempotency_key": order.idempotency_key,
+                        "total_amount": sum((line["total_amount"] for line in lines), Decimal('0')),
+                        "total_amount_with_discount": sum((line["total_amount_with_discount"] for line in lines), Decimal('0')),
+                        "created_at": order.created_at or current_time,
+                        "updated_at": current_time,
+                        "canceled_at": current_time if order.status == "canceled" else None,
+                    }
+                    for order, payment_type, lines, _ in prepared
+                ])
+                .on_conflict_do_nothing(index_elements=[AdminOrder.warehouse_id, AdminOrder.idempotency_key])
+                .returning(AdminOrder.idempotency_key, AdminOrder.id)
+            )
+            order_ids = dict(inserted.all())
+
+            order_items = []
+            completed_order_ids = []
+            decrements: dict[int, Decimal] = {}
+            for order, _, lines, consumed in prepared:
+                order_id = order_ids.get(order.idempotency_key)
+                if order_id is None:
+                    results[order.idempotency_key] = OfflineOrderSyncResult(idempotency_key=order.idempotency_key, result="duplicate")
+                    continue
+
+                results[order.idempotency_key] = OfflineOrderSyncResult(
+                    idempotency_key=order.idempotency_key, result="created", order_id=order_id
+                )
+                order_items.extend({**line, "order_id": order_id, "created_at": current_time, "updated_at": current_time} for line in lines)
+                if order.status == "completed":
+                    completed_order_ids.append(order_id)
+                    for variant_id, quantity in consumed.items():
+                        decrements[variant_id] = decrements.get(variant_id, Decimal('0')) + quantity
+
+            if order_items:
+                await self.__session.execute(insert(AdminOrderItem), order_items)
+
+            if decrements:
+                stock_changes = values(
+                    column("variant_id", Integer),
+                    column("quantity", Float),
+                    name="stock_changes",
+                ).data([(variant_id, float(quantity)) for variant_id, quantity in decrements.items()])
+
+                await self.__session.execute(
+                    update(ProductVariant)
+                    .where(ProductVariant.id == stock_changes.c.variant_id)
+                    .values(amount=ProductVariant.amount - stock_changes.c.quantity)
+                )
+
+            await self.__sales_rollup_repository.apply_orders(completed_order_ids)
+
+        await self.__session.commit()
+
+        return [
+            OfflineOrderSyncResult(
+                idempotency_key=order.idempotency_key,
+                result="duplicate",
+                order_id=results[order.idempotency_key].order_id
+            ) if index in repeated else results[order.idempotency_key]
+            for index, order in enumerate(orders)
+        ]
+
     async def create_new_order(self, admin_id: int, warehouse_id: int) -> AdminOrderResponse:
         admin_order = AdminOrder(by=admin_id, warehouse_id=warehouse_id)
         self.__session.add(admin_order)
@@ -288,7 +467,6 @@ class AdminOrderRepository:
                     AdminOrder.status == AdminOrderStatusEnum.opened
                 )
             )
-            .options(selectinload(AdminOrder.product_variants))
         )
 
         admin_order = result.unique().scalars().first()
@@ -297,15 +475,9 @@ class AdminOrderRepository:
             raise HTTPException(status_code=404, detail="Order not found")
 
         if data.status == AdminOrderStatusEnum.completed:
-            for order_item in admin_order.product_variants:
-                product_variant = await self.__session.get(ProductVariant, order_item.product_variant_id)
-                if product_variant:
-                    if product_variant.amount < order_item.quantity:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Insufficient stock for product '{product_variant.id}'"
-                        )
-                    product_variant.amount -= float(order_item.quantity)
+            await self.__stock_reservation_repository.consume(admin_order.id)
+        elif data.status == AdminOrderStatusEnum.cancelled:
+            await self.__stock_reservation_repository.release(admin_order.id)
 
         admin_order.status = AdminOrderStatusEnum(data.status)
         admin_order.seller = data.seller_id if data.seller_id else admin_order.seller
@@ -315,6 +487,10 @@ class AdminOrderRepository:
         admin_order.updated_at = now_time()
         # admin_order.warehouse_id =
 
+        if admin_order.status == AdminOrderStatusEnum.completed:
+            await self.__session.flush()
+            await self.__sales_rollup_repository.apply_orders([admin_order.id])
+
         await self.__session.commit()
         return {
             "message": "Order closed successfully",
@@ -324,98 +500,92 @@ class AdminOrderRepository:
 
     async def get_all_closed_orders(self, admin_id: int, language: str, limit: int, offset: int) -> List[AdminOrderResponse] | None:
         result = await self.__session.execute(
-            select(AdminOrder)
+            self._hydrated_order_query(language)
             .where(
                 and_(
                     AdminOrder.by == admin_id,
-                    or_(
-                        AdminOrder.status == AdminOrderStatusEnum.completed,
-                        AdminOrder.status == AdminOrderStatusEnum.cancelled
-                    )
+                    AdminOrder.status.in_([
+                        AdminOrderStatusEnum.completed,
+                        AdminOrderStatusEnum.cancelled
+                    ])
                 )
             )
-            .options(
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.product),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.color),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.size),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.measure),
-                selectinload(AdminOrder.items)
-                .selectinload(AdminOrderItem.product_variant)
-                .selectinload(ProductVariant.images)
-            )
             .order_by(AdminOrder.updated_at.desc())
             .limit(limit).offset(offset)
         )
 
-        closed_orders = result.scalars().all()
+        return [AdminOrderResponse.model_validate(order) for order in result.scalars().all()]
+
+    async def get_closed_order_summaries(
+            self,
+            admin_id: int,
+            limit: int,
+            offset: int,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            payment_type: Optional[PaymentMethodEnum] = None,
+            seller_id: Optional[int] = None,
+    ) -> List[AdminOrderSummaryResponse]:
+        items_count = (
+            select(func.count(AdminOrderItem.id))
+            .where(AdminOrderItem.order_id == AdminOrder.id)
+            .correlate(AdminOrder)
+            .scalar_subquery()
+        )
 
-        if not closed_orders:
-            return []
+        filters = [
+            AdminOrder.by == admin_id,
+            AdminOrder.status.in_([
+                AdminOrderStatusEnum.completed,
+                AdminOrderStatusEnum.cancelled
+            ]),
+        ]
+        if start_date:
+            filters.append(AdminOrder.updated_at >= start_date)
+        if end_date:
+            filters.append(AdminOrder.updated_at < end_date)
+        if payment_type:
+            filters.append(AdminOrder.payment_type == payment_type)
+        if seller_id:
+            filters.append(AdminOrder.seller == seller_id)
 
-        return [
-            AdminOrderResponse(
-                id=order.id,
-                by=order.by,
-                seller=order.seller,
-                status=order.status,
-                user_name=order.user_name,
-                user_phone=order.user_phone,
-                total_amount=order.total_amount,
-                total_amount_with_discount=order.total_amount_with_discount,
-                payment_type=order.payment_type,
-                notes=order.notes,
-                created_at=order.created_at,
-                updated_at=order.updated_at,
-                canceled_at=order.canceled_at,
-                product_variants=[
-                    AdminOrderItemResponse(
-                        id=item.id,
-                        order_id=item.order_id,
-                        product_variant=AdminProductVariantResponse(
-                            id=item.product_variant.id,
-                            barcode=str(item.product_variant.barcode),
-                            current_price=item.product_variant.current_price,
-                            name=item.product_variant.product.name.get(language, ""),
-                            main_image=item.product_variant.images[0].image if item.product_variant.images else "",
-                            color=item.product_variant.color.name.get(language, "") if item.product_variant.color else "",
-                            color_hex=item.product_variant.color.hex_code if item.product_variant.color else "",
-                            size=item.product_variant.size.size if item.product_variant.size else "",
-                            measure=item.product_variant.measure.name if item.product_variant.measure else "",
-                            images=[img.image for img in item.product_variant.images] if item.product_variant.images else []  # Add this
-                        ),
-                        quantity=item.quantity,
-                        price_per_unit=item.price_per_unit,
-                        price_with_discount=item.price_with_discount,
-                        payment_type=order.payment_type,
-                        total_amount_with_discount=item.total_amount_with_discount,
-                        total_amount=item.total_amount,
-                        notes=item.notes,
-                        created_at=item.created_at,
-                        updated_at=item.updated_at
-                    ) for item in order.items
-                ]
+        result = await self.__session.execute(
+            select(
+                AdminOrder.id,
+                AdminOrder.by,
+                AdminOrder.seller.label("seller_id"),
+                AdminUser.full_name.label("seller_name"),
+                AdminOrder.status,
+                AdminOrder.payment_type,
+                func.coalesce(AdminOrder.total_amount, 0).label("total_amount"),
+                func.coalesce(AdminOrder.total_amount_with_discount, 0).label("total_amount_with_discount"),
+                items_count.label("items_count"),
+                AdminOrder.created_at,
+                AdminOrder.updated_at,
+                AdminOrder.canceled_at,
             )
-            for order in closed_orders
-        ]
+            .outerjoin(AdminUser, AdminUser.id == AdminOrder.seller)
+            .where(and_(*filters))
+            .order_by(AdminOrder.updated_at.desc())
+            .limit(limit).offset(offset)
+        )
+
+        return [AdminOrderSummaryResponse.model_validate(row._asdict()) for row in result.all()]
 
-    async def get_active_promotion(self, product_variant_id: int) -> Optional[Promotion]:
+    async def get_order_items(self, admin_id: int, order_id: int, language: str) -> List[AdminOrderItemResponse] | None:
         result = await self.__session.execute(
-            select(Promotion)
-            .join(promotion_product_variants)
+            select(self._order_items_json(language))
             .where(
                 and_(
-                    promotion_product_variants.c.product_variant_id == product_variant_id,
-                    Promotion.is_active == True,
+                    AdminOrder.id == order_id,
+                    AdminOrder.by == admin_id
                 )
             )
-            .order_by(Promotion.created_at.desc())
         )
-        return result.scalar_one_or_none()
+
+        items = result.scalars().first()
+
+        if items is None:
+            return None
+
+        return [AdminOrderItemResponse.model_validate(item) for item in items]
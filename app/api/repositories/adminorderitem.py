@@ -1,6 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List
 
 from fastapi import Depends, HTTPException
 from sqlalchemy import and_, or_, update, delete
@@ -10,7 +10,9 @@ from sqlalchemy.orm import selectinload
 
 from app.api.models import ProductVariant, Product
 from app.api.models.order import AdminOrder, AdminOrderItem
-from app.api.models.product import Promotion, promotion_product_variants
+from app.api.repositories.product.pricing import PricingRepository
+from app.api.repositories.sales_rollup import SalesRollupRepository
+from app.api.repositories.stock_reservation import StockReservationRepository
 from app.api.schemas.order import AdminOrderItemResponse, AdminOrderItemReturnSchema, AdminOrderUpdate, AdminProductVariantResponse, OrderItemRequest
 from app.core.databases.postgres import get_general_session
 from app.core.models.enums import AdminOrderStatusEnum, PaymentMethodEnum
@@ -20,6 +22,9 @@ from utils.time_utils import now_time
 class AdminOrderItemRepository:
     def __init__(self, session: AsyncSession = Depends(get_general_session)):
         self.__session = session
+        self.__pricing_repository = PricingRepository(session=session)
+        self.__stock_reservation_repository = StockReservationRepository(session=session)
+        self.__sales_rollup_repository = SalesRollupRepository(session=session)
 
     async def get_admin_order_items(self, admin_id: int, language: str) -> List[AdminOrderItemResponse]:
         order_result = await self.__session.execute(
@@ -85,20 +90,6 @@ class AdminOrderItemRepository:
 
         return response
 
-    async def get_active_promotion(self, product_variant_id: int) -> Optional[Promotion]:
-        result = await self.__session.execute(
-            select(Promotion)
-            .join(promotion_product_variants)
-            .where(
-                and_(
-                    promotion_product_variants.c.product_variant_id == product_variant_id,
-                    Promotion.is_active == True,
-                )
-            )
-            .order_by(Promotion.created_at.desc())
-        )
-        return result.scalar_one_or_none()
-
     async def add_items_to_order(
             self,
             items: List[OrderItemRequest],
@@ -140,7 +131,6 @@ class AdminOrderItemRepository:
                         selectinload(ProductVariant.size),
                         selectinload(ProductVariant.measure),
                         selectinload(ProductVariant.images),
-                        selectinload(ProductVariant.promotions),
                         selectinload(ProductVariant.product).selectinload(Product.subcategory)
                     )
                 )
@@ -153,21 +143,15 @@ class AdminOrderItemRepository:
                         detail=f"Product variant with barcode {barcode} not found"
                     )
 
-                if product_variant.amount < item_data.quantity:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Product variant count < order item quantity"
-                    )
-
-                active_promotion = await self.get_active_promotion(product_variant.id)
+                discount = await self.__pricing_repository.get_discount(product_variant.id)
                 original_price = Decimal(str(product_variant.current_price))
                 discounted_price = original_price
 
                 if custom_price is not None:
                     original_price = Decimal(str(custom_price))
                     discounted_price = original_price
-                if active_promotion:
-                    discount_multiplier = Decimal(str((100 - active_promotion.discount) / 100))
+                if discount:
+                    discount_multiplier = Decimal(str((100 - discount) / 100))
                     discounted_price = (original_price * discount_multiplier).quantize(Decimal('0.01'))
 
                 existing_item = await self.__session.execute(
@@ -190,6 +174,12 @@ class AdminOrderItemRepository:
                 )
                 existing_item = existing_item.scalar_one_or_none()
 
+                await self.__stock_reservation_repository.reserve(
+                    order_id=order_id,
+                    product_variant_id=product_variant.id,
+                    quantity=(existing_item.quantity if existing_item else 0) + quantity
+                )
+
                 if existing_item:
                     existing_item.quantity += quantity
                     if custom_price is not None:
@@ -210,6 +200,7 @@ class AdminOrderItemRepository:
                         quantity=quantity,
                         price_per_unit=original_price,
                         price_with_discount=discounted_price,
+                        unit_cost=Decimal(str(product_variant.come_in_price)),
                         total_amount=original_price * quantity,
                         total_amount_with_discount=discounted_price * quantity
                     )
@@ -232,6 +223,8 @@ class AdminOrderItemRepository:
                     response_item = AdminOrderItemResponse.from_order_item(item_response, language)
                     responses.append(response_item)
 
+            except HTTPException:
+                raise
             except Exception as e:
                 raise HTTPException(
                     status_code=500,
@@ -286,16 +279,20 @@ class AdminOrderItemRepository:
 
             new_quantity = float(order_item.quantity) - data.return_quantity
             new_total_amount = new_quantity * float(order_item.price_per_unit)
+            new_total_amount_with_discount = new_quantity * float(order_item.price_with_discount or order_item.price_per_unit)
 
             await self.__session.execute(
                 update(AdminOrderItem)
                 .where(AdminOrderItem.id == order_item_id)
                 .values(
                     quantity=new_quantity,
-                    total_amount=new_total_amount
+                    total_amount=new_total_amount,
+                    total_amount_with_discount=new_total_amount_with_discount
                 )
             )
 
+            await self.__sales_rollup_repository.apply_return(order, order_item, data.return_quantity)
+
             await self.__session.commit()
         except Exception as e:
             await self.__session.rollback()
@@ -347,15 +344,9 @@ class AdminOrderItemRepository:
             raise HTTPException(status_code=404, detail="Order not found")
 
         if data.status == AdminOrderStatusEnum.completed:
-            for order_item in admin_order.items:
-                product_variant = await self.__session.get(ProductVariant, order_item.product_variant_id)
-                if product_variant:
-                    if product_variant.amount < order_item.quantity:
-                        raise HTTPException(
-                            status_code=400,
-                            detail=f"Insufficient stock for product '{product_variant.id}'"
-                        )
-                    product_variant.amount -= float(order_item.quantity)
+            await self.__stock_reservation_repository.consume(admin_order.id)
+        elif data.status == AdminOrderStatusEnum.cancelled:
+            await self.__stock_reservation_repository.release(admin_order.id)
 
         admin_order.status = AdminOrderStatusEnum(data.status)
         admin_order.seller = data.seller_id if data.seller_id else admin_order.seller
@@ -366,6 +357,10 @@ class AdminOrderItemRepository:
         admin_order.final_amount = admin_order.total_amount_with_discount if data.with_discount else admin_order.total_amount
         admin_order.updated_at = now_time()
 
+        if admin_order.status == AdminOrderStatusEnum.completed:
+            await self.__session.flush()
+            await self.__sales_rollup_repository.apply_orders([admin_order.id])
+
         await self.__session.commit()
         return {
             "message": "Order closed successfully",
@@ -383,7 +378,10 @@ class AdminOrderItemRepository:
                 AdminOrderItem.id == order_item_id
             ))
             .where(
-                AdminOrder.by == admin_id,
+                and_(
+                    AdminOrder.by == admin_id,
+                    AdminOrder.status == AdminOrderStatusEnum.opened
+                )
             )
             .options(
                 selectinload(AdminOrderItem.product_variant)
@@ -412,12 +410,10 @@ class AdminOrderItemRepository:
 
         try:
             product_variant = item.product_variant
-            new_amount = float(product_variant.amount) + float(item.quantity) - quantity
-
-            await self.__session.execute(
-                update(ProductVariant)
-                .where(ProductVariant.id == product_variant.id)
-                .values(amount=new_amount)
+            await self.__stock_reservation_repository.reserve(
+                order_id=order.id,
+                product_variant_id=product_variant.id,
+                quantity=quantity
             )
 
             new_total = float(order.total_amount) - float(item.total_amount)
@@ -460,6 +456,9 @@ class AdminOrderItemRepository:
 
             return AdminOrderItemResponse.from_order_item(updated_item, language)
 
+        except HTTPException:
+            await self.__session.rollback()
+            raise
         except Exception as e:
             await self.__session.rollback()
             raise HTTPException(
@@ -506,13 +505,9 @@ class AdminOrderItemRepository:
         order, item = row
 
         try:
-            product_variant = item.product_variant
-            new_amount = float(product_variant.amount) + float(item.quantity)
-
-            await self.__session.execute(
-                update(ProductVariant)
-                .where(ProductVariant.id == product_variant.id)
-                .values(amount=new_amount)
+            await self.__stock_reservation_repository.release(
+                order_id=order.id,
+                product_variant_id=item.product_variant_id
             )
 
             new_total = float(order.total_amount) - float(item.total_amount)
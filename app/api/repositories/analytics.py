@@ -0,0 +1,570 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+from fastapi import Depends
+from sqlalchemy import Date, DateTime, Integer, and_, cast, extract, func, literal, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.order import AdminOrder, AdminOrderItem, DailySalesRollup
+from app.api.models.product import InventoryValuation, LowStockAlert, Product, ProductVariant
+from app.api.models.user import AdminUser
+from app.api.models.warehouse import AdminWarehouse, Warehouse, admin_warehouse_roles
+from app.api.schemas.analytics import HistogramPoint
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import (
+    AdminOrderStatusEnum,
+    ComparisonBucketEnum,
+    DeadStockSortEnum,
+    HistogramBucketEnum,
+    HistogramMetricEnum,
+    LeaderboardSortEnum,
+)
+
+# Order timestamps are stored as naive Asia/Tashkent wall time.
+STORAGE_TIMEZONE = "Asia/Tashkent"
+
+BUCKET_STEPS = {
+    HistogramBucketEnum.quarter_hour: timedelta(minutes=15),
+    HistogramBucketEnum.hour: timedelta(hours=1),
+    HistogramBucketEnum.day: timedelta(days=1),
+    HistogramBucketEnum.week: timedelta(weeks=1),
+}
+
+COMPARISON_STEPS = {
+    ComparisonBucketEnum.day: "1 day",
+    ComparisonBucketEnum.week: "1 week",
+    ComparisonBucketEnum.month: "1 month",
+    ComparisonBucketEnum.quarter: "3 months",
+    ComparisonBucketEnum.year: "1 year",
+}
+
+
+class AnalyticsRepository:
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.__session = session
+
+    async def get_order_histogram(
+            self,
+            warehouse_id: int,
+            start_date: datetime,
+            end_date: datetime,
+            bucket: HistogramBucketEnum,
+            metric: HistogramMetricEnum,
+            timezone: str,
+            status: Optional[AdminOrderStatusEnum] = None,
+    ) -> List[HistogramPoint]:
+        """
+        Dense histogram of orders between ``start_date`` and ``end_date``
+        (wall time in ``timezone``), bucketed in SQL and zero-filled.
+        """
+        step = BUCKET_STEPS[bucket]
+        first_bucket = self.truncate(start_date, bucket)
+        last_bucket = self.truncate(end_date - timedelta(microseconds=1), bucket)
+
+        local_created_at = func.timezone(timezone, func.timezone(STORAGE_TIMEZONE, AdminOrder.created_at))
+        if bucket == HistogramBucketEnum.quarter_hour:
+            bucket_expr = (
+                func.date_trunc(literal_column("'hour'"), local_created_at)
+                + func.floor(extract("minute", local_created_at) / 15) * literal_column("interval '15 minutes'")
+            )
+        else:
+            bucket_expr = func.date_trunc(literal_column(f"'{bucket.value}'"), local_created_at)
+
+        if metric == HistogramMetricEnum.revenue:
+            value_expr = func.coalesce(AdminOrder.total_amount_with_discount, AdminOrder.total_amount, 0)
+        elif metric == HistogramMetricEnum.items:
+            value_expr = (
+                select(func.coalesce(func.sum(AdminOrderItem.quantity), 0))
+                .where(AdminOrderItem.order_id == AdminOrder.id)
+                .correlate(AdminOrder)
+                .scalar_subquery()
+            )
+        else:
+            value_expr = literal(1)
+
+        conditions = [
+            AdminOrder.warehouse_id == warehouse_id,
+            AdminOrder.created_at >= self.to_storage_time(start_date, timezone),
+            AdminOrder.created_at < self.to_storage_time(end_date, timezone),
+        ]
+        if status is not None:
+            conditions.append(AdminOrder.status == status)
+
+        orders = (
+            select(bucket_expr.label("bucket"), value_expr.label("value"))
+            .where(and_(*conditions))
+            .subquery()
+        )
+        totals = (
+            select(orders.c.bucket, func.sum(orders.c.value).label("value"))
+            .group_by(orders.c.bucket)
+            .subquery()
+        )
+        series = func.generate_series(first_bucket, last_bucket, step).table_valued("bucket").render_derived()
+
+        result = await self.__session.execute(
+            select(series.c.bucket, func.coalesce(totals.c.value, 0).label("value"))
+            .select_from(series)
+            .outerjoin(totals, totals.c.bucket == series.c.bucket)
+            .order_by(series.c.bucket)
+        )
+
+        return [HistogramPoint(bucket=row.bucket, value=float(row.value)) for row in result.all()]
+
+    async def get_sales_heatmap(
+            self,
+            warehouse_id: int,
+            start_date: datetime,
+            end_date: datetime,
+            metric: HistogramMetricEnum,
+            timezone: str,
+            seller_id: Optional[int] = None,
+    ):
+        """
+        Completed orders between ``start_date`` and ``end_date`` (wall time in
+        ``timezone``) grouped by local weekday (0 = Monday) and hour. Empty
+        cells are not returned.
+        """
+        local_created_at = func.timezone(timezone, func.timezone(STORAGE_TIMEZONE, AdminOrder.created_at))
+        weekday = cast(extract("isodow", local_created_at), Integer) - 1
+        hour = cast(extract("hour", local_created_at), Integer)
+
+        if metric == HistogramMetricEnum.revenue:
+            value_expr = func.coalesce(AdminOrder.total_amount_with_discount, AdminOrder.total_amount, 0)
+        elif metric == HistogramMetricEnum.items:
+            value_expr = (
+                select(func.coalesce(func.sum(AdminOrderItem.quantity), 0))
+                .where(AdminOrderItem.order_id == AdminOrder.id)
+                .correlate(AdminOrder)
+                .scalar_subquery()
+            )
+        else:
+            value_expr = literal(1)
+
+        conditions = [
+            AdminOrder.warehouse_id == warehouse_id,
+            AdminOrder.status == AdminOrderStatusEnum.completed,
+            AdminOrder.created_at >= self.to_storage_time(start_date, timezone),
+            AdminOrder.created_at < self.to_storage_time(end_date, timezone),
+        ]
+        if seller_id is not None:
+            conditions.append(func.coalesce(AdminOrder.seller, AdminOrder.by) == seller_id)
+
+        orders = (
+            select(weekday.label("weekday"), hour.label("hour"), value_expr.label("value"))
+            .where(and_(*conditions))
+            .subquery()
+        )
+
+        result = await self.__session.execute(
+            select(orders.c.weekday, orders.c.hour, func.sum(orders.c.value).label("value"))
+            .group_by(orders.c.weekday, orders.c.hour)
+        )
+        return result.all()
+
+    async def get_period_comparison(
+            self,
+            warehouse_id: int,
+            start_day: date,
+            end_day: date,
+            bucket: ComparisonBucketEnum,
+            lag: int,
+    ):
+        """
+        Completed sales per bucket between the buckets containing ``start_day``
+        and ``end_day``, each paired with the bucket ``lag`` steps earlier. The
+        series is dense and extended backwards by ``lag`` buckets so that
+        ``LAG`` sees the comparison buckets, which are then filtered out.
+        """
+        unit = literal_column(f"'{bucket.value}'")
+        step = literal_column(f"interval '{COMPARISON_STEPS[bucket]}'")
+        first_bucket = func.date_trunc(unit, datetime.combine(start_day, datetime.min.time()))
+        last_bucket = func.date_trunc(unit, datetime.combine(end_day, datetime.min.time()))
+        series_start = first_bucket - step * lag
+
+        bucket_expr = func.date_trunc(unit, cast(DailySalesRollup.day, DateTime))
+        sales = (
+            select(
+                bucket_expr.label("bucket"),
+                func.sum(DailySalesRollup.discounted_revenue).label("revenue"),
+                func.sum(DailySalesRollup.orders_attributed).label("orders"),
+                func.sum(DailySalesRollup.quantity).label("items"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= cast(series_start, Date),
+                    DailySalesRollup.day < cast(last_bucket + step, Date),
+                )
+            )
+            .group_by(bucket_expr)
+            .subquery()
+        )
+        series = func.generate_series(series_start, last_bucket, step).table_valued("bucket").render_derived()
+
+        revenue = func.coalesce(sales.c.revenue, 0)
+        orders = func.coalesce(sales.c.orders, 0)
+        items = func.coalesce(sales.c["items"], 0)
+        window = {"order_by": series.c.bucket}
+        compared = (
+            select(
+                series.c.bucket,
+                func.lag(series.c.bucket, lag).over(**window).label("previous_bucket"),
+                revenue.label("revenue"),
+                func.lag(revenue, lag).over(**window).label("previous_revenue"),
+                orders.label("orders"),
+                func.lag(orders, lag).over(**window).label("previous_orders"),
+                items.label("items"),
+                func.lag(items, lag).over(**window).label("previous_items"),
+            )
+            .select_from(series)
+            .outerjoin(sales, sales.c.bucket == series.c.bucket)
+            .subquery()
+        )
+
+        result = await self.__session.execute(
+            select(compared)
+            .where(compared.c.bucket >= first_bucket)
+            .order_by(compared.c.bucket)
+        )
+        return result.all()
+
+    async def get_seller_leaderboard(
+            self,
+            warehouse_id: int,
+            start_day: date,
+            end_day: date,
+            sort_by: LeaderboardSortEnum,
+            limit: int,
+    ):
+        """
+        Sellers ranked by ``sort_by`` over an inclusive day range, read from
+        ``daily_sales_rollups``. Ties fall back to discounted revenue, then seller id.
+        """
+        sales = (
+            select(
+                DailySalesRollup.seller_id,
+                func.sum(DailySalesRollup.orders_attributed).label("order_count"),
+                func.sum(DailySalesRollup.quantity).label("items_sold"),
+                func.sum(DailySalesRollup.revenue).label("total_revenue"),
+                func.sum(DailySalesRollup.discounted_revenue).label("total_revenue_with_discount"),
+                func.sum(DailySalesRollup.discounted_revenue - DailySalesRollup.cost).label("margin"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.day <= end_day,
+                )
+            )
+            .group_by(DailySalesRollup.seller_id)
+            .subquery()
+        )
+
+        average_basket = func.coalesce(sales.c.total_revenue_with_discount / func.nullif(sales.c.order_count, 0), 0)
+        margin_percent = func.coalesce(sales.c.margin * 100 / func.nullif(sales.c.total_revenue_with_discount, 0), 0)
+        metric = {
+            LeaderboardSortEnum.revenue: sales.c.total_revenue_with_discount,
+            LeaderboardSortEnum.orders: sales.c.order_count,
+            LeaderboardSortEnum.items: sales.c.items_sold,
+            LeaderboardSortEnum.average_basket: average_basket,
+            LeaderboardSortEnum.margin: sales.c.margin,
+        }[sort_by]
+
+        ordering = (metric.desc(), sales.c.total_revenue_with_discount.desc(), sales.c.seller_id)
+        rank = func.row_number().over(order_by=ordering)
+        role_name = (
+            select(AdminWarehouse.name)
+            .join(admin_warehouse_roles, admin_warehouse_roles.c.warehouse_role_id == AdminWarehouse.id)
+            .where(
+                and_(
+                    admin_warehouse_roles.c.admin_id == AdminUser.id,
+                    AdminWarehouse.warehouse_id == warehouse_id,
+                )
+            )
+            .order_by(AdminWarehouse.id)
+            .limit(1)
+            .correlate(AdminUser)
+            .scalar_subquery()
+        )
+
+        result = await self.__session.execute(
+            select(
+                rank.label("rank"),
+                AdminUser.id,
+                AdminUser.full_name,
+                AdminUser.phone_number,
+                AdminUser.profile_picture,
+                role_name.label("role_name"),
+                sales.c.order_count,
+                sales.c.items_sold,
+                sales.c.total_revenue,
+                sales.c.total_revenue_with_discount,
+                average_basket.label("average_basket"),
+                sales.c.margin,
+                margin_percent.label("margin_percent"),
+            )
+            .join(sales, sales.c.seller_id == AdminUser.id)
+            .order_by(*ordering)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_warehouse_kpis(self, warehouse_ids: List[int], start_day: date, end_day: date):
+        """
+        Per-warehouse KPIs plus a combined row in one statement. Each source is
+        aggregated per warehouse first; ``GROUP BY ROLLUP`` then adds the total
+        row, whose ``warehouse_id`` is NULL.
+        """
+        orders = (
+            select(
+                AdminOrder.warehouse_id,
+                func.count().label("orders_total"),
+                func.count().filter(AdminOrder.status == AdminOrderStatusEnum.completed).label("orders_completed"),
+                func.count().filter(AdminOrder.status == AdminOrderStatusEnum.cancelled).label("orders_cancelled"),
+                func.count().filter(AdminOrder.status == AdminOrderStatusEnum.opened).label("orders_opened"),
+            )
+            .where(
+                and_(
+                    AdminOrder.warehouse_id.in_(warehouse_ids),
+                    AdminOrder.created_at >= datetime.combine(start_day, datetime.min.time()),
+                    AdminOrder.created_at < datetime.combine(end_day + timedelta(days=1), datetime.min.time()),
+                )
+            )
+            .group_by(AdminOrder.warehouse_id)
+            .subquery()
+        )
+
+        sales = (
+            select(
+                DailySalesRollup.warehouse_id,
+                func.sum(DailySalesRollup.orders_attributed).label("sales_orders"),
+                func.sum(DailySalesRollup.quantity).label("items_sold"),
+                func.sum(DailySalesRollup.revenue).label("revenue"),
+                func.sum(DailySalesRollup.discounted_revenue).label("discounted_revenue"),
+                func.sum(DailySalesRollup.cost).label("cost"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id.in_(warehouse_ids),
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.day <= end_day,
+                )
+            )
+            .group_by(DailySalesRollup.warehouse_id)
+            .subquery()
+        )
+
+        stock = (
+            select(
+                InventoryValuation.warehouse_id,
+                func.sum(InventoryValuation.variants).label("stock_variants"),
+                func.sum(InventoryValuation.cost_value).label("stock_cost_value"),
+                func.sum(InventoryValuation.retail_value).label("stock_retail_value"),
+            )
+            .where(InventoryValuation.warehouse_id.in_(warehouse_ids))
+            .group_by(InventoryValuation.warehouse_id)
+            .subquery()
+        )
+
+        # Every variant at or below zero has an active low-stock alert.
+        out_of_stock = (
+            select(
+                LowStockAlert.warehouse_id,
+                func.count().label("out_of_stock_variants"),
+            )
+            .where(
+                and_(
+                    LowStockAlert.warehouse_id.in_(warehouse_ids),
+                    LowStockAlert.is_active,
+                    LowStockAlert.amount <= 0,
+                )
+            )
+            .group_by(LowStockAlert.warehouse_id)
+            .subquery()
+        )
+
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
+
+        discounted_revenue = total(sales.c.discounted_revenue)
+        cost = total(sales.c.cost)
+        sales_orders = total(sales.c.sales_orders)
+
+        result = await self.__session.execute(
+            select(
+                Warehouse.id.label("warehouse_id"),
+                func.min(Warehouse.name).label("warehouse_name"),
+                total(orders.c.orders_total).label("orders_total"),
+                total(orders.c.orders_completed).label("orders_completed"),
+                total(orders.c.orders_cancelled).label("orders_cancelled"),
+                total(orders.c.orders_opened).label("orders_opened"),
+                total(sales.c.items_sold).label("items_sold"),
+                total(sales.c.revenue).label("revenue"),
+                discounted_revenue.label("discounted_revenue"),
+                cost.label("cost"),
+                (discounted_revenue - cost).label("profit"),
+                func.coalesce(discounted_revenue / func.nullif(sales_orders, 0), 0).label("average_basket"),
+                total(stock.c.stock_variants).label("stock_variants"),
+                total(out_of_stock.c.out_of_stock_variants).label("out_of_stock_variants"),
+                total(stock.c.stock_cost_value).label("stock_cost_value"),
+                total(stock.c.stock_retail_value).label("stock_retail_value"),
+            )
+            .outerjoin(orders, orders.c.warehouse_id == Warehouse.id)
+            .outerjoin(sales, sales.c.warehouse_id == Warehouse.id)
+            .outerjoin(stock, stock.c.warehouse_id == Warehouse.id)
+            .outerjoin(out_of_stock, out_of_stock.c.warehouse_id == Warehouse.id)
+            .where(Warehouse.id.in_(warehouse_ids))
+            .group_by(func.rollup(Warehouse.id))
+            .order_by(Warehouse.id.nulls_last())
+        )
+        return result.all()
+
+    async def get_variant_period_sales(
+            self,
+            warehouse_id: int,
+            start_day: date,
+            end_day: date,
+            period_days: int,
+            language: str,
+    ):
+        """
+        One row per (variant, period) with sales, plus one row with a NULL
+        period for every variant of the warehouse that sold nothing.
+        """
+        period_index = cast(DailySalesRollup.day - start_day, Integer) // period_days
+        sales = (
+            select(
+                DailySalesRollup.product_variant_id,
+                period_index.label("period_index"),
+                func.sum(DailySalesRollup.quantity).label("quantity"),
+                func.sum(DailySalesRollup.discounted_revenue).label("revenue"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.day <= end_day,
+                )
+            )
+            .group_by(DailySalesRollup.product_variant_id, period_index)
+            .subquery()
+        )
+
+        result = await self.__session.execute(
+            select(
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.name[language].astext.label("product_name"),
+                sales.c.period_index,
+                sales.c.quantity,
+                sales.c.revenue,
+            )
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(sales, sales.c.product_variant_id == ProductVariant.id)
+            .where(Product.warehouse_id == warehouse_id)
+        )
+        return result.all()
+
+    async def get_dead_stock(
+            self,
+            warehouse_id: int,
+            cutoff: datetime,
+            start_day: date,
+            end_day: date,
+            max_sold: Optional[float],
+            sort_by: DeadStockSortEnum,
+            language: str,
+            limit: int,
+            offset: int,
+    ):
+        """
+        In-stock variants with no sale since ``cutoff`` (read from
+        ``ProductVariant.last_sold_at``), or, when ``max_sold`` is given, that
+        sold at most ``max_sold`` units between ``start_day`` and ``end_day``.
+        Variants created after ``cutoff`` are left out. Every row carries the
+        totals of the whole result set.
+        """
+        conditions = [
+            Product.warehouse_id == warehouse_id,
+            # Inline constant so the planner can use the partial in-stock index.
+            ProductVariant.amount > literal_column("0"),
+            ProductVariant.created_at < cutoff,
+        ]
+
+        sales = None
+        if max_sold is None:
+            sold_quantity = literal(0)
+            conditions.append(
+                or_(ProductVariant.last_sold_at.is_(None), ProductVariant.last_sold_at < cutoff)
+            )
+        else:
+            sales = (
+                select(
+                    DailySalesRollup.product_variant_id,
+                    func.sum(DailySalesRollup.quantity).label("quantity"),
+                )
+                .where(
+                    and_(
+                        DailySalesRollup.warehouse_id == warehouse_id,
+                        DailySalesRollup.day >= start_day,
+                        DailySalesRollup.day <= end_day,
+                    )
+                )
+                .group_by(DailySalesRollup.product_variant_id)
+                .subquery()
+            )
+            sold_quantity = func.coalesce(sales.c.quantity, 0)
+            conditions.append(sold_quantity <= max_sold)
+
+        capital = ProductVariant.amount * ProductVariant.come_in_price
+        retail_value = ProductVariant.amount * ProductVariant.current_price
+        if sort_by == DeadStockSortEnum.last_sold:
+            ordering = (ProductVariant.last_sold_at.asc().nulls_first(), capital.desc(), ProductVariant.id)
+        else:
+            ordering = (capital.desc(), ProductVariant.id)
+
+        stmt = (
+            select(
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.id.label("product_id"),
+                Product.name[language].astext.label("product_name"),
+                ProductVariant.amount,
+                ProductVariant.come_in_price,
+                ProductVariant.current_price,
+                capital.label("capital"),
+                retail_value.label("retail_value"),
+                sold_quantity.label("sold_quantity"),
+                ProductVariant.last_sold_at,
+                ProductVariant.created_at,
+                func.count().over().label("total_count"),
+                func.sum(capital).over().label("total_capital"),
+                func.sum(retail_value).over().label("total_retail_value"),
+            )
+            .join(Product, Product.id == ProductVariant.product_id)
+        )
+        if sales is not None:
+            stmt = stmt.outerjoin(sales, sales.c.product_variant_id == ProductVariant.id)
+
+        result = await self.__session.execute(
+            stmt.where(and_(*conditions)).order_by(*ordering).limit(limit).offset(offset)
+        )
+        return result.all()
+
+    @staticmethod
+    def truncate(value: datetime, bucket: HistogramBucketEnum) -> datetime:
+        if bucket == HistogramBucketEnum.quarter_hour:
+            return value.replace(minute=value.minute - value.minute % 15, second=0, microsecond=0)
+        if bucket == HistogramBucketEnum.hour:
+            return value.replace(minute=0, second=0, microsecond=0)
+
+        day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+        if bucket == HistogramBucketEnum.week:
+            return day - timedelta(days=day.weekday())
+        return day
+
+    @staticmethod
+    def to_storage_time(value: datetime, timezone: str) -> datetime:
+        return value.replace(tzinfo=ZoneInfo(timezone)).astimezone(ZoneInfo(STORAGE_TIMEZONE)).replace(tzinfo=None)
@@ -0,0 +1,203 @@
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import Depends
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.api.models.order import AdminOrder, AdminOrderItem, DailySalesRollup
+from app.api.models.product import Color, Measure, Product, ProductVariant, Size
+from app.api.models.revision import Revision, RevisionItem
+from app.api.models.user import AdminUser
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import AdminOrderStatusEnum
+
+EXPORT_BATCH_SIZE = 2000
+
+
+class ExportRepository:
+    """
+    Report queries for file exports. Each ``*_query`` returns the header row
+    and an unpaginated statement meant to be consumed through ``stream``.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.__session = session
+
+    async def stream(self, stmt) -> AsyncIterator[tuple]:
+        result = await self.__session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            for row in partition:
+                yield tuple(row)
+
+    @staticmethod
+    def variant_sales_query(warehouse_id: int, start_day: date, end_day: date, language: str) -> Tuple[List[str], object]:
+        sales = (
+            select(
+                DailySalesRollup.product_variant_id,
+                func.sum(DailySalesRollup.quantity).label("quantity"),
+                func.sum(DailySalesRollup.revenue).label("revenue"),
+                func.sum(DailySalesRollup.discounted_revenue).label("discounted_revenue"),
+                func.sum(DailySalesRollup.cost).label("cost"),
+                func.sum(DailySalesRollup.order_count).label("order_count"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.day <= end_day,
+                )
+            )
+            .group_by(DailySalesRollup.product_variant_id)
+            .subquery()
+        )
+
+        stmt = (
+            select(
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.name[language].astext,
+                Color.hex_code,
+                Size.size,
+                Measure.name,
+                sales.c.quantity,
+                sales.c.revenue,
+                sales.c.discounted_revenue,
+                sales.c.cost,
+                sales.c.discounted_revenue - sales.c.cost,
+                sales.c.order_count,
+            )
+            .join(sales, sales.c.product_variant_id == ProductVariant.id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(Color, ProductVariant.color_id == Color.id)
+            .outerjoin(Size, ProductVariant.size_id == Size.id)
+            .outerjoin(Measure, ProductVariant.measure_id == Measure.id)
+            .order_by(ProductVariant.id)
+        )
+
+        headers = [
+            "variant_id", "barcode", "product", "color", "size", "measure", "quantity",
+            "revenue", "discounted_revenue", "cost", "profit", "order_count",
+        ]
+        return headers, stmt
+
+    @staticmethod
+    def order_lines_query(warehouse_id: int, start_day: date, end_day: date, language: str) -> Tuple[List[str], object]:
+        seller = aliased(AdminUser)
+
+        stmt = (
+            select(
+                AdminOrder.id,
+                AdminOrder.created_at,
+                AdminOrder.status,
+                AdminOrder.payment_type,
+                seller.full_name,
+                AdminOrder.user_name,
+                AdminOrder.user_phone,
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.name[language].astext,
+                AdminOrderItem.quantity,
+                AdminOrderItem.price_per_unit,
+                AdminOrderItem.price_with_discount,
+                AdminOrderItem.total_amount,
+                AdminOrderItem.total_amount_with_discount,
+                AdminOrderItem.unit_cost,
+                func.coalesce(AdminOrderItem.total_amount_with_discount, AdminOrderItem.total_amount)
+                - AdminOrderItem.quantity * AdminOrderItem.unit_cost,
+            )
+            .join(AdminOrderItem, AdminOrderItem.order_id == AdminOrder.id)
+            .join(ProductVariant, ProductVariant.id == AdminOrderItem.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(seller, seller.id == func.coalesce(AdminOrder.seller, AdminOrder.by))
+            .where(
+                and_(
+                    AdminOrder.warehouse_id == warehouse_id,
+                    AdminOrder.status.in_([AdminOrderStatusEnum.completed, AdminOrderStatusEnum.cancelled]),
+                    AdminOrder.created_at >= datetime.combine(start_day, datetime.min.time()),
+                    AdminOrder.created_at < datetime.combine(end_day + timedelta(days=1), datetime.min.time()),
+                )
+            )
+            .order_by(AdminOrder.id, AdminOrderItem.id)
+        )
+
+        headers = [
+            "order_id", "created_at", "status", "payment_type", "seller", "customer_name", "customer_phone",
+            "variant_id", "barcode", "product", "quantity", "price_per_unit", "price_with_discount",
+            "total_amount", "total_amount_with_discount", "unit_cost", "profit",
+        ]
+        return headers, stmt
+
+    @staticmethod
+    def stock_valuation_query(warehouse_id: int, language: str) -> Tuple[List[str], object]:
+        stmt = (
+            select(
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.name[language].astext,
+                Color.hex_code,
+                Size.size,
+                Measure.name,
+                ProductVariant.amount,
+                ProductVariant.come_in_price,
+                ProductVariant.current_price,
+                ProductVariant.amount * ProductVariant.come_in_price,
+                ProductVariant.amount * ProductVariant.current_price,
+            )
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(Color, ProductVariant.color_id == Color.id)
+            .outerjoin(Size, ProductVariant.size_id == Size.id)
+            .outerjoin(Measure, ProductVariant.measure_id == Measure.id)
+            .where(Product.warehouse_id == warehouse_id)
+            .order_by(ProductVariant.id)
+        )
+
+        headers = [
+            "variant_id", "barcode", "product", "color", "size", "measure", "amount",
+            "come_in_price", "current_price", "cost_value", "retail_value",
+        ]
+        return headers, stmt
+
+    @staticmethod
+    def revision_items_query(
+            warehouse_id: int,
+            start_day: date,
+            end_day: date,
+            language: str,
+            revision_id: Optional[int] = None,
+    ) -> Tuple[List[str], object]:
+        conditions = [Revision.warehouse_id == warehouse_id]
+        if revision_id is not None:
+            conditions.append(Revision.id == revision_id)
+        else:
+            conditions.append(Revision.created_at >= datetime.combine(start_day, datetime.min.time()))
+            conditions.append(Revision.created_at < datetime.combine(end_day + timedelta(days=1), datetime.min.time()))
+
+        stmt = (
+            select(
+                Revision.id,
+                Revision.status,
+                Revision.created_at,
+                Revision.completed_at,
+                ProductVariant.id,
+                ProductVariant.barcode,
+                Product.name[language].astext,
+                RevisionItem.system_quantity,
+                RevisionItem.actual_quantity,
+                RevisionItem.difference,
+                RevisionItem.scanned_at,
+                RevisionItem.notes,
+            )
+            .join(RevisionItem, RevisionItem.revision_id == Revision.id)
+            .join(ProductVariant, ProductVariant.id == RevisionItem.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(and_(*conditions))
+            .order_by(Revision.id, RevisionItem.id)
+        )
+
+        headers = [
+            "revision_id", "status", "created_at", "completed_at", "variant_id", "barcode", "product",
+            "system_quantity", "actual_quantity", "difference", "scanned_at", "notes",
+        ]
+        return headers, stmt
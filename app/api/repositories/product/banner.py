@@ -1,13 +1,14 @@
 from fastapi import Depends, HTTPException
-from sqlalchemy import select
+from sqlalchemy import and_, exists, func, insert, literal, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 from typing import List, Optional
 from zoneinfo import ZoneInfo
 
-from app.api.models.product import Banner, ProductVariant
+from app.api.models.product import Banner, ProductVariant, banner_products
 from app.api.schemas.product.banner import BannerCreate, BannerUpdate
 from app.core.databases.postgres import get_general_session
+from utils.time_utils import now_time
 
 
 # repository.py
@@ -29,27 +30,17 @@ class BannerRepository:
             start_date = banner_data.start_date if banner_data.start_date.tzinfo is None else banner_data.start_date.astimezone().replace(tzinfo=None)
             end_date = banner_data.end_date if banner_data.end_date.tzinfo is None else banner_data.end_date.astimezone().replace(tzinfo=None)
 
-            stmt = select(ProductVariant).where(
-                ProductVariant.id.in_(banner_data.product_variant_ids)
-            )
-            result = await self.db.execute(stmt)
-            product_variants = result.scalars().all()
-
             banner_dict = banner_data.model_dump(exclude={'product_variant_ids'})
             banner_dict['start_date'] = start_date
             banner_dict['end_date'] = end_date
-            
+
             banner = Banner(**banner_dict)
-            banner.product_variants = product_variants
 
             self.db.add(banner)
             await self.db.flush()
 
-            for variant in product_variants:
-                if not variant.old_price:
-                    variant.old_price = variant.current_price
-                variant.discount = banner.discount_percentage
-                variant.current_price = variant.old_price * (1 - banner.discount_percentage / 100)
+            await self._attach_variants(banner.id, banner_data.product_variant_ids)
+            await self.activate_due_banners([banner.id])
 
             await self.db.commit()
             await self.db.refresh(banner)
@@ -63,7 +54,6 @@ class BannerRepository:
                 detail=f"Failed to create banner: {str(e)}"
             )
 
-
     async def get_by_id(self, banner_id: int) -> Optional[Banner]:
         stmt = select(Banner).where(Banner.id == banner_id)
         result = await self.db.execute(stmt)
@@ -75,8 +65,11 @@ class BannerRepository:
         return result.scalars().all()
 
     async def get_active_banners(self) -> List[Banner]:
+        current_time = now_time()
         stmt = select(Banner).where(
             Banner.is_active == True,
+            Banner.start_date <= current_time,
+            Banner.end_date > current_time,
         )
         result = await self.db.execute(stmt)
         return result.scalars().all()
@@ -87,31 +80,27 @@ class BannerRepository:
             return None
 
         update_data = banner_data.model_dump(exclude_unset=True)
-        
-        if 'product_variant_ids' in update_data:
-            product_variant_ids = update_data.pop('product_variant_ids')
-            stmt = select(ProductVariant).where(
-                ProductVariant.id.in_(product_variant_ids)
-            )
-            result = await self.db.execute(stmt)
-            new_variants = result.scalars().all()
-
-            for variant in banner.product_variants:
-                if variant.old_price:
-                    variant.current_price = variant.old_price
-                    variant.discount = None
-                    variant.old_price = None
-
-            banner.product_variants = new_variants
-            for variant in new_variants:
-                if not variant.old_price:
-                    variant.old_price = variant.current_price
-                variant.discount = banner.discount_percentage
-                variant.current_price = variant.old_price * (1 - banner.discount_percentage / 100)
+        product_variant_ids = update_data.pop('product_variant_ids', None)
+
+        await self.deactivate_banners([banner_id], force=True)
+
+        for key in ('start_date', 'end_date'):
+            value = update_data.get(key)
+            if value is not None and value.tzinfo is not None:
+                update_data[key] = value.astimezone().replace(tzinfo=None)
 
         for key, value in update_data.items():
             setattr(banner, key, value)
 
+        if product_variant_ids is not None:
+            await self.db.execute(
+                delete(banner_products).where(banner_products.c.banner_id == banner_id)
+            )
+            await self._attach_variants(banner_id, product_variant_ids)
+
+        await self.db.flush()
+        await self.activate_due_banners([banner_id])
+
         await self.db.commit()
         await self.db.refresh(banner)
         return banner
@@ -121,12 +110,151 @@ class BannerRepository:
         if not banner:
             return False
 
-        for variant in banner.product_variants:
-            if variant.old_price:
-                variant.current_price = variant.old_price
-                variant.discount = None
-                variant.old_price = None
+        await self.deactivate_banners([banner_id], force=True)
+        await self.db.execute(
+            delete(banner_products).where(banner_products.c.banner_id == banner_id)
+        )
 
         await self.db.delete(banner)
         await self.db.commit()
         return True
+
+    async def activate_due_banners(self, banner_ids: Optional[List[int]] = None) -> List[int]:
+        """Writes the discount of every banner whose window has started to its variants."""
+        current_time = now_time()
+        conditions = [
+            Banner.is_active == True,
+            Banner.is_applied == False,
+            Banner.start_date <= current_time,
+            Banner.end_date > current_time,
+        ]
+        if banner_ids is not None:
+            conditions.append(Banner.id.in_(banner_ids))
+
+        result = await self.db.execute(
+            update(Banner)
+            .where(and_(*conditions))
+            .values(is_applied=True)
+            .returning(Banner.id)
+        )
+        due_ids = result.scalars().all()
+        if not due_ids:
+            return []
+
+        await self.db.execute(
+            update(banner_products)
+            .where(
+                and_(
+                    banner_products.c.banner_id.in_(due_ids),
+                    banner_products.c.product_variant_id == ProductVariant.id,
+                    banner_products.c.original_price.is_(None),
+                )
+            )
+            .values(original_price=func.coalesce(ProductVariant.old_price, ProductVariant.current_price))
+        )
+
+        await self._apply_best_discounts(due_ids)
+
+        return due_ids
+
+    async def deactivate_banners(self, banner_ids: Optional[List[int]] = None, force: bool = False) -> List[int]:
+        """
+        Restores the recorded pre-discount price for banners that ended or were switched off.
+        With ``force`` the given banners are reverted regardless of their window.
+        """
+        conditions = [Banner.is_applied == True]
+        if not force:
+            conditions.append(or_(Banner.is_active == False, Banner.end_date <= now_time()))
+        if banner_ids is not None:
+            conditions.append(Banner.id.in_(banner_ids))
+
+        result = await self.db.execute(
+            update(Banner)
+            .where(and_(*conditions))
+            .values(is_applied=False)
+            .returning(Banner.id)
+        )
+        ended_ids = result.scalars().all()
+        if not ended_ids:
+            return []
+
+        other_banner = banner_products.alias("other_banner")
+        still_discounted = exists(
+            select(literal(1))
+            .select_from(other_banner.join(Banner, Banner.id == other_banner.c.banner_id))
+            .where(
+                and_(
+                    other_banner.c.product_variant_id == ProductVariant.id,
+                    Banner.is_applied == True,
+                )
+            )
+        )
+
+        await self.db.execute(
+            update(ProductVariant)
+            .where(
+                and_(
+                    ProductVariant.id == banner_products.c.product_variant_id,
+                    banner_products.c.banner_id.in_(ended_ids),
+                    banner_products.c.original_price.is_not(None),
+                    ~still_discounted,
+                )
+            )
+            .values(
+                current_price=banner_products.c.original_price,
+                old_price=None,
+                discount=None,
+            )
+        )
+        await self.db.execute(
+            update(banner_products)
+            .where(banner_products.c.banner_id.in_(ended_ids))
+            .values(original_price=None)
+        )
+        await self._apply_best_discounts(ended_ids)
+
+        return ended_ids
+
+    async def _apply_best_discounts(self, banner_ids: List[int]) -> None:
+        # A variant attached to several running banners gets the largest discount.
+        best = (
+            select(
+                banner_products.c.product_variant_id,
+                banner_products.c.original_price,
+                Banner.discount_percentage,
+            )
+            .join(Banner, Banner.id == banner_products.c.banner_id)
+            .where(and_(Banner.is_applied == True, banner_products.c.original_price.is_not(None)))
+            .distinct(banner_products.c.product_variant_id)
+            .order_by(banner_products.c.product_variant_id, Banner.discount_percentage.desc(), Banner.id)
+            .subquery()
+        )
+        await self.db.execute(
+            update(ProductVariant)
+            .where(
+                and_(
+                    ProductVariant.id == best.c.product_variant_id,
+                    ProductVariant.id.in_(
+                        select(banner_products.c.product_variant_id)
+                        .where(banner_products.c.banner_id.in_(banner_ids))
+                    ),
+                )
+            )
+            .values(
+                old_price=best.c.original_price,
+                discount=best.c.discount_percentage,
+                current_price=best.c.original_price * (1 - best.c.discount_percentage / 100),
+            )
+        )
+
+    async def _attach_variants(self, banner_id: int, product_variant_ids: List[int]) -> None:
+        if not product_variant_ids:
+            return
+
+        await self.db.execute(
+            insert(banner_products).from_select(
+                ['banner_id', 'product_variant_id'],
+                select(literal(banner_id), ProductVariant.id)
+                .where(ProductVariant.id.in_(product_variant_ids))
+            )
+        )
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import List
+
+import numpy as np
+from fastapi import Depends
+from sqlalchemy import Integer, and_, cast, delete, distinct, exists, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.order import DailySalesRollup
+from app.api.models.product import Product, ProductVariant, VariantDemandForecast
+from app.api.services.demand_forecast import forecast
+from app.core.databases.postgres import get_general_session
+from app.core.settings import get_settings
+from utils.time_utils import now_time
+
+settings = get_settings()
+
+# Beyond this a stock-out date is meaningless (and would overflow ``date``).
+MAX_STOCKOUT_DAYS = 3650
+
+
+class DemandForecastRepository:
+    """
+    Nightly demand forecasts per variant, stored in ``variant_demand_forecasts``
+    so that low-stock and reorder views are plain indexed reads.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.session = session
+
+    async def get_warehouse_ids(self) -> List[int]:
+        result = await self.session.execute(select(distinct(Product.warehouse_id)))
+        return list(result.scalars().all())
+
+    async def is_fresh(self, warehouse_id: int, since: datetime) -> bool:
+        result = await self.session.execute(
+            select(
+                exists().where(
+                    and_(
+                        VariantDemandForecast.warehouse_id == warehouse_id,
+                        VariantDemandForecast.computed_at >= since,
+                    )
+                )
+            )
+        )
+        return bool(result.scalar())
+
+    async def refresh_warehouse(self, warehouse_id: int) -> int:
+        """Recomputes every variant of the warehouse from the last ``FORECAST_HISTORY_DAYS`` full days."""
+        current_time = now_time()
+        today = current_time.date()
+        history_days = settings.FORECAST_HISTORY_DAYS
+        start_day = today - timedelta(days=history_days)
+
+        day_index = cast(DailySalesRollup.day - start_day, Integer)
+        daily = (
+            select(
+                DailySalesRollup.product_variant_id,
+                day_index.label("day_index"),
+                func.sum(DailySalesRollup.quantity).label("quantity"),
+            )
+            .where(
+                and_(
+                    DailySalesRollup.warehouse_id == warehouse_id,
+                    DailySalesRollup.day >= start_day,
+                    DailySalesRollup.day < today,
+                )
+            )
+            .group_by(DailySalesRollup.product_variant_id, day_index)
+            .subquery()
+        )
+
+        result = await self.session.execute(
+            select(ProductVariant.id, ProductVariant.amount, daily.c.day_index, daily.c.quantity)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .outerjoin(daily, daily.c.product_variant_id == ProductVariant.id)
+            .where(Product.warehouse_id == warehouse_id)
+        )
+        rows = result.all()
+
+        values = await asyncio.to_thread(self._compute, rows, history_days, today)
+        for value in values:
+            value.update(warehouse_id=warehouse_id, computed_at=current_time)
+
+        await self.session.execute(
+            delete(VariantDemandForecast).where(VariantDemandForecast.warehouse_id == warehouse_id)
+        )
+        if values:
+            await self.session.execute(insert(VariantDemandForecast), values)
+
+        return len(values)
+
+    @staticmethod
+    def _compute(rows, history_days: int, today: date) -> List[dict]:
+        if not rows:
+            return []
+
+        count = len(rows)
+        variant_ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=count)
+        day_indexes = np.fromiter((-1 if row.day_index is None else row.day_index for row in rows), dtype=np.int64, count=count)
+        quantities = np.fromiter((row.quantity or 0 for row in rows), dtype=np.float64, count=count)
+        amounts = np.fromiter((row.amount or 0 for row in rows), dtype=np.float64, count=count)
+
+        unique_ids, first_rows, positions = np.unique(variant_ids, return_index=True, return_inverse=True)
+        daily_sales = np.zeros((len(unique_ids), history_days), dtype=np.float64)
+        sold = (day_indexes >= 0) & (day_indexes < history_days)
+        np.add.at(daily_sales, (positions[sold], day_indexes[sold]), quantities[sold])
+
+        stock = amounts[first_rows]
+        result = forecast(
+            daily_sales,
+            stock,
+            alpha=settings.FORECAST_SMOOTHING_ALPHA,
+            lead_time_days=settings.FORECAST_LEAD_TIME_DAYS,
+            review_days=settings.FORECAST_REVIEW_DAYS,
+            service_z=settings.FORECAST_SERVICE_LEVEL_Z,
+        )
+
+        values = []
+        for variant_id, amount, demand, std, cover, reorder_point, suggested in zip(
+                unique_ids.tolist(),
+                stock.tolist(),
+                result.daily_demand.tolist(),
+                result.demand_std.tolist(),
+                result.days_of_cover.tolist(),
+                result.reorder_point.tolist(),
+                result.suggested_order_quantity.tolist(),
+        ):
+            has_demand = cover == cover
+            values.append({
+                "product_variant_id": variant_id,
+                "daily_demand": round(demand, 4),
+                "demand_std": round(std, 4),
+                "stock": amount,
+                "days_of_cover": round(cover, 2) if has_demand else None,
+                "stockout_date": today + timedelta(days=int(cover)) if has_demand and cover < MAX_STOCKOUT_DAYS else None,
+                "reorder_point": round(reorder_point, 2),
+                "suggested_order_quantity": suggested,
+            })
+        return values
+
+    async def get_reorder_list(self, warehouse_id: int, limit: int, offset: int):
+        result = await self.session.execute(
+            select(VariantDemandForecast, ProductVariant.barcode, ProductVariant.amount, Product.name)
+            .join(ProductVariant, ProductVariant.id == VariantDemandForecast.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(
+                and_(
+                    VariantDemandForecast.warehouse_id == warehouse_id,
+                    VariantDemandForecast.suggested_order_quantity > 0,
+                )
+            )
+            .order_by(VariantDemandForecast.stockout_date.asc().nulls_last(), VariantDemandForecast.product_variant_id)
+            .limit(limit)
+            .offset(offset)
+        )
+        return result.all()
@@ -0,0 +1,141 @@
+from typing import List, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.product import LowStockAlert, Product, ProductVariant
+from app.api.models.warehouse import WarehouseSubcategory
+from app.core.databases.postgres import get_general_session
+from utils.time_utils import now_time
+
+# Must match the pg_notify channel in the ``low_stock_alerts`` migration.
+LOW_STOCK_CHANNEL = "low_stock_alerts"
+
+
+class LowStockAlertRepository:
+    """
+    Threshold crossings are detected by the ``product_variants`` trigger; this
+    repository only reads the alert feed, changes thresholds and claims alerts
+    for push delivery.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.session = session
+
+    async def get_active_alerts(self, warehouse_id: int, limit: int, offset: int):
+        # Served by the partial index on active alerts, so the cost follows the
+        # number of alerts rather than the size of the warehouse.
+        result = await self.session.execute(
+            select(LowStockAlert, ProductVariant.barcode, Product.id.label("product_id"), Product.name)
+            .join(ProductVariant, ProductVariant.id == LowStockAlert.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(
+                and_(
+                    LowStockAlert.warehouse_id == warehouse_id,
+                    LowStockAlert.is_active,
+                )
+            )
+            .order_by(LowStockAlert.triggered_at.desc(), LowStockAlert.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+        return result.all()
+
+    async def set_variant_thresholds(
+            self, warehouse_id: int, variant_ids: List[int], min_stock: Optional[float]
+    ) -> List[int]:
+        """The trigger re-evaluates each updated variant in the same statement."""
+        result = await self.session.execute(
+            update(ProductVariant)
+            .where(
+                and_(
+                    ProductVariant.id.in_(variant_ids),
+                    ProductVariant.product_id == Product.id,
+                    Product.warehouse_id == warehouse_id,
+                )
+            )
+            .values(min_stock=min_stock)
+            .returning(ProductVariant.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = list(result.scalars().all())
+        await self.session.commit()
+        return updated
+
+    async def set_subcategory_threshold(
+            self, warehouse_id: int, subcategory_id: int, min_stock: Optional[float]
+    ) -> List[int]:
+        result = await self.session.execute(
+            update(WarehouseSubcategory)
+            .where(
+                and_(
+                    WarehouseSubcategory.warehouse_id == warehouse_id,
+                    WarehouseSubcategory.subcategory_id == subcategory_id,
+                )
+            )
+            .values(min_stock=min_stock)
+            .returning(WarehouseSubcategory.id)
+        )
+        if result.scalar_one_or_none() is None:
+            await self.session.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Subcategory not found in this warehouse",
+            )
+
+        # Variants without their own threshold inherit the new one; the row
+        # trigger does not see this change, so evaluate them explicitly.
+        result = await self.session.execute(
+            select(ProductVariant.id, func.evaluate_low_stock(ProductVariant.id))
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(
+                and_(
+                    Product.warehouse_id == warehouse_id,
+                    Product.subcategory_id == subcategory_id,
+                    ProductVariant.min_stock.is_(None),
+                )
+            )
+        )
+        evaluated = [row.id for row in result.all()]
+        await self.session.commit()
+        return evaluated
+
+    async def claim_for_notification(self, alert_ids: Optional[List[int]] = None, limit: int = 100):
+        """
+        Marks active, not yet notified alerts as notified and returns them with
+        product details. Only one worker can claim a given alert.
+        """
+        conditions = [LowStockAlert.is_active, LowStockAlert.notified_at.is_(None)]
+        if alert_ids is not None:
+            conditions.append(LowStockAlert.id.in_(alert_ids))
+
+        pending = (
+            select(LowStockAlert.id)
+            .where(and_(*conditions))
+            .order_by(LowStockAlert.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        claimed = (
+            update(LowStockAlert)
+            .where(LowStockAlert.id.in_(pending))
+            .values(notified_at=now_time())
+            .returning(
+                LowStockAlert.id,
+                LowStockAlert.warehouse_id,
+                LowStockAlert.product_variant_id,
+                LowStockAlert.amount,
+                LowStockAlert.threshold,
+            )
+            .cte("claimed")
+        )
+
+        result = await self.session.execute(
+            select(claimed, ProductVariant.barcode, Product.name)
+            .join(ProductVariant, ProductVariant.id == claimed.c.product_variant_id)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .order_by(claimed.c.id)
+        )
+        return result.all()
@@ -0,0 +1,160 @@
+from typing import Dict, Iterable, List
+
+from fastapi import Depends
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.product import Promotion, VariantEffectivePrice, promotion_product_variants
+from app.core.databases.postgres import get_general_session
+from utils.time_utils import now_time
+
+
+class PricingRepository:
+    """
+    Keeps ``variant_effective_prices`` in sync with promotions so that cart
+    pricing is a single primary key lookup instead of a promotion scan.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.session = session
+
+    async def get_discounts(self, product_variant_ids: Iterable[int]) -> Dict[int, float]:
+        product_variant_ids = set(product_variant_ids)
+        if not product_variant_ids:
+            return {}
+
+        current_time = now_time()
+        result = await self.session.execute(
+            select(
+                VariantEffectivePrice.product_variant_id,
+                VariantEffectivePrice.discount,
+                VariantEffectivePrice.valid_until,
+            )
+            .where(VariantEffectivePrice.product_variant_id.in_(product_variant_ids))
+        )
+        rows = result.all()
+
+        stale = [row.product_variant_id for row in rows if row.valid_until is not None and row.valid_until <= current_time]
+        if stale:
+            await self.refresh_variants(stale)
+            result = await self.session.execute(
+                select(VariantEffectivePrice.product_variant_id, VariantEffectivePrice.discount)
+                .where(VariantEffectivePrice.product_variant_id.in_(product_variant_ids))
+            )
+            rows = result.all()
+
+        return {row.product_variant_id: row.discount for row in rows if row.discount > 0}
+
+    async def get_discount(self, product_variant_id: int) -> float:
+        discounts = await self.get_discounts([product_variant_id])
+        return discounts.get(product_variant_id, 0)
+
+    async def refresh_variants(self, product_variant_ids: Iterable[int]) -> None:
+        product_variant_ids = set(product_variant_ids)
+        if not product_variant_ids:
+            return
+
+        current_time = now_time()
+
+        ranked = (
+            select(
+                promotion_product_variants.c.promotion_id,
+                promotion_product_variants.c.product_variant_id,
+                func.row_number().over(
+                    partition_by=promotion_product_variants.c.promotion_id,
+                    order_by=promotion_product_variants.c.product_variant_id,
+                ).label("position"),
+            )
+            .subquery()
+        )
+
+        result = await self.session.execute(
+            select(
+                ranked.c.product_variant_id,
+                Promotion.id,
+                Promotion.discount,
+                Promotion.priority,
+                Promotion.is_stackable,
+                Promotion.start_date,
+                Promotion.end_date,
+                Promotion.warehouse_id,
+            )
+            .join(Promotion, Promotion.id == ranked.c.promotion_id)
+            .where(
+                and_(
+                    ranked.c.product_variant_id.in_(product_variant_ids),
+                    ranked.c.position <= Promotion.product_limit,
+                    Promotion.is_active == True,
+                    or_(Promotion.end_date.is_(None), Promotion.end_date > current_time),
+                )
+            )
+        )
+
+        promotions_by_variant: Dict[int, List] = {}
+        for row in result.all():
+            promotions_by_variant.setdefault(row.product_variant_id, []).append(row)
+
+        values = []
+        for product_variant_id, promotions in promotions_by_variant.items():
+            running = [
+                promotion for promotion in promotions
+                if promotion.start_date is None or promotion.start_date <= current_time
+            ]
+            boundaries = [
+                boundary
+                for promotion in promotions
+                for boundary in (promotion.start_date, promotion.end_date)
+                if boundary is not None and boundary > current_time
+            ]
+
+            exclusive = [promotion for promotion in running if not promotion.is_stackable]
+            winner = max(exclusive, key=lambda p: (p.priority, p.discount, p.id)) if exclusive else None
+
+            multiplier = 1 - winner.discount / 100 if winner else 1
+            for promotion in running:
+                if promotion.is_stackable:
+                    multiplier *= 1 - promotion.discount / 100
+
+            values.append({
+                "product_variant_id": product_variant_id,
+                "warehouse_id": promotions[0].warehouse_id,
+                "discount": round(min(max((1 - multiplier) * 100, 0), 100), 4),
+                "promotion_id": winner.id if winner else None,
+                "valid_until": min(boundaries) if boundaries else None,
+                "updated_at": current_time,
+            })
+
+        orphaned = product_variant_ids - promotions_by_variant.keys()
+        if orphaned:
+            await self.session.execute(
+                delete(VariantEffectivePrice)
+                .where(VariantEffectivePrice.product_variant_id.in_(orphaned))
+            )
+
+        if values:
+            stmt = insert(VariantEffectivePrice).values(values)
+            await self.session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[VariantEffectivePrice.product_variant_id],
+                    set_={
+                        "warehouse_id": stmt.excluded.warehouse_id,
+                        "discount": stmt.excluded.discount,
+                        "promotion_id": stmt.excluded.promotion_id,
+                        "valid_until": stmt.excluded.valid_until,
+                        "updated_at": stmt.excluded.updated_at,
+                    }
+                )
+            )
+
+    async def refresh_expired(self) -> int:
+        result = await self.session.execute(
+            select(VariantEffectivePrice.product_variant_id)
+            .where(VariantEffectivePrice.valid_until <= now_time())
+        )
+        product_variant_ids = result.scalars().all()
+
+        await self.refresh_variants(product_variant_ids)
+        await self.session.commit()
+
+        return len(product_variant_ids)
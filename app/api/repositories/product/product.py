@@ -1,7 +1,8 @@
 import asyncio
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
 
-from sqlalchemy import Integer, Text, Tuple, case, cast, distinct, func, and_, extract, or_
+from sqlalchemy import Integer, Text, Tuple, cast, distinct, func, and_, literal_column, or_, union
 
 from typing import List, Optional, Sequence
 from fastapi import Depends, HTTPException, status
@@ -10,12 +11,13 @@ from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload, joinedload
 
 from app.api.constants.languages import languages
-from app.api.models.order import AdminOrder, AdminOrderItem
+from app.api.models.order import AdminOrder, DailySalesRollup
 from app.api.schemas.product.color import ColorCreateSchema, ColorResponseSchema, ColorLanguageResponseSchema
 from app.api.schemas.product.size import SizeCreateSchema, SizeResponseSchema, SizeLanguageResponseSchema
 from app.api.utils.translator import translate_text
+from app.core.databases.parallel import ParallelQueryExecutor
 from app.core.databases.postgres import get_general_session
-from app.api.models.product import Color, Measure, Product, ProductVariant, Size, Subcategory, ProductImage
+from app.api.models.product import Color, InventoryValuation, LowStockAlert, Measure, Product, ProductVariant, Size, Subcategory, ProductImage, VariantDemandForecast
 from app.api.schemas.product.product import (
     ProductFilterSchema,
     ProductListResponse,
@@ -29,6 +31,9 @@ from app.api.schemas.product.product import (
     MainProductLanguageResponseSchema,
 )
 from app.core.models.enums import AdminOrderStatusEnum, PaymentMethodEnum
+from utils.time_utils import now_time
+
+logger = logging.getLogger(__name__)
 
 
 class ProductRepository:
@@ -74,8 +79,44 @@ class ProductRepository:
         return [await self._build_product_response(product, language) for product in products]
 
     async def get_little_products_left(
-            self, warehouse_id: int, limit: int, offset: int, language: str | None, amount: int = 10
+            self, warehouse_id: int, limit: int, offset: int, language: str | None, days: int = 14
     ) -> List[ProductResponseSchema | ProductLanguageResponseSchema]:
+        """
+        Products with an active low-stock alert (the threshold the
+        ``product_variants`` trigger applies) or a variant forecast to run out
+        within ``days``, soonest stock-out first. Both sources are read through
+        their warehouse indexes, so the cost follows the number of flagged
+        variants rather than the size of the warehouse.
+        """
+        flagged = union(
+            select(LowStockAlert.product_variant_id)
+            .where(
+                and_(
+                    LowStockAlert.warehouse_id == warehouse_id,
+                    LowStockAlert.is_active,
+                )
+            ),
+            select(VariantDemandForecast.product_variant_id)
+            .where(
+                and_(
+                    VariantDemandForecast.warehouse_id == warehouse_id,
+                    VariantDemandForecast.stockout_date <= now_time().date() + timedelta(days=days),
+                )
+            ),
+        ).subquery()
+
+        low_stock = (
+            select(
+                ProductVariant.product_id,
+                func.min(VariantDemandForecast.stockout_date).label("stockout_date"),
+                func.min(ProductVariant.amount).label("min_amount"),
+            )
+            .join(flagged, flagged.c.product_variant_id == ProductVariant.id)
+            .outerjoin(VariantDemandForecast, VariantDemandForecast.product_variant_id == ProductVariant.id)
+            .group_by(ProductVariant.product_id)
+            .subquery()
+        )
+
         result = await self.session.execute(
             select(Product)
             .options(
@@ -85,13 +126,8 @@ class ProductRepository:
                 selectinload(Product.variants).selectinload(ProductVariant.size),
                 selectinload(Product.subcategory),
             )
-            .join(Product.variants)
-            .where(
-                and_(
-                    Product.warehouse_id == warehouse_id,
-                    ProductVariant.amount > amount
-                )
-            )
+            .join(low_stock, low_stock.c.product_id == Product.id)
+            .order_by(low_stock.c.stockout_date.asc().nulls_last(), low_stock.c.min_amount, Product.id)
             .limit(limit)
             .offset(offset)
         )
@@ -107,6 +143,28 @@ class ProductRepository:
             limit: int = 50,
             offset: int = 0
     ) -> List[ProductVariantSalesResponse]:
+        filters = []
+
+        if start_date:
+            filters.append(DailySalesRollup.day >= start_date.date())
+        if end_date:
+            filters.append(DailySalesRollup.day <= end_date.date())
+
+        if warehouse_id:
+            filters.append(DailySalesRollup.warehouse_id == warehouse_id)
+
+        sales = (
+            select(
+                DailySalesRollup.product_variant_id,
+                func.sum(DailySalesRollup.quantity).label("total_quantity_sold"),
+                func.sum(DailySalesRollup.revenue).label("total_amount_sold"),
+                func.sum(DailySalesRollup.order_count).label("order_count"),
+            )
+            .where(and_(*filters))
+            .group_by(DailySalesRollup.product_variant_id)
+            .subquery()
+        )
+
         query = select(
             ProductVariant.id,
             ProductVariant.barcode,
@@ -115,13 +173,11 @@ class ProductRepository:
             Color.hex_code.label("hex_code"),
             Size.size.label("size"),
             Measure.name.label("measure"),
-            func.sum(AdminOrderItem.quantity).label("total_quantity_sold"),
-            func.sum(AdminOrderItem.total_amount).label("total_amount_sold"),
-            func.count(distinct(AdminOrderItem.order_id)).label("order_count")
+            sales.c.total_quantity_sold,
+            sales.c.total_amount_sold,
+            sales.c.order_count
         ).join(
-            AdminOrderItem, ProductVariant.id == AdminOrderItem.product_variant_id
-        ).join(
-            AdminOrder, AdminOrder.id == AdminOrderItem.order_id
+            sales, sales.c.product_variant_id == ProductVariant.id
         ).join(
             Product, Product.id == ProductVariant.product_id
         ).outerjoin(
@@ -130,31 +186,7 @@ class ProductRepository:
             Size, ProductVariant.size_id == Size.id
         ).join(
             Measure, ProductVariant.measure_id == Measure.id
-        )
-        filters = []
-
-        filters.append(AdminOrder.status == AdminOrderStatusEnum.completed)
-
-        if start_date:
-            filters.append(AdminOrder.created_at >= start_date)
-        if end_date:
-            filters.append(AdminOrder.created_at <= end_date)
-
-        if warehouse_id:
-            filters.append(AdminOrder.warehouse_id == warehouse_id)
-
-        if filters:
-            query = query.where(and_(*filters))
-
-        query = query.group_by(
-            ProductVariant.id,
-            ProductVariant.barcode,
-            Product.id,
-            Product.name,
-            Color.hex_code,
-            Size.size,
-            Measure.name
-        ).order_by(func.sum(AdminOrderItem.quantity).desc())
+        ).order_by(sales.c.total_quantity_sold.desc(), ProductVariant.id)
 
         query = query.limit(limit).offset(offset)
 
@@ -732,10 +764,17 @@ class ProductRepository:
         await self.session.commit()
 
     async def get_product_stats(self, warehouse_id: int):
-        order_stats = await self.__get_order_stats(warehouse_id)
-        product_stats = await self.__get_product_finance_stats(warehouse_id)
-
-        payment_stats = await self.__get_payment_stats(warehouse_id)
+        # Give the request's connection back to the pool first; waiting on the
+        # executor while holding it would eat into the pool its groups need.
+        await self.session.commit()
+        order_stats, product_stats, payment_stats = [
+            rows[0]._asdict() if rows else {}
+            for rows in await ParallelQueryExecutor().run([
+                self.__order_stats_query(warehouse_id),
+                self.__product_finance_stats_query(warehouse_id),
+                self.__payment_stats_query(warehouse_id),
+            ])
+        ]
 
         # return ProductListResponse(
         #     all_orders=int(order_stats.total_orders or 0),
@@ -761,181 +800,105 @@ class ProductRepository:
             "payment_stats": payment_stats,
         }
 
-    async def __get_order_stats(self, warehouse_id: int):
+    @staticmethod
+    def __order_stats_query(warehouse_id: int):
         stmt = select(
-            func.count(distinct(AdminOrder.id)).label("total_orders"),
-            func.count(distinct(AdminOrder.id)).filter(
+            func.count(AdminOrder.id).label("total_orders"),
+            func.count(AdminOrder.id).filter(
                 AdminOrder.status == AdminOrderStatusEnum.completed
             ).label("completed_orders"),
-            func.count(distinct(AdminOrder.id)).filter(
+            func.count(AdminOrder.id).filter(
                 AdminOrder.status == AdminOrderStatusEnum.cancelled
             ).label("canceled_orders"),
-            func.count(distinct(AdminOrder.id)).filter(
+            func.count(AdminOrder.id).filter(
                 AdminOrder.status == AdminOrderStatusEnum.opened
             ).label("in_process_orders"),
-        ).select_from(AdminOrder).join(
-            AdminOrder.items
-        ).join(
-            AdminOrderItem.product_variant
-        ).join(
-            ProductVariant.product
         ).where(
-            Product.warehouse_id == warehouse_id
+            and_(
+                AdminOrder.warehouse_id == warehouse_id,
+                AdminOrder.items.any()
+            )
         )
 
-        result = await self.session.execute(stmt)
-        row = result.first()
-        return row._asdict() if row else {}
+        return stmt
+
+    @staticmethod
+    def __product_finance_stats_query(warehouse_id: int):
+        stock_value = (
+            select(func.sum(InventoryValuation.retail_value))
+            .where(InventoryValuation.warehouse_id == warehouse_id)
+            .scalar_subquery()
+        )
 
-    async def __get_product_finance_stats(self, warehouse_id: int):
         stmt = select(
-            func.count(ProductVariant.id).label("total_product_variants"),
-            func.sum(
-                AdminOrderItem.quantity * ProductVariant.current_price
-            ).label("total_sales"),
-            func.sum(
-                AdminOrderItem.quantity * ProductVariant.come_in_price
-            ).label("total_come_in_price"),
-            func.sum(
-                ProductVariant.current_price * ProductVariant.amount
-            ).label("total_current_price"),
-        ).select_from(AdminOrderItem).join(
-            AdminOrderItem.product_variant
-        ).join(
-            ProductVariant.product
-        ).join(
-            AdminOrderItem.order
+            func.count(distinct(DailySalesRollup.product_variant_id)).label("total_product_variants"),
+            func.sum(DailySalesRollup.revenue).label("total_sales"),
+            func.sum(DailySalesRollup.cost).label("total_come_in_price"),
+            func.sum(DailySalesRollup.discounted_revenue - DailySalesRollup.cost).label("total_profit"),
+            stock_value.label("total_current_price"),
         ).where(
-            and_(
-                Product.warehouse_id == warehouse_id,
-                AdminOrder.status == AdminOrderStatusEnum.completed
-            )
+            DailySalesRollup.warehouse_id == warehouse_id
         )
 
-        result = await self.session.execute(stmt)
-        row = result.first()
-        return row._asdict() if row else {}
+        return stmt
 
-    async def __get_payment_stats(self, warehouse_id: int):
+    @staticmethod
+    def __payment_stats_query(warehouse_id: int):
         stmt = select(
-            func.sum(
-                case(
-                    (AdminOrder.payment_type ==
-                     PaymentMethodEnum.card, AdminOrder.total_amount),
-                    else_=0
-                )
-            ).label("card"),
-            func.sum(
-                case(
-                    (AdminOrder.payment_type ==
-                     PaymentMethodEnum.cash, AdminOrder.total_amount),
-                    else_=0
-                )
-            ).label("cash"),
-            func.sum(
-                case(
-                    (AdminOrder.payment_type ==
-                     PaymentMethodEnum.debt, AdminOrder.total_amount),
-                    else_=0
-                )
-            ).label("debt"),
-        ).select_from(AdminOrder).join(
-            AdminOrder.items
-        ).join(
-            AdminOrderItem.product_variant
-        ).join(
-            ProductVariant.product
+            func.coalesce(func.sum(DailySalesRollup.revenue).filter(
+                DailySalesRollup.payment_type == PaymentMethodEnum.card
+            ), 0).label("card"),
+            func.coalesce(func.sum(DailySalesRollup.revenue).filter(
+                DailySalesRollup.payment_type == PaymentMethodEnum.cash
+            ), 0).label("cash"),
+            func.coalesce(func.sum(DailySalesRollup.revenue).filter(
+                DailySalesRollup.payment_type == PaymentMethodEnum.debt
+            ), 0).label("debt"),
         ).where(
-            and_(
-                Product.warehouse_id == warehouse_id,
-                AdminOrder.status == AdminOrderStatusEnum.completed
-            )
+            DailySalesRollup.warehouse_id == warehouse_id
         )
 
-        result = await self.session.execute(stmt)
-        row = result.first()
-        return row._asdict() if row else {}
+        return stmt
 
     async def get_warehouse_stats(
             self,
             warehouse_id: int,
             start_date: Optional[datetime] = None,
             end_date: Optional[datetime] = None,
+            year: Optional[int] = None,
     ):
         if not start_date and not end_date:
-            return await self._get_monthly_stats(warehouse_id)
+            return await self._get_monthly_stats(warehouse_id, year or now_time().year)
         else:
             return await self._get_custom_range_stats(
                 warehouse_id, start_date, end_date
             )
 
-    async def _get_monthly_stats(self, warehouse_id: int):
-        monthly_stats = {}
-
-        for month in range(1, 13):
-            date_conditions = [extract("month", Product.created_at) == month]
-
-            total_stats_query = self._build_total_stats_query(
-                warehouse_id, date_conditions
-            )
-            on_sale_query = self._build_on_sale_query(
-                warehouse_id, date_conditions)
-            not_on_sale_query = self._build_not_on_sale_query(
-                warehouse_id, date_conditions
-            )
-
-            try:
-                total_result = await self.session.execute(total_stats_query)
-                on_sale_result = await self.session.execute(on_sale_query)
-                not_on_sale_result = await self.session.execute(not_on_sale_query)
-
-                total_row = total_result.first()
-                total_stats = tuple(total_row) if total_row else (
-                    0, 0, 0, 0, 0, 0, 0)
+    async def _get_monthly_stats(self, warehouse_id: int, year: int):
+        month = func.date_trunc(literal_column("'month'"), Product.created_at).label("month")
+        date_conditions = [
+            Product.created_at >= datetime(year, 1, 1),
+            Product.created_at < datetime(year + 1, 1, 1),
+        ]
 
-                on_sale_row = on_sale_result.first()
-                on_sale_stats = (
-                    tuple(on_sale_row) if on_sale_row else (
-                        0, 0, 0, 0, 0, 0, 0, 0)
-                )
+        query = (
+            self._build_stats_query(warehouse_id, date_conditions)
+            .add_columns(month)
+            .group_by(month)
+        )
 
-                not_on_sale_row = not_on_sale_result.first()
-                not_on_sale_stats = (
-                    tuple(not_on_sale_row) if not_on_sale_row else (
-                        0, 0, 0, 0, 0)
-                )
+        try:
+            result = await self.session.execute(query)
+        except Exception:
+            logger.exception("Error in get_warehouse_stats for year %s", year)
+            raise
 
-                monthly_stats[datetime(2025, month, 1).strftime("%B")] = {
-                    "total_stats": {
-                        "total_products": total_stats[0],
-                        "total_variants": total_stats[1],
-                        "total_come_in_price": total_stats[2],
-                        "total_current_price": total_stats[3],
-                        "total_amount": total_stats[4],
-                        "low_stock_products": total_stats[5],
-                        "out_of_stock_products": total_stats[6],
-                    },
-                    "on_sale_stats": {
-                        "total_products": on_sale_stats[0],
-                        "total_variants": on_sale_stats[1],
-                        "total_come_in_price": on_sale_stats[2],
-                        "total_current_price": on_sale_stats[3],
-                        "total_amount": on_sale_stats[4],
-                    },
-                    "not_on_sale_stats": {
-                        "total_products": not_on_sale_stats[0],
-                        "total_variants": not_on_sale_stats[1],
-                        "total_come_in_price": not_on_sale_stats[2],
-                        "total_current_price": not_on_sale_stats[3],
-                        "total_amount": not_on_sale_stats[4],
-                    },
-                }
-            except Exception as e:
-                print(
-                    f"Error in get_warehouse_stats for month {month}: {str(e)}")
-                raise
+        rows = {row.month.month: row for row in result.all()}
 
-        return monthly_stats
+        return {
+            datetime(year, month_number, 1).strftime("%B"): self._stats_from_row(rows.get(month_number))
+            for month_number in range(1, 13)
+        }
 
     async def _get_custom_range_stats(
             self,
@@ -949,127 +912,50 @@ class ProductRepository:
         if end_date:
             date_conditions.append(Product.created_at <= end_date)
 
-        total_stats_query = self._build_total_stats_query(
-            warehouse_id, date_conditions)
-        on_sale_query = self._build_on_sale_query(
-            warehouse_id, date_conditions)
-        not_on_sale_query = self._build_not_on_sale_query(
-            warehouse_id, date_conditions)
-
         try:
-            total_result = await self.session.execute(total_stats_query)
-            on_sale_result = await self.session.execute(on_sale_query)
-            not_on_sale_result = await self.session.execute(not_on_sale_query)
-
-            total_row = total_result.first()
-            total_stats = tuple(total_row) if total_row else (
-                0, 0, 0, 0, 0, 0, 0)
-
-            on_sale_row = on_sale_result.first()
-            on_sale_stats = (
-                tuple(on_sale_row) if on_sale_row else (0, 0, 0, 0, 0, 0, 0, 0)
-            )
-
-            not_on_sale_row = not_on_sale_result.first()
-            not_on_sale_stats = (
-                tuple(not_on_sale_row) if not_on_sale_row else (0, 0, 0, 0, 0)
+            result = await self.session.execute(
+                self._build_stats_query(warehouse_id, date_conditions)
             )
-
-            return {
-                "total_stats": {
-                    "total_products": total_stats[0],
-                    "total_variants": total_stats[1],
-                    "total_come_in_price": total_stats[2],
-                    "total_current_price": total_stats[3],
-                    "total_amount": total_stats[4],
-                    "low_stock_products": total_stats[5],
-                    "out_of_stock_products": total_stats[6],
-                },
-                "on_sale_stats": {
-                    "total_products": on_sale_stats[0],
-                    "total_variants": on_sale_stats[1],
-                    "total_come_in_price": on_sale_stats[2],
-                    "total_current_price": on_sale_stats[3],
-                    "total_amount": on_sale_stats[4],
-                    "average_discount": on_sale_stats[5],
-                    "min_discount": on_sale_stats[6],
-                    "max_discount": on_sale_stats[7],
-                },
-                "not_on_sale_stats": {
-                    "total_products": not_on_sale_stats[0],
-                    "total_variants": not_on_sale_stats[1],
-                    "total_come_in_price": not_on_sale_stats[2],
-                    "total_current_price": not_on_sale_stats[3],
-                    "total_amount": not_on_sale_stats[4],
-                },
-            }
-        except Exception as e:
-            print(f"Error in get_warehouse_stats: {str(e)}")
+        except Exception:
+            logger.exception("Error in get_warehouse_stats")
             raise
 
-    def _build_total_stats_query(self, warehouse_id: int, date_conditions):
-        query = (
-            select(
-                func.count(distinct(Product.id)).label("total_products"),
-                func.count(ProductVariant.id).label("total_variants"),
-                func.coalesce(
-                    func.sum(ProductVariant.come_in_price *
-                             ProductVariant.amount), 0
-                ).label("total_come_in_price"),
-                func.coalesce(
-                    func.sum(ProductVariant.current_price *
-                             ProductVariant.amount), 0
-                ).label("total_current_price"),
-                func.coalesce(func.sum(ProductVariant.amount),
-                              0).label("total_amount"),
-                func.count(case((ProductVariant.amount < 10, 1))).label(
-                    "low_stock_products"
-                ),
-                func.count(case((ProductVariant.amount == 0, 1))).label(
-                    "out_of_stock_products"
-                ),
-            )
-            .select_from(Product)
-            .outerjoin(ProductVariant)
-            .where(Product.warehouse_id == warehouse_id)
-        )
+        return self._stats_from_row(result.first())
 
-        if date_conditions:
-            query = query.where(and_(*date_conditions))
-
-        return query
+    def _build_stats_query(self, warehouse_id: int, date_conditions):
+        on_sale = ProductVariant.discount.isnot(None)
+        not_on_sale = ProductVariant.discount.is_(None)
+        come_in_total = ProductVariant.come_in_price * ProductVariant.amount
+        current_total = ProductVariant.current_price * ProductVariant.amount
 
-    def _build_on_sale_query(self, warehouse_id: int, date_conditions):
         query = (
             select(
                 func.count(distinct(Product.id)).label("total_products"),
                 func.count(ProductVariant.id).label("total_variants"),
-                func.coalesce(
-                    func.sum(ProductVariant.come_in_price *
-                             ProductVariant.amount), 0
-                ).label("total_come_in_price"),
-                func.coalesce(
-                    func.sum(ProductVariant.current_price *
-                             ProductVariant.amount), 0
-                ).label("total_current_price"),
-                func.coalesce(func.sum(ProductVariant.amount),
-                              0).label("total_amount"),
-                func.coalesce(func.avg(ProductVariant.discount), 0).label(
-                    "average_discount"
-                ),
-                func.coalesce(func.min(ProductVariant.discount), 0).label(
-                    "min_discount"
-                ),
-                func.coalesce(func.max(ProductVariant.discount), 0).label(
-                    "max_discount"
-                ),
+                func.coalesce(func.sum(come_in_total), 0).label("total_come_in_price"),
+                func.coalesce(func.sum(current_total), 0).label("total_current_price"),
+                func.coalesce(func.sum(ProductVariant.amount), 0).label("total_amount"),
+                func.count(ProductVariant.id).filter(ProductVariant.amount < 10).label("low_stock_products"),
+                func.count(ProductVariant.id).filter(ProductVariant.amount == 0).label("out_of_stock_products"),
+
+                func.count(distinct(Product.id)).filter(on_sale).label("on_sale_products"),
+                func.count(ProductVariant.id).filter(on_sale).label("on_sale_variants"),
+                func.coalesce(func.sum(come_in_total).filter(on_sale), 0).label("on_sale_come_in_price"),
+                func.coalesce(func.sum(current_total).filter(on_sale), 0).label("on_sale_current_price"),
+                func.coalesce(func.sum(ProductVariant.amount).filter(on_sale), 0).label("on_sale_amount"),
+                func.coalesce(func.avg(ProductVariant.discount), 0).label("average_discount"),
+                func.coalesce(func.min(ProductVariant.discount), 0).label("min_discount"),
+                func.coalesce(func.max(ProductVariant.discount), 0).label("max_discount"),
+
+                func.count(distinct(Product.id)).filter(not_on_sale).label("not_on_sale_products"),
+                func.count(ProductVariant.id).filter(not_on_sale).label("not_on_sale_variants"),
+                func.coalesce(func.sum(come_in_total).filter(not_on_sale), 0).label("not_on_sale_come_in_price"),
+                func.coalesce(func.sum(current_total).filter(not_on_sale), 0).label("not_on_sale_current_price"),
+                func.coalesce(func.sum(ProductVariant.amount).filter(not_on_sale), 0).label("not_on_sale_amount"),
             )
             .select_from(Product)
             .outerjoin(ProductVariant)
-            .where(
-                Product.warehouse_id == warehouse_id,
-                ProductVariant.discount.isnot(None),
-            )
+            .where(Product.warehouse_id == warehouse_id)
         )
 
         if date_conditions:
@@ -1077,31 +963,38 @@ class ProductRepository:
 
         return query
 
-    def _build_not_on_sale_query(self, warehouse_id: int, date_conditions):
-        query = (
-            select(
-                func.count(distinct(Product.id)).label("total_products"),
-                func.count(ProductVariant.id).label("total_variants"),
-                func.coalesce(
-                    func.sum(ProductVariant.come_in_price *
-                             ProductVariant.amount), 0
-                ).label("total_come_in_price"),
-                func.coalesce(
-                    func.sum(ProductVariant.current_price *
-                             ProductVariant.amount), 0
-                ).label("total_current_price"),
-                func.coalesce(func.sum(ProductVariant.amount),
-                              0).label("total_amount"),
-            )
-            .select_from(Product)
-            .outerjoin(ProductVariant)
-            .where(
-                Product.warehouse_id == warehouse_id, ProductVariant.discount.is_(
-                    None)
-            )
-        )
+    @staticmethod
+    def _stats_from_row(row) -> dict:
+        stats = row._asdict() if row else {}
 
-        if date_conditions:
-            query = query.where(and_(*date_conditions))
+        def value(key):
+            return stats.get(key) or 0
 
-        return query
+        return {
+            "total_stats": {
+                "total_products": value("total_products"),
+                "total_variants": value("total_variants"),
+                "total_come_in_price": value("total_come_in_price"),
+                "total_current_price": value("total_current_price"),
+                "total_amount": value("total_amount"),
+                "low_stock_products": value("low_stock_products"),
+                "out_of_stock_products": value("out_of_stock_products"),
+            },
+            "on_sale_stats": {
+                "total_products": value("on_sale_products"),
+                "total_variants": value("on_sale_variants"),
+                "total_come_in_price": value("on_sale_come_in_price"),
+                "total_current_price": value("on_sale_current_price"),
+                "total_amount": value("on_sale_amount"),
+                "average_discount": value("average_discount"),
+                "min_discount": value("min_discount"),
+                "max_discount": value("max_discount"),
+            },
+            "not_on_sale_stats": {
+                "total_products": value("not_on_sale_products"),
+                "total_variants": value("not_on_sale_variants"),
+                "total_come_in_price": value("not_on_sale_come_in_price"),
+                "total_current_price": value("not_on_sale_current_price"),
+                "total_amount": value("not_on_sale_amount"),
+            },
+        }
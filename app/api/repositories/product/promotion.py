@@ -1,11 +1,13 @@
 from fastapi import Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from datetime import datetime, timezone
 from typing import List, Optional
 from zoneinfo import ZoneInfo
 
 from app.api.models.product import ProductVariant, Promotion
+from app.api.repositories.product.pricing import PricingRepository
 from app.api.schemas.product.promotion import PromotionCreate, PromotionUpdate, PromotionResponse
 from app.core.databases.postgres import get_general_session
 
@@ -32,10 +34,13 @@ class PromotionRepository:
         return [PromotionResponse.model_validate(promo) for promo in promotions]
     
     async def create_promotion(self, data: PromotionCreate, warehouse_id: int) -> PromotionResponse:
-        promo_data = data.dict(exclude={"warehouse_id", "product_variant_ids"})
+        self._check_window(data.start_date, data.end_date)
+        promo_data = data.dict(exclude={"warehouse_id", "product_variant_ids", "start_date", "end_date"})
 
         promotion = Promotion(
             **promo_data,
+            start_date=self._naive(data.start_date),
+            end_date=self._naive(data.end_date),
             warehouse_id=warehouse_id,
         )
 
@@ -47,7 +52,69 @@ class PromotionRepository:
             )
             promotion.product_variants = product_variants.scalars().all()
 
+        await self.session.flush()
+        await PricingRepository(self.session).refresh_variants(
+            variant.id for variant in promotion.product_variants
+        )
+
+        await self.session.commit()
+        await self.session.refresh(promotion)
+
+        return PromotionResponse.model_validate(promotion)
+
+    async def update_promotion(self, promotion_id: int, data: PromotionUpdate, warehouse_id: int) -> PromotionResponse:
+        changes = data.model_dump(exclude_unset=True, exclude={"warehouse_id", "product_variant_ids"})
+        for key in ("start_date", "end_date"):
+            if key in changes:
+                changes[key] = self._naive(changes[key])
+        # Only the schedule can be cleared; null for any other field means "unchanged".
+        changes = {
+            key: value for key, value in changes.items()
+            if value is not None or key in ("start_date", "end_date")
+        }
+
+        result = await self.session.execute(
+            select(Promotion)
+            .where(Promotion.id == promotion_id, Promotion.warehouse_id == warehouse_id)
+            .options(selectinload(Promotion.product_variants))
+        )
+        promotion = result.scalar_one_or_none()
+
+        if not promotion:
+            raise HTTPException(status_code=404, detail="Promotion not found")
+
+        self._check_window(
+            changes.get("start_date", promotion.start_date),
+            changes.get("end_date", promotion.end_date),
+        )
+
+        affected_ids = {variant.id for variant in promotion.product_variants}
+
+        for key, value in changes.items():
+            setattr(promotion, key, value)
+
+        if data.product_variant_ids is not None:
+            product_variants = await self.session.execute(
+                select(ProductVariant).where(ProductVariant.id.in_(data.product_variant_ids))
+            )
+            promotion.product_variants = product_variants.scalars().all()
+            affected_ids.update(variant.id for variant in promotion.product_variants)
+
+        await self.session.flush()
+        await PricingRepository(self.session).refresh_variants(affected_ids)
+
         await self.session.commit()
         await self.session.refresh(promotion)
 
-        return PromotionResponse.model_validate(promotion)
\ No newline at end of file
+        return PromotionResponse.model_validate(promotion)
+
+    @staticmethod
+    def _naive(value: Optional[datetime]) -> Optional[datetime]:
+        if value is None or value.tzinfo is None:
+            return value
+        return value.astimezone().replace(tzinfo=None)
+
+    @staticmethod
+    def _check_window(start_date: Optional[datetime], end_date: Optional[datetime]) -> None:
+        if start_date and end_date and start_date >= end_date:
+            raise HTTPException(status_code=400, detail="Promotion end_date must be after start_date")
\ No newline at end of file
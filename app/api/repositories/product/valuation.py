@@ -0,0 +1,115 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy import Numeric, and_, cast, exists, func, insert, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.product import (
+    InventoryValuation,
+    InventoryValuationSnapshot,
+    Product,
+    ProductVariant,
+    Subcategory,
+)
+from app.core.databases.postgres import get_general_session
+from utils.time_utils import now_time
+
+
+class InventoryValuationRepository:
+    """
+    Current stock value comes from ``inventory_valuations``, which triggers
+    keep in step with every stock or price change. History comes from the
+    nightly ``inventory_valuation_snapshots``.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.session = session
+
+    async def has_snapshot(self, day: date) -> bool:
+        result = await self.session.execute(
+            select(exists().where(InventoryValuationSnapshot.day == day))
+        )
+        return bool(result.scalar())
+
+    async def snapshot(self, day: date) -> int:
+        """
+        Writes one row per warehouse and subcategory plus a warehouse total
+        (``subcategory_id`` NULL) for ``day`` in a single statement.
+        """
+        amount = cast(ProductVariant.amount, Numeric)
+        valuation = (
+            select(
+                literal(day),
+                Product.warehouse_id,
+                Product.subcategory_id,
+                func.count(ProductVariant.id),
+                func.coalesce(func.sum(amount), 0),
+                func.coalesce(func.sum(amount * cast(ProductVariant.come_in_price, Numeric)), 0),
+                func.coalesce(func.sum(amount * cast(ProductVariant.current_price, Numeric)), 0),
+                literal(now_time()),
+            )
+            .select_from(ProductVariant)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(Product.warehouse_id),
+                    tuple_(Product.warehouse_id, Product.subcategory_id),
+                )
+            )
+        )
+
+        result = await self.session.execute(
+            insert(InventoryValuationSnapshot).from_select(
+                ["day", "warehouse_id", "subcategory_id", "variants", "quantity",
+                 "cost_value", "retail_value", "created_at"],
+                valuation,
+            )
+        )
+        return result.rowcount
+
+    async def get_current(self, warehouse_id: int, language: str):
+        result = await self.session.execute(
+            select(
+                InventoryValuation.subcategory_id,
+                Subcategory.name[language].astext.label("subcategory_name"),
+                InventoryValuation.variants,
+                InventoryValuation.quantity,
+                InventoryValuation.cost_value,
+                InventoryValuation.retail_value,
+                InventoryValuation.updated_at,
+            )
+            .join(Subcategory, Subcategory.id == InventoryValuation.subcategory_id)
+            .where(InventoryValuation.warehouse_id == warehouse_id)
+            .order_by(InventoryValuation.cost_value.desc(), InventoryValuation.subcategory_id)
+        )
+        return result.all()
+
+    async def get_history(
+            self, warehouse_id: int, start_day: date, end_day: date, subcategory_id: Optional[int] = None
+    ):
+        subcategory_condition = (
+            InventoryValuationSnapshot.subcategory_id.is_(None)
+            if subcategory_id is None
+            else InventoryValuationSnapshot.subcategory_id == subcategory_id
+        )
+
+        result = await self.session.execute(
+            select(
+                InventoryValuationSnapshot.day,
+                InventoryValuationSnapshot.variants,
+                InventoryValuationSnapshot.quantity,
+                InventoryValuationSnapshot.cost_value,
+                InventoryValuationSnapshot.retail_value,
+            )
+            .where(
+                and_(
+                    InventoryValuationSnapshot.warehouse_id == warehouse_id,
+                    subcategory_condition,
+                    InventoryValuationSnapshot.day >= start_day,
+                    InventoryValuationSnapshot.day <= end_day,
+                )
+            )
+            .order_by(InventoryValuationSnapshot.day)
+        )
+        return result.all()
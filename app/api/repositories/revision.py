@@ -1,17 +1,22 @@
+import logging
 from datetime import datetime
-from typing import List, Optional
+from decimal import Decimal
+from typing import List, Optional, Set
 from fastapi import HTTPException
-from sqlalchemy import and_, func, select
+from sqlalchemy import Float, and_, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.api.models.product import Product, ProductVariant
-from app.api.models.revision import Revision, RevisionItem
+from app.api.models.revision import Revision, RevisionItem, StockAdjustment
 from app.api.models.user import AdminUser
 from app.api.schemas.revision import CreateRevisionSchema, RevisionItemResponse
 from app.core.models.enums import RevisionStatus
 from utils.time_utils import now_time
 
+logger = logging.getLogger(__name__)
+
 
 class RevisionRepository:
     def __init__(self, session: AsyncSession):
@@ -26,10 +31,7 @@ class RevisionRepository:
                     Revision.status == RevisionStatus.created
                 )
             )
-            .options(
-                selectinload(Revision.warehouse),
-                selectinload(Revision.items).selectinload(RevisionItem.product_variant)
-            )
+            .options(selectinload(Revision.warehouse))
         )
         result = await self.__session.execute(query)
         return result.scalar_one_or_none()
@@ -52,15 +54,12 @@ class RevisionRepository:
         query = (
             select(Revision)
             .where(Revision.id == revision.id)
-            .options(
-                selectinload(Revision.warehouse),
-                selectinload(Revision.items)
-            )
+            .options(selectinload(Revision.warehouse))
         )
         result = await self.__session.execute(query)
         return result.scalar_one()
         
-    async def get_product_variant_by_barcode(self, barcode: str, warehouse_id: int):
+    async def get_product_variant_by_barcode(self, barcode: int, warehouse_id: int):
         query = (
             select(ProductVariant)
             .join(Product)
@@ -80,45 +79,161 @@ class RevisionRepository:
         return result.scalar_one_or_none()
     
 
+    async def get_variants_by_barcodes(self, barcodes: Set[int], warehouse_id: int):
+        query = (
+            select(ProductVariant.id, ProductVariant.barcode, ProductVariant.amount, ProductVariant.come_in_price)
+            .join(Product)
+            .where(
+                and_(
+                    ProductVariant.barcode.in_(barcodes),
+                    Product.warehouse_id == warehouse_id
+                )
+            )
+        )
+        result = await self.__session.execute(query)
+        return result.all()
+
+    async def get_revision_state(self, revision_id: int, warehouse_id: int):
+        query = (
+            select(Revision.status, Revision.scanned_items, Revision.applied_items)
+            .where(
+                and_(
+                    Revision.id == revision_id,
+                    Revision.warehouse_id == warehouse_id
+                )
+            )
+        )
+        result = await self.__session.execute(query)
+        return result.one_or_none()
+
+    async def __lock_scannable(self, revision_id: int) -> None:
+        """
+        Re-checks the revision inside the scan transaction. The lock conflicts
+        with the one completion and cancellation take, so a scan either lands
+        before completion starts or sees it and is rejected. Scans bump the
+        revision's counters anyway, so taking the update lock up front costs
+        nothing and avoids share-to-update upgrade deadlocks between scans.
+        """
+        result = await self.__session.execute(
+            select(Revision.status, Revision.applied_items)
+            .where(Revision.id == revision_id)
+            .with_for_update(key_share=True)
+        )
+        state = result.one_or_none()
+        if state is None or state.status != RevisionStatus.created or state.applied_items:
+            await self.__session.rollback()
+            raise HTTPException(status_code=400, detail="Revision is not active")
+
+    @staticmethod
+    def _upsert_items(revision_id: int, scans: List[dict]):
+        """
+        ``scans`` holds ``product_variant_id``, ``actual_quantity``,
+        ``system_quantity``, ``unit_cost`` and ``notes``. A repeated scan of a
+        variant replaces its count; ``system_quantity`` and ``unit_cost`` keep
+        their first values.
+        """
+        scanned_at = now_time()
+        stmt = insert(RevisionItem).values([
+            {
+                "revision_id": revision_id,
+                "product_variant_id": scan["product_variant_id"],
+                "system_quantity": scan["system_quantity"],
+                "actual_quantity": scan["actual_quantity"],
+                "difference": scan["actual_quantity"] - scan["system_quantity"],
+                "unit_cost": scan["unit_cost"],
+                "notes": scan["notes"],
+                "scanned_at": scanned_at,
+            }
+            for scan in scans
+        ])
+        return stmt.on_conflict_do_update(
+            constraint="uq_revision_items_revision_variant",
+            set_={
+                "actual_quantity": stmt.excluded.actual_quantity,
+                "difference": stmt.excluded.difference,
+                "notes": stmt.excluded.notes,
+                "scanned_at": stmt.excluded.scanned_at,
+            },
+        )
+
     async def create_or_update_revision_item(
         self,
         revision_id: int,
         product_variant_id: int,
         actual_quantity: float,
         system_quantity: float,
+        unit_cost: float,
         notes: Optional[str] = None
     ) -> RevisionItem:
-        query = (
-            select(RevisionItem)
+        await self.__lock_scannable(revision_id)
+        stmt = self._upsert_items(revision_id, [{
+            "product_variant_id": product_variant_id,
+            "actual_quantity": Decimal(str(actual_quantity)),
+            "system_quantity": Decimal(str(system_quantity)),
+            "unit_cost": Decimal(str(unit_cost)),
+            "notes": notes,
+        }])
+        result = await self.__session.scalars(
+            stmt.returning(RevisionItem),
+            execution_options={"populate_existing": True},
+        )
+        item = result.one()
+
+        await self.__session.commit()
+        await self.__session.refresh(item)
+        return item
+
+    async def upsert_revision_items(self, revision_id: int, scans: List[dict]) -> int:
+        """Writes a whole batch of scans in one statement and one transaction."""
+        await self.__lock_scannable(revision_id)
+        result = await self.__session.execute(self._upsert_items(revision_id, scans))
+        await self.__session.commit()
+        return result.rowcount
+
+    async def get_unscanned_variants(
+        self,
+        revision_id: int,
+        warehouse_id: int,
+        limit: int,
+        offset: int,
+        language: str
+    ):
+        """
+        Warehouse variants without an item in the revision. The anti-join is
+        served by the (revision_id, product_variant_id) unique index.
+        """
+        scanned = (
+            select(RevisionItem.id)
             .where(
                 and_(
                     RevisionItem.revision_id == revision_id,
-                    RevisionItem.product_variant_id == product_variant_id
+                    RevisionItem.product_variant_id == ProductVariant.id
                 )
             )
+            .correlate(ProductVariant)
+        )
+        query = (
+            select(
+                ProductVariant.id,
+                ProductVariant.barcode,
+                ProductVariant.amount,
+                Product.id.label("product_id"),
+                Product.name[language].astext.label("product_name"),
+                func.count().over().label("total")
+            )
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(
+                and_(
+                    Product.warehouse_id == warehouse_id,
+                    ~scanned.exists()
+                )
+            )
+            .order_by(ProductVariant.id)
+            .limit(limit)
+            .offset(offset)
         )
         result = await self.__session.execute(query)
-        item = result.scalar_one_or_none()
-
-        if item:
-            item.actual_quantity = actual_quantity
-            item.difference = actual_quantity - system_quantity
-            item.notes = notes
-            item.scanned_at = now_time()
-        else:
-            item = RevisionItem(
-                revision_id=revision_id,
-                product_variant_id=product_variant_id,
-                system_quantity=system_quantity,
-                actual_quantity=actual_quantity,
-                difference=actual_quantity - system_quantity,
-                notes=notes
-            )
-            self.__session.add(item)
-
-        await self.__session.commit()
-        await self.__session.refresh(item)
-        return item
+        return result.all()
 
     async def get_revision_with_items(self, revision_id: int) -> Optional[Revision]:
         query = (
@@ -140,27 +255,123 @@ class RevisionRepository:
         result = await self.__session.execute(query)
         return result.scalar_one_or_none()
 
-    async def complete_revision(self, revision_id: int, admin_id: int) -> Revision:
-        revision = await self.get_revision_with_items(revision_id)
-        if not revision:
-            return None
+    async def complete_revision(self, revision_id: int, admin_id: int, chunk_size: int) -> Optional[Revision]:
+        """
+        Applies counted quantities to stock ``chunk_size`` items at a time,
+        in item id order. Each chunk commits together with its
+        ``stock_adjustments`` rows and the revision's progress, so an
+        interrupted completion resumes where it stopped when called again.
+        """
+        while True:
+            revision = await self.__lock_revision(revision_id)
+            if not revision:
+                return None
+            if revision.status != RevisionStatus.created:
+                raise HTTPException(status_code=400, detail="Revision is not active")
 
-        for item in revision.items:
-            variant = item.product_variant
-            variant.amount = item.actual_quantity
+            cursor = revision.last_applied_item_id or 0
+            chunk = (
+                select(RevisionItem.id)
+                .where(
+                    and_(
+                        RevisionItem.revision_id == revision_id,
+                        RevisionItem.id > cursor
+                    )
+                )
+                .order_by(RevisionItem.id)
+                .limit(chunk_size)
+                .subquery()
+            )
+            result = await self.__session.execute(select(func.max(chunk.c.id), func.count(chunk.c.id)))
+            chunk_end, chunk_items = result.one()
 
-        revision.status = RevisionStatus.completed
-        revision.completed_at = now_time()
-        revision.completed_by = admin_id
+            if chunk_end is None:
+                revision.status = RevisionStatus.completed
+                revision.completed_at = now_time()
+                revision.completed_by = admin_id
+                await self.__session.commit()
+                return revision
 
-        await self.__session.commit()
-        await self.__session.refresh(revision)
-        return revision
+            await self.__apply_items(revision, cursor, chunk_end, admin_id)
+            revision.applied_items += chunk_items
+            revision.last_applied_item_id = chunk_end
+            await self.__session.commit()
+
+            logger.info("Revision %s: applied %s items", revision_id, revision.applied_items)
+
+    async def __lock_revision(self, revision_id: int) -> Optional[Revision]:
+        result = await self.__session.execute(
+            select(Revision)
+            .where(Revision.id == revision_id)
+            .options(selectinload(Revision.warehouse))
+            .with_for_update(of=Revision)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def __apply_items(self, revision: Revision, after_id: int, up_to_id: int, admin_id: int) -> None:
+        item_conditions = and_(
+            RevisionItem.revision_id == revision.id,
+            RevisionItem.id > after_id,
+            RevisionItem.id <= up_to_id
+        )
+
+        # Lock first so the statement below reads amounts nobody can change.
+        await self.__session.execute(
+            select(ProductVariant.id)
+            .join(RevisionItem, RevisionItem.product_variant_id == ProductVariant.id)
+            .where(item_conditions)
+            .order_by(ProductVariant.id)
+            .with_for_update(of=ProductVariant)
+        )
+
+        previous = aliased(ProductVariant)
+        actual_quantity = cast(RevisionItem.actual_quantity, Float)
+        updated = (
+            update(ProductVariant)
+            .where(
+                and_(
+                    item_conditions,
+                    ProductVariant.id == RevisionItem.product_variant_id,
+                    previous.id == ProductVariant.id,
+                    previous.amount != actual_quantity
+                )
+            )
+            .values(amount=actual_quantity)
+            .returning(
+                ProductVariant.id.label("product_variant_id"),
+                previous.amount.label("previous_amount"),
+                ProductVariant.amount.label("new_amount")
+            )
+            .cte("updated")
+        )
+
+        await self.__session.execute(
+            insert(StockAdjustment).from_select(
+                ["revision_id", "product_variant_id", "warehouse_id", "previous_amount",
+                 "new_amount", "difference", "created_by", "created_at"],
+                select(
+                    literal(revision.id),
+                    updated.c.product_variant_id,
+                    literal(revision.warehouse_id),
+                    updated.c.previous_amount,
+                    updated.c.new_amount,
+                    updated.c.new_amount - updated.c.previous_amount,
+                    literal(admin_id),
+                    literal(now_time())
+                )
+            )
+        )
 
     async def cancel_revision(self, revision_id: int, admin_id: int) -> Revision:
-        revision = await self.get_revision_with_items(revision_id)
+        revision = await self.__lock_revision(revision_id)
         if not revision:
             return None
+        if revision.applied_items:
+            raise HTTPException(
+                status_code=400,
+                detail="Revision completion has already started"
+            )
 
         revision.status = RevisionStatus.cancelled
         revision.cancelled_at = now_time()
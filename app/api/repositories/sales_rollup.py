@@ -0,0 +1,154 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from fastapi import Depends
+from sqlalchemy import Date, and_, cast, delete, distinct, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.api.models.order import AdminOrder, AdminOrderItem, DailySalesRollup
+from app.api.models.product import ProductVariant
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import AdminOrderStatusEnum
+
+ROLLUP_KEYS = ["warehouse_id", "day", "product_variant_id", "seller_id", "payment_type"]
+ROLLUP_VALUES = ["quantity", "revenue", "discounted_revenue", "cost", "order_count", "orders_attributed"]
+
+
+class SalesRollupRepository:
+    """
+    Maintains ``daily_sales_rollups`` in the caller's transaction. Analytics
+    read the rollup instead of re-aggregating ``admin_order_items``.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.__session = session
+
+    async def apply_orders(self, order_ids: Iterable[int], sign: int = 1) -> None:
+        """
+        Adds (``sign=1``) or subtracts (``sign=-1``) whole orders. Adding also
+        moves ``ProductVariant.last_sold_at`` forward. Pending ORM changes must
+        be flushed first.
+        """
+        order_ids = list(order_ids)
+        if not order_ids:
+            return
+
+        await self.__upsert(self._rollup_select([AdminOrderItem.order_id.in_(order_ids)], sign))
+        if sign > 0:
+            await self.__mark_sold(order_ids)
+
+    async def apply_return(self, order: AdminOrder, order_item: AdminOrderItem, return_quantity) -> None:
+        return_quantity = Decimal(str(return_quantity))
+        discounted_price = Decimal(str(order_item.price_with_discount or order_item.price_per_unit))
+
+        await self.__upsert(
+            insert(DailySalesRollup).values(
+                warehouse_id=order.warehouse_id,
+                day=order.created_at.date(),
+                product_variant_id=order_item.product_variant_id,
+                seller_id=order.seller or order.by,
+                payment_type=order.payment_type,
+                quantity=-return_quantity,
+                revenue=-(return_quantity * Decimal(str(order_item.price_per_unit))),
+                discounted_revenue=-(return_quantity * discounted_price),
+                cost=-(return_quantity * order_item.unit_cost),
+                order_count=0,
+                orders_attributed=0,
+            )
+        )
+
+    async def rebuild(
+            self,
+            warehouse_id: Optional[int] = None,
+            start_day: Optional[date] = None,
+            end_day: Optional[date] = None,
+    ) -> None:
+        """Recomputes the rollup from order history for the given warehouse and inclusive day range."""
+        rollup_conditions = []
+        order_conditions = [AdminOrder.status == AdminOrderStatusEnum.completed]
+
+        if warehouse_id is not None:
+            rollup_conditions.append(DailySalesRollup.warehouse_id == warehouse_id)
+            order_conditions.append(AdminOrder.warehouse_id == warehouse_id)
+        if start_day is not None:
+            rollup_conditions.append(DailySalesRollup.day >= start_day)
+            order_conditions.append(AdminOrder.created_at >= datetime.combine(start_day, datetime.min.time()))
+        if end_day is not None:
+            rollup_conditions.append(DailySalesRollup.day <= end_day)
+            order_conditions.append(AdminOrder.created_at < datetime.combine(end_day + timedelta(days=1), datetime.min.time()))
+
+        await self.__session.execute(delete(DailySalesRollup).where(and_(*rollup_conditions)))
+        await self.__upsert(self._rollup_select(order_conditions, 1))
+
+    @staticmethod
+    def _rollup_select(conditions, sign: int):
+        other_item = aliased(AdminOrderItem)
+        first_variant = (
+            select(func.min(other_item.product_variant_id))
+            .where(other_item.order_id == AdminOrderItem.order_id)
+            .correlate(AdminOrderItem)
+            .scalar_subquery()
+        )
+        day = cast(AdminOrder.created_at, Date)
+        seller_id = func.coalesce(AdminOrder.seller, AdminOrder.by)
+
+        stmt = (
+            select(
+                AdminOrder.warehouse_id,
+                day,
+                AdminOrderItem.product_variant_id,
+                seller_id,
+                AdminOrder.payment_type,
+                sign * func.sum(AdminOrderItem.quantity),
+                sign * func.sum(AdminOrderItem.total_amount),
+                sign * func.sum(func.coalesce(AdminOrderItem.total_amount_with_discount, AdminOrderItem.total_amount)),
+                sign * func.sum(AdminOrderItem.quantity * AdminOrderItem.unit_cost),
+                sign * func.count(distinct(AdminOrderItem.order_id)),
+                sign * func.count(distinct(AdminOrderItem.order_id)).filter(
+                    AdminOrderItem.product_variant_id == first_variant
+                ),
+            )
+            .select_from(AdminOrderItem)
+            .join(AdminOrder, AdminOrder.id == AdminOrderItem.order_id)
+            .where(and_(*conditions))
+            .group_by(AdminOrder.warehouse_id, day, AdminOrderItem.product_variant_id, seller_id, AdminOrder.payment_type)
+        )
+
+        return insert(DailySalesRollup).from_select(ROLLUP_KEYS + ROLLUP_VALUES, stmt)
+
+    async def __mark_sold(self, order_ids: List[int]) -> None:
+        sold = (
+            select(
+                AdminOrderItem.product_variant_id,
+                func.max(AdminOrder.created_at).label("sold_at"),
+            )
+            .join(AdminOrder, AdminOrder.id == AdminOrderItem.order_id)
+            .where(AdminOrderItem.order_id.in_(order_ids))
+            .group_by(AdminOrderItem.product_variant_id)
+            .subquery()
+        )
+
+        await self.__session.execute(
+            update(ProductVariant)
+            .where(ProductVariant.id == sold.c.product_variant_id)
+            .values(
+                last_sold_at=func.greatest(ProductVariant.last_sold_at, sold.c.sold_at),
+                # A sale is not an edit of the variant.
+                updated_at=ProductVariant.updated_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def __upsert(self, stmt) -> None:
+        await self.__session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=ROLLUP_KEYS,
+                set_={
+                    column: getattr(DailySalesRollup, column) + getattr(stmt.excluded, column)
+                    for column in ROLLUP_VALUES
+                },
+            )
+        )
@@ -0,0 +1,190 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import Float, Integer, and_, column, delete, func, literal, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.models.order import AdminOrderItem, StockReservation
+from app.api.models.product import ProductVariant
+from app.core.databases.postgres import get_general_session
+from app.core.settings import get_settings
+from utils.time_utils import now_time
+
+settings = get_settings()
+
+
+class StockReservationRepository:
+    """
+    Holds stock for items sitting in open orders. Available stock is
+    ``amount`` minus unexpired reservations of other orders.
+
+    Every check locks the variants first and reads availability in a later
+    statement. Under READ COMMITTED that statement takes a fresh snapshot,
+    so it sees reservations and sales committed by whoever held the lock
+    before; a check in the locking statement itself would not.
+    """
+
+    def __init__(self, session: AsyncSession = Depends(get_general_session)):
+        self.__session = session
+
+    @staticmethod
+    def reserved_by_others(order_id: Optional[int] = None):
+        conditions = [
+            StockReservation.product_variant_id == ProductVariant.id,
+            StockReservation.expires_at > now_time(),
+        ]
+        if order_id is not None:
+            conditions.append(StockReservation.order_id != order_id)
+
+        return (
+            select(func.coalesce(func.sum(StockReservation.quantity), 0))
+            .where(and_(*conditions))
+            .correlate(ProductVariant)
+            .scalar_subquery()
+        )
+
+    async def lock_variants(self, product_variant_ids: Iterable[int]) -> None:
+        """Row-locks variants in id order, so concurrent checkouts cannot deadlock."""
+        await self.__session.execute(
+            select(ProductVariant.id)
+            .where(ProductVariant.id.in_(set(product_variant_ids)))
+            .order_by(ProductVariant.id)
+            .with_for_update()
+        )
+
+    async def get_available(self, product_variant_ids: Iterable[int], order_id: Optional[int] = None) -> Dict[int, Decimal]:
+        """Available stock per variant. Lock the variants with ``lock_variants`` first."""
+        result = await self.__session.execute(
+            select(ProductVariant.id, ProductVariant.amount - self.reserved_by_others(order_id))
+            .where(ProductVariant.id.in_(set(product_variant_ids)))
+        )
+        return {variant_id: Decimal(str(available)) for variant_id, available in result.all()}
+
+    async def reserve(self, order_id: int, product_variant_id: int, quantity) -> None:
+        """Sets the order's reservation for a variant to ``quantity``."""
+        quantity = Decimal(str(quantity))
+        expires_at = now_time() + timedelta(minutes=settings.STOCK_RESERVATION_TTL_MINUTES)
+
+        await self.lock_variants([product_variant_id])
+
+        available = (
+            select(ProductVariant.id)
+            .where(
+                and_(
+                    ProductVariant.id == product_variant_id,
+                    ProductVariant.amount - self.reserved_by_others(order_id) >= float(quantity),
+                )
+            )
+            .cte("available")
+        )
+
+        stmt = insert(StockReservation).from_select(
+            ["order_id", "product_variant_id", "quantity", "expires_at", "created_at"],
+            select(literal(order_id), available.c.id, literal(quantity), literal(expires_at), literal(now_time()))
+        )
+        result = await self.__session.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_stock_reservation_order_variant",
+                set_={"quantity": stmt.excluded.quantity, "expires_at": stmt.excluded.expires_at},
+            )
+            .returning(StockReservation.id)
+        )
+
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for product '{product_variant_id}'"
+            )
+
+    async def release(self, order_id: int, product_variant_id: Optional[int] = None) -> None:
+        conditions = [StockReservation.order_id == order_id]
+        if product_variant_id is not None:
+            conditions.append(StockReservation.product_variant_id == product_variant_id)
+
+        await self.__session.execute(delete(StockReservation).where(and_(*conditions)))
+
+    async def consume(self, order_id: int) -> None:
+        """Turns the order's items into a stock decrement and drops its reservations."""
+        ordered = (
+            select(
+                AdminOrderItem.product_variant_id,
+                func.sum(AdminOrderItem.quantity).label("quantity"),
+            )
+            .where(AdminOrderItem.order_id == order_id)
+            .group_by(AdminOrderItem.product_variant_id)
+            .subquery()
+        )
+
+        variant_ids = await self.__session.execute(select(ordered.c.product_variant_id))
+        variant_ids = variant_ids.scalars().all()
+        expected = len(variant_ids)
+        await self.lock_variants(variant_ids)
+
+        result = await self.__session.execute(
+            update(ProductVariant)
+            .where(
+                and_(
+                    ProductVariant.id == ordered.c.product_variant_id,
+                    ProductVariant.amount - self.reserved_by_others(order_id) >= ordered.c.quantity,
+                )
+            )
+            .values(amount=ProductVariant.amount - ordered.c.quantity)
+            .returning(ProductVariant.id)
+        )
+
+        if len(result.all()) != expected:
+            await self.__session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail="Insufficient stock for one or more products in the order"
+            )
+
+        await self.release(order_id)
+
+    async def deduct(self, quantities: Dict[int, Decimal]) -> None:
+        """Sells ``quantities`` per variant without touching stock reserved by open orders."""
+        if not quantities:
+            return
+
+        await self.lock_variants(quantities)
+
+        sold = values(
+            column("variant_id", Integer),
+            column("quantity", Float),
+            name="sold",
+        ).data([(variant_id, float(quantity)) for variant_id, quantity in quantities.items()])
+
+        result = await self.__session.execute(
+            update(ProductVariant)
+            .where(
+                and_(
+                    ProductVariant.id == sold.c.variant_id,
+                    ProductVariant.amount - self.reserved_by_others() >= sold.c.quantity,
+                )
+            )
+            .values(amount=ProductVariant.amount - sold.c.quantity)
+            .returning(ProductVariant.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        short = set(quantities) - set(result.scalars().all())
+        if short:
+            await self.__session.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"Insufficient stock for products {sorted(short)}"
+            )
+
+    async def delete_expired(self) -> int:
+        result = await self.__session.execute(
+            delete(StockReservation)
+            .where(StockReservation.expires_at <= now_time())
+            .returning(StockReservation.id)
+        )
+        released = len(result.all())
+
+        await self.__session.commit()
+        return released
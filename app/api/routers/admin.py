@@ -167,6 +167,7 @@ async def get_warehouse_stats(
         warehouse_id: int,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        year: Optional[int] = Query(None, ge=2000, le=2100),
         session: AsyncSession = Depends(get_general_session),
         current_admin: AdminUser = Depends(AuthUtils.get_current_admin_user),
 ):
@@ -194,7 +195,7 @@ async def get_warehouse_stats(
 
     repo = ProductRepository(session)
     controller = ProductController(repo)
-    stats = await controller.get_warehouse_stats(warehouse_id, start_date, end_date)
+    stats = await controller.get_warehouse_stats(warehouse_id, start_date, end_date, year)
 
     return {
         "warehouse_id": warehouse_id,
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from sqlalchemy import alias
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,11 +8,11 @@ from starlette.requests import Request
 from app.api.models import AdminOrder
 from app.api.models.user import AdminUser
 from app.api.routers.admin import get_current_admin_user
-from app.api.schemas.order import AdminOrderUpdate, CompleteOrderRequest, OrderCreate, Order, OrderItemCreate, AdminOrderResponse, AdminOrderCreate
+from app.api.schemas.order import AdminOrderUpdate, CompleteOrderRequest, OrderCreate, Order, OrderItemCreate, AdminOrderResponse, AdminOrderCreate, AdminOrderItemResponse, AdminOrderSummaryResponse, OfflineOrderSyncRequest, OfflineOrderSyncResult
 from app.api.controllers.admin_order import AdminOrderController
 from app.api.utils.permission_checker import check_permission
 from app.core.databases.postgres import get_general_session
-from app.core.models.enums import AdminOrderStatusEnum
+from app.core.models.enums import AdminOrderStatusEnum, PaymentMethodEnum
 
 router = APIRouter()
 
@@ -29,6 +30,41 @@ async def get_all_closed_orders(
     return await controller.get_all_closed_orders(current_user.id, language, limit, offset)
 
 
+@router.get("/history", response_model=List[AdminOrderSummaryResponse])
+async def get_closed_order_history(
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+        limit: int = Query(20, alias="limit", ge=1, le=200),
+        offset: int = Query(0, alias="offset", ge=0),
+        start_date: Optional[datetime] = Query(None, alias="start_date"),
+        end_date: Optional[datetime] = Query(None, alias="end_date"),
+        payment_type: Optional[PaymentMethodEnum] = Query(None, alias="payment_type"),
+        seller_id: Optional[int] = Query(None, alias="seller_id"),
+):
+    controller = AdminOrderController(session)
+
+    return await controller.get_closed_order_summaries(
+        admin_id=current_user.id,
+        limit=limit,
+        offset=offset,
+        start_date=start_date,
+        end_date=end_date,
+        payment_type=payment_type,
+        seller_id=seller_id,
+    )
+
+
+@router.get("/order/{order_id}/items", response_model=List[AdminOrderItemResponse])
+async def get_order_items(
+        order_id: int,
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+        language: str = Header(..., alias="language"),
+):
+    controller = AdminOrderController(session)
+    return await controller.get_order_items(current_user.id, order_id, language)
+
+
 @router.get("/order/{order_id}", response_model=AdminOrderResponse | None)
 async def get_order_by_id(
         order_id: int,
@@ -90,3 +126,16 @@ async def create_complate_order(
     warehouse_id = int(request.headers.get('id'))
     controller = AdminOrderController(session)
     return await controller.create_complete_order(data=order_data, admin_id=current_user.id, language=language, warehouse_id=warehouse_id)
+
+
+@router.post("/offline/sync", response_model=List[OfflineOrderSyncResult])
+async def sync_offline_orders(
+        request: Request,
+        order_data: List[OfflineOrderSyncRequest],
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+        language: str = Header(..., alias="language"),
+):
+    warehouse_id = int(request.headers.get('id'))
+    controller = AdminOrderController(session)
+    return await controller.sync_offline_orders(data=order_data, admin_id=current_user.id, language=language, warehouse_id=warehouse_id)
@@ -0,0 +1,372 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.api.controllers.analytics import MAX_KPI_WAREHOUSES, AnalyticsController
+from app.api.models.user import AdminUser
+from app.api.routers.admin import get_current_admin_user
+from app.api.schemas.analytics import (
+    DeadStockResponse,
+    HistogramResponse,
+    InventoryClassificationResponse,
+    InventoryValuationHistoryResponse,
+    InventoryValuationResponse,
+    LowStockAlertResponse,
+    LowStockThresholdResponse,
+    LowStockThresholdUpdate,
+    MultiWarehouseKpiResponse,
+    PeriodComparisonResponse,
+    ReorderSuggestion,
+    SalesHeatmapResponse,
+    SellerLeaderboardResponse,
+)
+from app.api.utils.permission_checker import check_permission, check_permissions
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import (
+    AdminOrderStatusEnum,
+    ClassificationPeriodEnum,
+    ComparisonBucketEnum,
+    ComparisonModeEnum,
+    DeadStockSortEnum,
+    HistogramBucketEnum,
+    HistogramMetricEnum,
+    LeaderboardSortEnum,
+)
+
+router = APIRouter()
+
+
+@router.get("/orders/histogram", response_model=HistogramResponse)
+async def get_order_histogram(
+        request: Request,
+        start_date: Optional[datetime] = Query(None, alias="start_date"),
+        end_date: Optional[datetime] = Query(None, alias="end_date"),
+        bucket: HistogramBucketEnum = Query(HistogramBucketEnum.hour, alias="bucket"),
+        metric: HistogramMetricEnum = Query(HistogramMetricEnum.orders, alias="metric"),
+        timezone: str = Query("Asia/Tashkent", alias="timezone"),
+        status: Optional[AdminOrderStatusEnum] = Query(AdminOrderStatusEnum.completed, alias="status"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_order_histogram(
+        warehouse_id=warehouse_id,
+        start_date=start_date,
+        end_date=end_date,
+        bucket=bucket,
+        metric=metric,
+        timezone=timezone,
+        status=status,
+    )
+
+
+@router.get("/sales/heatmap", response_model=SalesHeatmapResponse)
+async def get_sales_heatmap(
+        request: Request,
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        metric: HistogramMetricEnum = Query(HistogramMetricEnum.orders, alias="metric"),
+        timezone: str = Query("Asia/Tashkent", alias="timezone"),
+        seller_id: Optional[int] = Query(None, alias="seller_id"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_sales_heatmap(
+        warehouse_id=warehouse_id,
+        start_date=start_date,
+        end_date=end_date,
+        metric=metric,
+        timezone=timezone,
+        seller_id=seller_id,
+    )
+
+
+@router.get("/sales/comparison", response_model=PeriodComparisonResponse)
+async def get_period_comparison(
+        request: Request,
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        bucket: ComparisonBucketEnum = Query(ComparisonBucketEnum.day, alias="bucket"),
+        compare: ComparisonModeEnum = Query(ComparisonModeEnum.previous_bucket, alias="compare"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_period_comparison(
+        warehouse_id=warehouse_id,
+        start_date=start_date,
+        end_date=end_date,
+        bucket=bucket,
+        compare=compare,
+    )
+
+
+@router.get("/sellers/leaderboard", response_model=SellerLeaderboardResponse)
+async def get_seller_leaderboard(
+        request: Request,
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        sort_by: LeaderboardSortEnum = Query(LeaderboardSortEnum.revenue, alias="sort_by"),
+        limit: int = Query(10, ge=1, le=100, alias="limit"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_seller_leaderboard(
+        warehouse_id=warehouse_id,
+        start_date=start_date,
+        end_date=end_date,
+        sort_by=sort_by,
+        limit=limit,
+    )
+
+
+@router.get("/warehouses/kpis", response_model=MultiWarehouseKpiResponse)
+async def get_warehouse_kpis(
+        warehouse_ids: List[int] = Query(..., alias="warehouse_ids"),
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_ids = sorted(set(warehouse_ids))
+    if len(warehouse_ids) > MAX_KPI_WAREHOUSES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_KPI_WAREHOUSES} warehouses per request")
+
+    await check_permissions(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_ids=warehouse_ids,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_warehouse_kpis(
+        warehouse_ids=warehouse_ids,
+        start_date=start_date,
+        end_date=end_date,
+    )
+
+
+@router.get("/inventory/abc-xyz", response_model=InventoryClassificationResponse)
+async def get_inventory_classification(
+        request: Request,
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        period: ClassificationPeriodEnum = Query(ClassificationPeriodEnum.month, alias="period"),
+        periods: int = Query(12, ge=3, le=104, alias="periods"),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_inventory_classification(
+        warehouse_id=warehouse_id,
+        end_date=end_date,
+        period=period,
+        periods=periods,
+        language=language,
+    )
+
+
+@router.get("/inventory/valuation", response_model=InventoryValuationResponse)
+async def get_inventory_valuation(
+        request: Request,
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_inventory_valuation(warehouse_id=warehouse_id, language=language)
+
+
+@router.get("/inventory/valuation/history", response_model=InventoryValuationHistoryResponse)
+async def get_inventory_valuation_history(
+        request: Request,
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        subcategory_id: Optional[int] = Query(None, alias="subcategory_id"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_inventory_valuation_history(
+        warehouse_id=warehouse_id,
+        start_date=start_date,
+        end_date=end_date,
+        subcategory_id=subcategory_id,
+    )
+
+
+@router.get("/inventory/dead-stock", response_model=DeadStockResponse)
+async def get_dead_stock(
+        request: Request,
+        days: int = Query(90, ge=1, le=3650, alias="days"),
+        max_sold: Optional[float] = Query(None, ge=0, alias="max_sold"),
+        sort_by: DeadStockSortEnum = Query(DeadStockSortEnum.capital, alias="sort_by"),
+        limit: int = Query(50, ge=1, le=500, alias="limit"),
+        offset: int = Query(0, ge=0, alias="offset"),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_dead_stock(
+        warehouse_id=warehouse_id,
+        days=days,
+        max_sold=max_sold,
+        sort_by=sort_by,
+        limit=limit,
+        offset=offset,
+        language=language,
+    )
+
+
+@router.get("/inventory/reorder", response_model=List[ReorderSuggestion])
+async def get_reorder_suggestions(
+        request: Request,
+        limit: int = Query(50, ge=1, le=500, alias="limit"),
+        offset: int = Query(0, ge=0, alias="offset"),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_reorder_suggestions(
+        warehouse_id=warehouse_id,
+        limit=limit,
+        offset=offset,
+        language=language,
+    )
+
+
+@router.get("/inventory/low-stock", response_model=List[LowStockAlertResponse])
+async def get_low_stock_alerts(
+        request: Request,
+        limit: int = Query(50, ge=1, le=500, alias="limit"),
+        offset: int = Query(0, ge=0, alias="offset"),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.get_low_stock_alerts(
+        warehouse_id=warehouse_id,
+        limit=limit,
+        offset=offset,
+        language=language,
+    )
+
+
+@router.put("/inventory/low-stock/threshold", response_model=LowStockThresholdResponse)
+async def set_low_stock_threshold(
+        request: Request,
+        data: LowStockThresholdUpdate,
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="product_variant",
+        action="update",
+    )
+
+    controller = AnalyticsController(session)
+    return await controller.set_low_stock_threshold(warehouse_id=warehouse_id, data=data)
@@ -0,0 +1,47 @@
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.api.controllers.export import ExportController
+from app.api.models.user import AdminUser
+from app.api.routers.admin import get_current_admin_user
+from app.api.utils.permission_checker import check_permission
+from app.core.databases.postgres import get_general_session
+from app.core.models.enums import ExportFormatEnum, ExportReportEnum
+
+router = APIRouter()
+
+
+@router.get("/{report}")
+async def export_report(
+        request: Request,
+        report: ExportReportEnum,
+        export_format: ExportFormatEnum = Query(ExportFormatEnum.csv, alias="format"),
+        start_date: Optional[date] = Query(None, alias="start_date"),
+        end_date: Optional[date] = Query(None, alias="end_date"),
+        revision_id: Optional[int] = Query(None, alias="revision_id"),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_admin: AdminUser = Depends(get_current_admin_user),
+):
+    warehouse_id = int(request.headers.get('id'))
+    await check_permission(
+        session=session,
+        admin_id=current_admin.id,
+        warehouse_id=warehouse_id,
+        model_name="admin",
+        action="read",
+    )
+
+    return await ExportController().export_report(
+        warehouse_id=warehouse_id,
+        report=report,
+        export_format=export_format,
+        start_date=start_date,
+        end_date=end_date,
+        language=language,
+        revision_id=revision_id,
+    )
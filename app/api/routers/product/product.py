@@ -84,12 +84,12 @@ async def get_little_products_left(
         request: Request,
         limit: int = Query(10, alias="limit", ge=1),
         offset: int = Query(0, alias="offset", ge=0),
-        amount: int = Query(10, alias="amount", ge=1),
+        days: int = Query(14, alias="days", ge=1, description="Include variants forecast to run out within this many days"),
         controller: ProductController = Depends(),
         language: str = Header(None, alias="language"),
 ) -> Sequence[ProductResponseSchema | ProductLanguageResponseSchema]:
     warehouse_id = int(request.headers.get('id'))
-    return await controller.get_little_products_left(limit=limit, offset=offset, warehouse_id=warehouse_id, language=language, amount=amount)
+    return await controller.get_little_products_left(limit=limit, offset=offset, warehouse_id=warehouse_id, language=language, days=days)
 
 
 @router.get(
@@ -373,6 +373,7 @@ async def create_variant(
         discount: Optional[float] = Form(None),
         is_main: bool = Form(False),
         amount: float = Form(...),
+        min_stock: Optional[float] = Form(None),
         weight: Optional[float] = Form(None),
         color_id: Optional[int] = Form(None),
         size_id: Optional[int] = Form(None),
@@ -401,6 +402,7 @@ async def create_variant(
             discount=discount,
             is_main=is_main,
             amount=amount,
+            min_stock=min_stock,
             color_id=color_id,
             size_id=size_id,
             measure_id=measure_id,
@@ -445,6 +447,7 @@ async def update_variant(
             discount=model.discount,
             is_main=model.is_main,
             amount=model.amount,
+            min_stock=model.min_stock,
             color_id=model.color_id,
             size_id=model.size_id,
             measure_id=model.measure_id,
@@ -32,4 +32,16 @@ async def create_promotion(
         session: AsyncSession = Depends(get_general_session),
 ):
     warehouse_id = int(request.headers.get('id'))
-    return await controller.create_promotion(data, warehouse_id)
\ No newline at end of file
+    return await controller.create_promotion(data, warehouse_id)
+
+
+@router.patch("/{promotion_id}", response_model=PromotionResponse)
+async def update_promotion(
+        promotion_id: int,
+        request: Request,
+        data: PromotionUpdate,
+        controller: PromotionController = Depends(),
+        session: AsyncSession = Depends(get_general_session),
+):
+    warehouse_id = int(request.headers.get('id'))
+    return await controller.update_promotion(promotion_id, data, warehouse_id)
\ No newline at end of file
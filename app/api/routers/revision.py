@@ -6,7 +6,7 @@ from starlette.requests import Request
 from app.api.controllers.revision import RevisionController
 from app.api.models.user import AdminUser
 from app.api.routers.admin import get_current_admin_user
-from app.api.schemas.revision import CreateRevisionSchema, RevisionDetailResponse, RevisionItemCreate, RevisionItemResponse, RevisionResponse
+from app.api.schemas.revision import CreateRevisionSchema, RevisionDetailResponse, RevisionItemCreate, RevisionItemResponse, RevisionProgressResponse, RevisionResponse, RevisionScanBatch, RevisionScanBatchResponse, RevisionUnscannedResponse
 from app.core.databases.postgres import get_general_session
 
 router = APIRouter()
@@ -62,7 +62,20 @@ async def add_revision_item(
 ):
     controller = RevisionController(session)
     warehouse_id = int(request.headers.get('id'))
-    return await controller.add_revision_item(revision_id, schema, warehouse_id)
+    return await controller.add_revision_item(revision_id, warehouse_id, schema)
+
+
+@router.post("/{revision_id}/items/batch", response_model=RevisionScanBatchResponse)
+async def add_revision_items_batch(
+        request: Request,
+        revision_id: int,
+        schema: RevisionScanBatch,
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+):
+    controller = RevisionController(session)
+    warehouse_id = int(request.headers.get('id'))
+    return await controller.add_revision_items_batch(revision_id, warehouse_id, schema)
 
 
 @router.post("/{revision_id}/complete", response_model=RevisionResponse)
@@ -75,6 +88,33 @@ async def complete_revision(
     return await controller.complete_revision(revision_id, current_user.id)
 
 
+@router.get("/{revision_id}/unscanned", response_model=RevisionUnscannedResponse)
+async def get_unscanned_items(
+        request: Request,
+        revision_id: int,
+        limit: int = Query(50, ge=1, le=500),
+        offset: int = Query(0, ge=0),
+        language: str = Header("uz", alias="language"),
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+):
+    controller = RevisionController(session)
+    warehouse_id = int(request.headers.get('id'))
+    return await controller.get_unscanned_items(revision_id, warehouse_id, limit, offset, language)
+
+
+@router.get("/{revision_id}/progress", response_model=RevisionProgressResponse)
+async def get_revision_progress(
+        request: Request,
+        revision_id: int,
+        session: AsyncSession = Depends(get_general_session),
+        current_user: AdminUser = Depends(get_current_admin_user),
+):
+    controller = RevisionController(session)
+    warehouse_id = int(request.headers.get('id'))
+    return await controller.get_revision_progress(revision_id, warehouse_id)
+
+
 @router.post("/{revision_id}/cancel", response_model=RevisionResponse)
 async def cancel_revision(
         revision_id: int,
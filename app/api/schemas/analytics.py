@@ -0,0 +1,244 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from app.core.models.enums import (
+    AdminOrderStatusEnum,
+    ClassificationPeriodEnum,
+    ComparisonBucketEnum,
+    ComparisonModeEnum,
+    DeadStockSortEnum,
+    HistogramBucketEnum,
+    HistogramMetricEnum,
+    LeaderboardSortEnum,
+)
+
+
+class HistogramPoint(BaseModel):
+    bucket: datetime
+    value: float
+
+
+class HistogramResponse(BaseModel):
+    warehouse_id: int
+    bucket: HistogramBucketEnum
+    metric: HistogramMetricEnum
+    status: Optional[AdminOrderStatusEnum] = None
+    timezone: str
+    start_date: datetime
+    end_date: datetime
+    points: List[HistogramPoint]
+
+
+class SalesHeatmapResponse(BaseModel):
+    warehouse_id: int
+    metric: HistogramMetricEnum
+    timezone: str
+    seller_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    matrix: List[List[float]]  # matrix[weekday][hour], weekday 0 = Monday
+    total: float
+
+
+class ComparisonValue(BaseModel):
+    current: float
+    previous: float
+    delta: float
+    delta_percent: Optional[float] = None  # None when the previous value is zero
+
+
+class ComparisonPoint(BaseModel):
+    bucket: date
+    previous_bucket: date
+    revenue: ComparisonValue
+    orders: ComparisonValue
+    items: ComparisonValue
+    average_basket: ComparisonValue
+
+
+class PeriodComparisonResponse(BaseModel):
+    warehouse_id: int
+    bucket: ComparisonBucketEnum
+    compare: ComparisonModeEnum
+    start_date: date
+    end_date: date
+    totals: Dict[str, ComparisonValue]
+    points: List[ComparisonPoint]
+
+
+class SellerLeaderboardEntry(BaseModel):
+    rank: int
+    id: int
+    full_name: str
+    phone_number: str
+    profile_picture: Optional[str] = None
+    role_name: Optional[str] = None
+
+    order_count: int
+    items_sold: float
+    total_revenue: Decimal
+    total_revenue_with_discount: Decimal
+    average_basket: Decimal
+    margin: Decimal
+    margin_percent: float
+
+
+class SellerLeaderboardResponse(BaseModel):
+    warehouse_id: int
+    start_date: date
+    end_date: date
+    sort_by: LeaderboardSortEnum
+    sellers: List[SellerLeaderboardEntry]
+
+
+class WarehouseKpis(BaseModel):
+    warehouse_id: Optional[int] = None
+    warehouse_name: Optional[str] = None
+
+    orders_total: int
+    orders_completed: int
+    orders_cancelled: int
+    orders_opened: int
+
+    items_sold: float
+    revenue: Decimal
+    discounted_revenue: Decimal
+    cost: Decimal
+    profit: Decimal
+    average_basket: Decimal
+
+    stock_variants: int
+    out_of_stock_variants: int
+    stock_cost_value: float
+    stock_retail_value: float
+
+
+class MultiWarehouseKpiResponse(BaseModel):
+    start_date: date
+    end_date: date
+    warehouses: List[WarehouseKpis]
+    total: WarehouseKpis
+
+
+class InventoryClassItem(BaseModel):
+    variant_id: int
+    barcode: str
+    product_name: str
+    revenue: float
+    revenue_share: float
+    cumulative_share: float
+    quantity: float
+    mean_demand: float
+    cv: Optional[float] = None
+    abc: str
+    xyz: str
+
+
+class InventoryClassificationResponse(BaseModel):
+    warehouse_id: int
+    start_date: date
+    end_date: date
+    period: ClassificationPeriodEnum
+    periods: int
+    summary: Dict[str, int]
+    items: List[InventoryClassItem]
+
+
+class ReorderSuggestion(BaseModel):
+    variant_id: int
+    barcode: str
+    product_name: str
+    stock: float
+    daily_demand: float
+    days_of_cover: Optional[float] = None
+    stockout_date: Optional[date] = None
+    reorder_point: float
+    suggested_order_quantity: float
+    computed_at: datetime
+
+
+class LowStockAlertResponse(BaseModel):
+    id: int
+    variant_id: int
+    product_id: int
+    barcode: str
+    product_name: str
+    amount: float
+    threshold: float
+    triggered_at: datetime
+    notified_at: Optional[datetime] = None
+
+
+class LowStockThresholdUpdate(BaseModel):
+    """``min_stock=None`` clears the threshold so the variant falls back to its subcategory."""
+    variant_ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000)
+    subcategory_id: Optional[int] = None
+    min_stock: Optional[float] = Field(None, ge=0)
+
+
+class LowStockThresholdResponse(BaseModel):
+    evaluated_variant_ids: List[int]
+
+
+class DeadStockItem(BaseModel):
+    variant_id: int
+    product_id: int
+    barcode: str
+    product_name: str
+    amount: float
+    come_in_price: float
+    current_price: float
+    capital: float  # amount * come_in_price
+    retail_value: float
+    sold_quantity: float  # units sold in the window; always 0 without max_sold
+    last_sold_at: Optional[datetime] = None
+    days_since_last_sale: Optional[int] = None  # None if the variant has never sold
+
+
+class DeadStockResponse(BaseModel):
+    warehouse_id: int
+    days: int
+    max_sold: Optional[float] = None
+    sort_by: DeadStockSortEnum
+    total_count: int
+    total_capital: float
+    total_retail_value: float
+    items: List[DeadStockItem]
+
+
+class InventoryValuationEntry(BaseModel):
+    subcategory_id: int
+    subcategory_name: str
+    variants: int
+    quantity: Decimal
+    cost_value: Decimal
+    retail_value: Decimal
+    updated_at: datetime
+
+
+class InventoryValuationResponse(BaseModel):
+    warehouse_id: int
+    variants: int
+    quantity: Decimal
+    cost_value: Decimal
+    retail_value: Decimal
+    subcategories: List[InventoryValuationEntry]
+
+
+class InventoryValuationPoint(BaseModel):
+    day: date
+    variants: int
+    quantity: Decimal
+    cost_value: Decimal
+    retail_value: Decimal
+
+
+class InventoryValuationHistoryResponse(BaseModel):
+    warehouse_id: int
+    subcategory_id: Optional[int] = None
+    start_date: date
+    end_date: date
+    points: List[InventoryValuationPoint]
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from typing import List, Optional
 from app.api.models.product import ProductVariant
+from app.api.utils.barcode import BARCODE_MAX_LENGTH
 from app.core.models.enums import AdminOrderStatusEnum, OrderStatusEnum, OrderTypeEnum
 
 
@@ -77,7 +78,7 @@ class AdminOrderCreate(BaseModel):
 
 
 class OrderItemRequest(BaseModel):
-    barcode: str
+    barcode: str = Field(..., max_length=BARCODE_MAX_LENGTH)
     quantity: int = 1
     custom_price: Optional[Decimal] = None
 
@@ -93,6 +94,19 @@ class CompleteOrderRequest(BaseModel):
     items: List[OrderItemRequest]
 
 
+class OfflineOrderSyncRequest(CompleteOrderRequest):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+    # Offline sales arrive finished; open orders are created online so they can reserve stock.
+    status: str = Field(default="completed", pattern="^(completed|canceled)$")
+
+
+class OfflineOrderSyncResult(BaseModel):
+    idempotency_key: str
+    result: str = Field(..., pattern="^(created|duplicate|failed)$")
+    order_id: Optional[int] = None
+    detail: Optional[str] = None
+
+
 class AdminOrderUpdate(BaseModel):
     status: str
     seller_id: Optional[int] = None
@@ -109,9 +123,12 @@ class AdminProductVariantResponse(BaseModel):
     name: str
     current_price: Decimal
     color: Optional[str] = None
+    color_hex: Optional[str] = None
     size: Optional[str] = None
     measure: str
+    main_image: Optional[str] = None
     images: list[str]
+    discount: Optional[float] = None
 
     @classmethod
     def from_variant(cls, variant: Optional['ProductVariant'], language: str) -> "AdminProductVariantResponse":
@@ -133,8 +150,10 @@ class AdminProductVariantResponse(BaseModel):
             name=variant.product.name.get(language, "") if hasattr(variant, 'product') and variant.product else "",
             current_price=variant.current_price,
             color=variant.color.name.get(language) if variant.color else None,
+            color_hex=variant.color.hex_code if variant.color else None,
             size=variant.size.size if variant.size else None,
             measure=variant.measure.name,
+            main_image=variant.images[0].image if variant.images else None,
             images=[img.image for img in variant.images]
         )
 
@@ -200,5 +219,23 @@ class AdminOrderResponse(AdminOrderCreate):
         from_attributes = True
 
 
+class AdminOrderSummaryResponse(BaseModel):
+    id: int
+    by: int
+    seller_id: Optional[int] = None
+    seller_name: Optional[str] = None
+    status: AdminOrderStatusEnum
+    payment_type: Optional[str] = None
+    total_amount: Decimal = Decimal('0')
+    total_amount_with_discount: Decimal = Decimal('0')
+    items_count: int = 0
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    canceled_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
 class BatchOrderItemsRequest(BaseModel):
     items: List[OrderItemRequest]
@@ -20,10 +20,11 @@ class BannerCreate(BannerBase):
         }
 
 class BannerUpdate(BannerBase):
-    product_variant_ids: Optional[List[int]]
+    product_variant_ids: Optional[List[int]] = None
 
 class BannerResponse(BannerBase):
     id: int
+    is_applied: bool = False
     created_at: datetime
     updated_at: datetime
 
@@ -54,6 +54,7 @@ class ProductVariantCreateSchema(BaseModel):
     discount: Optional[float] = None
     is_main: bool = False
     amount: float
+    min_stock: Optional[float] = Field(None, ge=0)
     weight: Optional[float] = None
 
     color_id: Optional[int] = None
@@ -69,6 +70,7 @@ class ProductVariantUpdateSchema(BaseModel):
     discount: Optional[float] = None
     is_main: Optional[bool] = None
     amount: Optional[float] = None
+    min_stock: Optional[float] = Field(None, ge=0)
     weight: Optional[float] = None
     color_id: Optional[int] = None
     size_id: Optional[int] = None
@@ -89,6 +91,7 @@ class ProductVariantResponseSchema(BaseModel):
     weight: Optional[float] = None
     is_main: bool
     amount: float
+    min_stock: Optional[float] = None
 
     color: Optional[ColorResponse] = None
     size: Optional[SizeResponse] = None
@@ -112,6 +115,7 @@ class ProductVariantUpdateSchemaNew(BaseModel):
     discount: Optional[float] = None
     is_main: Optional[bool] = None
     amount: Optional[float] = None
+    min_stock: Optional[float] = Field(None, ge=0)
     weight: Optional[float] = None
     color_id: Optional[int] = None
     size_id: Optional[int] = None
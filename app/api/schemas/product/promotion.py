@@ -9,6 +9,10 @@ class PromotionBase(BaseModel):
     product_limit: int
     warehouse_id: int
     is_active: bool = True
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    priority: int = 0
+    is_stackable: bool = False
 
 class PromotionCreate(PromotionBase):
     product_variant_ids: List[int]
@@ -18,8 +22,18 @@ class PromotionCreate(PromotionBase):
             datetime: lambda v: v.isoformat()
         }
 
-class PromotionUpdate(PromotionBase):
-    product_variant_ids: Optional[List[int]]
+class PromotionUpdate(BaseModel):
+    # Partial update: only the fields sent are applied.
+    name: Optional[str] = None
+    discount: Optional[float] = None
+    product_limit: Optional[int] = None
+    warehouse_id: Optional[int] = None
+    is_active: Optional[bool] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    priority: Optional[int] = None
+    is_stackable: Optional[bool] = None
+    product_variant_ids: Optional[List[int]] = None
 
 class PromotionResponse(PromotionBase):
     id: int
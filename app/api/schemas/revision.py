@@ -1,7 +1,9 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import List, Optional
 from pydantic import BaseModel, Field
 
+from app.api.utils.barcode import BARCODE_MAX_LENGTH, parse_barcode
 from app.core.models.enums import RevisionStatus
 
 class CreateRevisionSchema(BaseModel):
@@ -9,9 +11,25 @@ class CreateRevisionSchema(BaseModel):
     notes: Optional[str] = None
 
 class RevisionItemCreate(BaseModel):
-    barcode: str
+    barcode: str = Field(..., max_length=BARCODE_MAX_LENGTH)
     actual_quantity: float = Field(gt=0)
     notes: Optional[str] = None
+
+    @property
+    def barcode_value(self) -> Optional[int]:
+        """None for barcodes no variant can have; batches report them as not found."""
+        return parse_barcode(self.barcode)
+
+
+class RevisionScanBatch(BaseModel):
+    items: List[RevisionItemCreate] = Field(..., min_length=1, max_length=2000)
+
+
+class RevisionScanBatchResponse(BaseModel):
+    revision_id: int
+    scanned: int
+    not_found: List[str]
+
     
 class RevisionItemResponse(BaseModel):
     id: int
@@ -42,10 +60,34 @@ class RevisionResponse(BaseModel):
     notes: Optional[str]
     items_count: int
     discrepancy_count: int
+    surplus_value: Decimal
+    shortage_value: Decimal
 
     class Config:
         from_attributes = True
 
+
+class RevisionProgressResponse(BaseModel):
+    revision_id: int
+    status: RevisionStatus
+    items_count: int
+    applied_items: int  # items already written to stock by an ongoing completion
+
+
+
+class RevisionUnscannedItem(BaseModel):
+    variant_id: int
+    product_id: int
+    barcode: str
+    product_name: str
+    system_quantity: float
+
+
+class RevisionUnscannedResponse(BaseModel):
+    revision_id: int
+    total: int
+    items: List[RevisionUnscannedItem]
+
     
 class RevisionDetailResponse(RevisionResponse):
     items: List[RevisionItemResponse]
\ No newline at end of file
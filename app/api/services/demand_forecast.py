@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Smoothed rates below this (about one unit in three years) count as no demand.
+MIN_DAILY_DEMAND = 1e-3
+
+
+@dataclass
+class Forecast:
+    daily_demand: np.ndarray
+    demand_std: np.ndarray
+    days_of_cover: np.ndarray  # NaN where there is no demand
+    reorder_point: np.ndarray
+    suggested_order_quantity: np.ndarray
+
+
+def smoothed_demand(daily_sales: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    Simple exponential smoothing for every row of a ``variants x days``
+    matrix at once. The recursion ``level = alpha * x + (1 - alpha) * level``
+    unrolls into a weighted sum, so the whole matrix is one product with a
+    weight vector; the initial level is the row mean.
+    """
+    days = daily_sales.shape[1]
+    if days == 0:
+        return np.zeros(daily_sales.shape[0])
+
+    decay = (1 - alpha) ** np.arange(days - 1, -1, -1)
+    return daily_sales @ (alpha * decay) + (1 - alpha) ** days * daily_sales.mean(axis=1)
+
+
+def forecast(
+        daily_sales: np.ndarray,
+        stock: np.ndarray,
+        alpha: float,
+        lead_time_days: float,
+        review_days: float,
+        service_z: float,
+) -> Forecast:
+    """
+    Demand rate, days of cover, reorder point (lead-time demand plus safety
+    stock) and the quantity that brings stock up to cover lead time plus one
+    review cycle, for all variants together.
+    """
+    demand = smoothed_demand(daily_sales, alpha)
+    demand = np.where(demand >= MIN_DAILY_DEMAND, demand, 0)
+    std = daily_sales.std(axis=1) if daily_sales.shape[1] else np.zeros_like(demand)
+
+    safety_stock = service_z * std * np.sqrt(lead_time_days)
+    reorder_point = demand * lead_time_days + safety_stock
+    order_up_to = demand * (lead_time_days + review_days) + safety_stock
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(demand > 0, np.maximum(stock, 0) / demand, np.nan)
+
+    suggested = np.where(stock <= reorder_point, np.maximum(order_up_to - stock, 0), 0)
+
+    return Forecast(
+        daily_demand=demand,
+        demand_std=std,
+        days_of_cover=days_of_cover,
+        reorder_point=reorder_point,
+        suggested_order_quantity=np.ceil(suggested),
+    )
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+ABC_THRESHOLDS = (0.8, 0.95)
+XYZ_THRESHOLDS = (0.5, 1.0)
+
+
+@dataclass
+class Classification:
+    variant_ids: np.ndarray
+    revenue: np.ndarray
+    revenue_share: np.ndarray
+    cumulative_share: np.ndarray
+    quantity: np.ndarray
+    mean_demand: np.ndarray
+    cv: np.ndarray  # NaN where a variant has no demand at all
+    abc: np.ndarray
+    xyz: np.ndarray
+
+
+def build_matrices(variant_ids, period_indexes, quantities, revenues, periods: int):
+    """
+    Scatters (variant, period, quantity, revenue) rows into dense
+    ``variants x periods`` matrices. Rows with a negative period index
+    (variants without sales) only register the variant.
+    """
+    variant_ids = np.asarray(variant_ids, dtype=np.int64)
+    period_indexes = np.asarray(period_indexes, dtype=np.int64)
+
+    unique_ids, rows = np.unique(variant_ids, return_inverse=True)
+    quantity = np.zeros((len(unique_ids), periods), dtype=np.float64)
+    revenue = np.zeros((len(unique_ids), periods), dtype=np.float64)
+
+    sold = (period_indexes >= 0) & (period_indexes < periods)
+    np.add.at(quantity, (rows[sold], period_indexes[sold]), np.asarray(quantities, dtype=np.float64)[sold])
+    np.add.at(revenue, (rows[sold], period_indexes[sold]), np.asarray(revenues, dtype=np.float64)[sold])
+
+    return unique_ids, quantity, revenue
+
+
+def classify(variant_ids: np.ndarray, quantity: np.ndarray, revenue: np.ndarray) -> Classification:
+    """ABC by cumulative revenue share and XYZ by coefficient of variation of per-period demand."""
+    total_revenue = revenue.sum(axis=1)
+    grand_total = total_revenue.sum()
+
+    # Highest revenue first; ties keep variant id order so results are stable.
+    order = np.lexsort((variant_ids, -total_revenue))
+    variant_ids, quantity, total_revenue = variant_ids[order], quantity[order], total_revenue[order]
+
+    share = total_revenue / grand_total if grand_total > 0 else np.zeros_like(total_revenue)
+    cumulative = np.cumsum(share)
+    # A variant belongs to the class its cumulative share *starts* in, so the
+    # item that crosses a threshold stays in the higher class.
+    share_before = cumulative - share
+    abc = np.select(
+        [(share_before < ABC_THRESHOLDS[0]) & (total_revenue > 0), (share_before < ABC_THRESHOLDS[1]) & (total_revenue > 0)],
+        ["A", "B"],
+        default="C",
+    )
+
+    mean = quantity.mean(axis=1)
+    std = quantity.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.where(mean > 0, std / mean, np.nan)
+    xyz = np.select(
+        [cv <= XYZ_THRESHOLDS[0], cv <= XYZ_THRESHOLDS[1]],
+        ["X", "Y"],
+        default="Z",
+    )
+
+    return Classification(
+        variant_ids=variant_ids,
+        revenue=total_revenue,
+        revenue_share=share,
+        cumulative_share=cumulative,
+        quantity=quantity.sum(axis=1),
+        mean_demand=mean,
+        cv=cv,
+        abc=abc,
+        xyz=xyz,
+    )
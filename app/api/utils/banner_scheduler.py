@@ -0,0 +1,21 @@
+import logging
+
+from app.api.repositories.product.banner import BannerRepository
+from app.core.databases.postgres import get_session_without_depends, try_leader_lock
+
+logger = logging.getLogger(__name__)
+
+
+async def sync_banner_prices():
+    async with get_session_without_depends() as session:
+        if not await try_leader_lock(session, "banner_scheduler"):
+            await session.rollback()
+            return
+
+        repository = BannerRepository(session)
+        ended = await repository.deactivate_banners()
+        started = await repository.activate_due_banners()
+        await session.commit()
+
+    if ended or started:
+        logger.info(f"Banner prices synced: started={started} ended={ended}")
@@ -0,0 +1,14 @@
+import re
+from typing import Optional
+
+# ASCII digits only (str.isdigit() also accepts e.g. "²", which int() rejects),
+# and short enough to always fit product_variants.barcode (BIGINT).
+BARCODE_PATTERN = re.compile(r"[0-9]{1,18}")
+BARCODE_MAX_LENGTH = 64
+
+
+def parse_barcode(value: str) -> Optional[int]:
+    """Returns the barcode as stored, or None when it cannot be one."""
+    if not BARCODE_PATTERN.fullmatch(value):
+        return None
+    return int(value)
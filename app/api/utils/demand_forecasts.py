@@ -0,0 +1,35 @@
+import logging
+from datetime import datetime
+
+from app.api.repositories.product.forecast import DemandForecastRepository
+from app.core.databases.postgres import get_session_without_depends, try_leader_lock
+from utils.time_utils import now_time
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_demand_forecasts():
+    today_start = datetime.combine(now_time().date(), datetime.min.time())
+
+    async with get_session_without_depends() as session:
+        repository = DemandForecastRepository(session)
+        warehouse_ids = await repository.get_warehouse_ids()
+        await session.rollback()
+
+        for warehouse_id in warehouse_ids:
+            # One transaction per warehouse; the lock and the freshness check
+            # keep parallel workers from recomputing the same warehouse.
+            locked = await try_leader_lock(session, f"demand_forecast:{warehouse_id}")
+            if not locked or await repository.is_fresh(warehouse_id, today_start):
+                await session.rollback()
+                continue
+
+            try:
+                variants = await repository.refresh_warehouse(warehouse_id)
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                logger.exception(f"Demand forecast failed for warehouse {warehouse_id}")
+                continue
+
+            logger.info(f"Demand forecasts refreshed for warehouse {warehouse_id}: {variants} variants")
@@ -0,0 +1,14 @@
+import logging
+
+from app.api.repositories.product.pricing import PricingRepository
+from app.core.databases.postgres import get_session_without_depends
+
+logger = logging.getLogger(__name__)
+
+
+async def refresh_effective_prices():
+    async with get_session_without_depends() as session:
+        refreshed = await PricingRepository(session).refresh_expired()
+
+    if refreshed:
+        logger.info(f"Effective prices refreshed for {refreshed} product variants")
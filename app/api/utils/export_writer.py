@@ -0,0 +1,53 @@
+import asyncio
+import csv
+import io
+import tempfile
+import zlib
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _cell(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+async def csv_gzip_chunks(headers: Sequence[str], rows: AsyncIterator[tuple]) -> AsyncIterator[bytes]:
+    """Encodes rows as CSV and gzips them incrementally, yielding roughly ``CHUNK_SIZE`` pieces."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(headers)
+
+    async for row in rows:
+        writer.writerow([_cell(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            chunk = compressor.compress(buffer.getvalue().encode("utf-8"))
+            buffer.seek(0)
+            buffer.truncate()
+            if chunk:
+                yield chunk
+
+    yield compressor.compress(buffer.getvalue().encode("utf-8")) + compressor.flush()
+
+
+async def xlsx_chunks(headers: Sequence[str], rows: AsyncIterator[tuple]) -> AsyncIterator[bytes]:
+    """
+    Writes rows into a write-only workbook, which spools sheet XML to disk,
+    then streams the zipped file back.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(list(headers))
+
+    async for row in rows:
+        sheet.append([_cell(value) for value in row])
+
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
@@ -0,0 +1,27 @@
+import logging
+
+from app.api.repositories.product.valuation import InventoryValuationRepository
+from app.core.databases.postgres import get_session_without_depends, try_leader_lock
+from utils.time_utils import now_time
+
+logger = logging.getLogger(__name__)
+
+
+async def snapshot_inventory_valuation():
+    day = now_time().date()
+
+    async with get_session_without_depends() as session:
+        repository = InventoryValuationRepository(session)
+        if not await try_leader_lock(session, "inventory_valuation_snapshot") or await repository.has_snapshot(day):
+            await session.rollback()
+            return
+
+        try:
+            rows = await repository.snapshot(day)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception(f"Inventory valuation snapshot failed for {day}")
+            return
+
+    logger.info(f"Inventory valuation snapshot for {day}: {rows} rows")
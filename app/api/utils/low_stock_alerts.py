@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import List, Optional, Set
+
+import asyncpg
+
+from app.api.repositories.product.low_stock import LOW_STOCK_CHANNEL, LowStockAlertRepository
+from app.core.databases.postgres import get_session_without_depends
+from app.core.settings import get_settings
+from app.core.utils.firebase import send_push_notification_to_topic
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+listener_connection: Optional[asyncpg.Connection] = None
+pending_tasks: Set[asyncio.Task] = set()
+
+
+def low_stock_topic(warehouse_id: int) -> str:
+    return f"warehouse_{warehouse_id}_low_stock"
+
+
+async def start_low_stock_listener():
+    """LISTENs for crossings committed by the ``product_variants`` trigger."""
+    global listener_connection
+    if listener_connection is not None:
+        return
+
+    listener_connection = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        database=settings.POSTGRES_DATABASE,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+    )
+    await listener_connection.add_listener(LOW_STOCK_CHANNEL, _on_low_stock_alert)
+    logger.info(f"Listening on {LOW_STOCK_CHANNEL}")
+
+
+async def stop_low_stock_listener():
+    global listener_connection
+    if listener_connection is None:
+        return
+
+    try:
+        await listener_connection.remove_listener(LOW_STOCK_CHANNEL, _on_low_stock_alert)
+        await listener_connection.close()
+    finally:
+        listener_connection = None
+
+
+def _on_low_stock_alert(connection, pid, channel, payload):
+    task = asyncio.create_task(notify_low_stock_alerts([int(payload)]))
+    pending_tasks.add(task)
+    task.add_done_callback(pending_tasks.discard)
+
+
+async def notify_low_stock_alerts(alert_ids: Optional[List[int]] = None):
+    """
+    Claims alerts and pushes them to the warehouse topic; the active
+    ``low_stock_alerts`` rows are the stored feed. Called per
+    notification and, without ``alert_ids``, as a sweep for anything missed
+    while no listener was connected.
+    """
+    async with get_session_without_depends() as session:
+        try:
+            alerts = await LowStockAlertRepository(session).claim_for_notification(alert_ids)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Failed to claim low-stock alerts")
+            return
+
+    for alert in alerts:
+        try:
+            await asyncio.to_thread(
+                send_push_notification_to_topic,
+                topic=low_stock_topic(alert.warehouse_id),
+                title="Mahsulot kam qoldi",
+                body=_alert_body(alert),
+            )
+        except Exception:
+            logger.exception(f"Low-stock push failed for alert {alert.id}")
+
+    if alert_ids is None and alerts:
+        logger.info(f"Sent {len(alerts)} pending low-stock alerts")
+
+
+def _alert_body(alert) -> str:
+    name = (alert.name or {}).get("uz") or str(alert.barcode)
+    return f"{name}: {alert.amount:g} qoldi (chegara {alert.threshold:g})"
@@ -86,3 +86,60 @@ async def check_permission(
         )
 
     return True
+
+
+def _role_allows(admin_warehouse: AdminWarehouse, owner_id: int, admin_id: int, model_name: str, action: str) -> bool:
+    if admin_warehouse.is_owner or owner_id == admin_id:
+        return True
+
+    permissions = admin_warehouse.permissions or {}
+    if "all" in permissions and action in permissions["all"]:
+        return True
+    return model_name in permissions and action in permissions[model_name]
+
+
+async def check_permissions(
+        session: AsyncSession,
+        admin_id: int,
+        model_name: str,
+        action: str,
+        warehouse_ids: list[int],
+) -> bool:
+    """
+    check_permission ning bir nechta warehouse uchun varianti: barcha rollar bitta so'rovda olinadi.
+
+    :param warehouse_ids: list[int] - Warehouse IDlari.
+    :return: bool - Hamma warehouse uchun ruxsat bo'lsa True, aks holda exception.
+    """
+    admin = await session.get(AdminUser, admin_id)
+    if admin and admin.is_global_admin:
+        return True
+
+    query = (
+        select(AdminWarehouse, Warehouse.owner_id)
+        .join(
+            admin_warehouse_roles,
+            AdminWarehouse.id == admin_warehouse_roles.c.warehouse_role_id,
+        )
+        .join(Warehouse, Warehouse.id == AdminWarehouse.warehouse_id)
+        .where(
+            admin_warehouse_roles.c.admin_id == admin_id,
+            AdminWarehouse.warehouse_id.in_(warehouse_ids),
+        )
+    )
+
+    result = await session.execute(query)
+
+    allowed = set()
+    for admin_warehouse, owner_id in result.all():
+        if _role_allows(admin_warehouse, owner_id, admin_id, model_name, action):
+            allowed.add(admin_warehouse.warehouse_id)
+
+    denied = sorted(set(warehouse_ids) - allowed)
+    if denied:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"No {action} permission for {model_name} in warehouses {', '.join(map(str, denied))}",
+        )
+
+    return True
@@ -0,0 +1,41 @@
+"""
+Rebuilds ``daily_sales_rollups`` from order history.
+
+    python -m app.api.utils.rebuild_sales_rollups --warehouse-id 3 --start 2026-01-01 --end 2026-01-31
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from app.api.repositories.sales_rollup import SalesRollupRepository
+from app.core.databases.postgres import get_session_without_depends
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_sales_rollups(warehouse_id: int = None, start_day: date = None, end_day: date = None):
+    async with get_session_without_depends() as session:
+        await SalesRollupRepository(session).rebuild(
+            warehouse_id=warehouse_id,
+            start_day=start_day,
+            end_day=end_day,
+        )
+        await session.commit()
+
+    logger.info(f"Rebuilt sales rollups for warehouse={warehouse_id or 'all'} from {start_day or 'start'} to {end_day or 'today'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily sales rollups from completed orders")
+    parser.add_argument("--warehouse-id", type=int, default=None)
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="First day, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last day (inclusive), YYYY-MM-DD")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(rebuild_sales_rollups(args.warehouse_id, args.start, args.end))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+import logging
+
+from app.api.repositories.stock_reservation import StockReservationRepository
+from app.core.databases.postgres import get_session_without_depends
+
+logger = logging.getLogger(__name__)
+
+
+async def release_expired_reservations():
+    async with get_session_without_depends() as session:
+        released = await StockReservationRepository(session).delete_expired()
+
+    if released:
+        logger.info(f"Released {released} expired stock reservations")
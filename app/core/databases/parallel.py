@@ -0,0 +1,100 @@
+import asyncio
+import re
+from functools import cache
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Row, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.databases.postgres import get_async_engine
+from app.core.settings import get_settings
+
+settings = get_settings()
+
+SNAPSHOT_ID = re.compile(r"^[0-9A-F]+-[0-9A-F]+(-[0-9]+)?$")
+
+
+@cache
+def get_group_semaphore() -> asyncio.Semaphore:
+    """
+    Limits how many executor groups run at once across the process. A group
+    holds up to ANALYTICS_MAX_PARALLEL_QUERIES connections, so admitting only
+    as many groups as fit in ANALYTICS_MAX_POOL_CONNECTIONS guarantees that a
+    leader never waits on the pool for followers that cannot get a connection.
+    """
+    # The leader plus at least one follower, see ParallelQueryExecutor.run.
+    groups = settings.ANALYTICS_MAX_POOL_CONNECTIONS // max(settings.ANALYTICS_MAX_PARALLEL_QUERIES, 2)
+    return asyncio.Semaphore(max(groups, 1))
+
+
+class ParallelQueryExecutor:
+    """
+    Runs independent read-only statements concurrently, each on its own
+    pooled connection. The first connection exports its snapshot and the
+    others import it, so every statement sees the same database state.
+    A group is admitted through get_group_semaphore() before the leader
+    checks out its connection and holds it until every follower is done.
+    Callers must not hold a pooled connection of their own while calling
+    run(), since the semaphore only accounts for the group's connections;
+    commit the request session first.
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None, max_concurrency: Optional[int] = None):
+        self.__engine = engine or get_async_engine()
+        # Never wider than the group size the process-wide semaphore was sized for.
+        self.__max_concurrency = min(
+            max_concurrency or settings.ANALYTICS_MAX_PARALLEL_QUERIES, settings.ANALYTICS_MAX_PARALLEL_QUERIES
+        )
+
+    async def run(self, statements: Sequence) -> List[List[Row]]:
+        """Returns the buffered rows of each statement, in the order given."""
+        if not statements:
+            return []
+
+        async with get_group_semaphore():
+            return await self.__run_group(statements)
+
+    async def __run_group(self, statements: Sequence) -> List[List[Row]]:
+        semaphore = asyncio.Semaphore(max(self.__max_concurrency - 1, 1))
+
+        async with self.__engine.connect() as connection:
+            await self.__begin_snapshot(connection)
+            try:
+                snapshot_id = (await connection.execute(text("SELECT pg_export_snapshot()"))).scalar()
+                if not SNAPSHOT_ID.match(snapshot_id):
+                    raise ValueError(f"Unexpected snapshot id {snapshot_id!r}")
+
+                # The exporting transaction has to stay open until every
+                # follower has imported the snapshot, so it runs the first
+                # statement itself while the rest are in flight.
+                followers = [
+                    asyncio.create_task(self.__run_in_snapshot(statement, snapshot_id, semaphore))
+                    for statement in statements[1:]
+                ]
+                try:
+                    first = (await connection.execute(statements[0])).all()
+                    rest = await asyncio.gather(*followers)
+                except BaseException:
+                    for follower in followers:
+                        follower.cancel()
+                    await asyncio.gather(*followers, return_exceptions=True)
+                    raise
+            finally:
+                await connection.rollback()
+
+        return [first, *rest]
+
+    async def __run_in_snapshot(self, statement, snapshot_id: str, semaphore: asyncio.Semaphore) -> List[Row]:
+        async with semaphore:
+            async with self.__engine.connect() as connection:
+                await self.__begin_snapshot(connection)
+                try:
+                    await connection.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+                    return (await connection.execute(statement)).all()
+                finally:
+                    await connection.rollback()
+
+    @staticmethod
+    async def __begin_snapshot(connection: AsyncConnection) -> None:
+        await connection.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        await connection.begin()
@@ -2,6 +2,7 @@ from contextlib import asynccontextmanager
 from functools import cache
 from typing import AsyncGenerator
 
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
@@ -56,3 +57,9 @@ async def get_session_without_depends() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+async def try_leader_lock(session: AsyncSession, name: str) -> bool:
+    """Transaction-scoped advisory lock so only one worker runs a scheduled job."""
+    result = await session.execute(select(func.pg_try_advisory_xact_lock(func.hashtext(name))))
+    return bool(result.scalar())
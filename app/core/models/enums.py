@@ -63,3 +63,59 @@ class RevisionStatus(str, Enum):
     created = "created"
     completed = "completed"
     cancelled = "cancelled"
+
+
+class HistogramBucketEnum(str, Enum):
+    quarter_hour = "15min"
+    hour = "hour"
+    day = "day"
+    week = "week"
+
+
+class HistogramMetricEnum(str, Enum):
+    orders = "orders"
+    revenue = "revenue"
+    items = "items"
+
+
+class ComparisonBucketEnum(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+    quarter = "quarter"
+    year = "year"
+
+
+class ComparisonModeEnum(str, Enum):
+    previous_bucket = "previous_bucket"  # day-over-day, week-over-week, month-over-month...
+    previous_year = "previous_year"  # same bucket one year earlier
+
+
+class LeaderboardSortEnum(str, Enum):
+    revenue = "revenue"
+    orders = "orders"
+    items = "items"
+    average_basket = "average_basket"
+    margin = "margin"
+
+
+class DeadStockSortEnum(str, Enum):
+    capital = "capital"  # tied-up capital (amount * come_in_price), largest first
+    last_sold = "last_sold"  # longest without a sale first, never sold at the top
+
+
+class ExportReportEnum(str, Enum):
+    variant_sales = "variant_sales"
+    orders = "orders"
+    stock_valuation = "stock_valuation"
+    revisions = "revisions"
+
+
+class ExportFormatEnum(str, Enum):
+    csv = "csv"
+    xlsx = "xlsx"
+
+
+class ClassificationPeriodEnum(str, Enum):
+    week = "week"
+    month = "month"
@@ -31,6 +31,28 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int
 
+    # STOCK RESERVATIONS
+    STOCK_RESERVATION_TTL_MINUTES: int = 30
+
+    # ANALYTICS
+    LEADERBOARD_CACHE_TTL_SECONDS: int = 60
+    ANALYTICS_MAX_PARALLEL_QUERIES: int = 3
+    # Connections all parallel query groups may hold at once. Kept below the engine's
+    # pool_size + max_overflow (8); callers release their own connection before running a group.
+    ANALYTICS_MAX_POOL_CONNECTIONS: int = 6
+    INVENTORY_CLASSIFICATION_CACHE_TTL_SECONDS: int = 900
+    SALES_HEATMAP_CACHE_TTL_SECONDS: int = 300
+
+    # REVISIONS
+    REVISION_COMPLETION_CHUNK_SIZE: int = 5000
+
+    # DEMAND FORECASTS
+    FORECAST_HISTORY_DAYS: int = 90
+    FORECAST_SMOOTHING_ALPHA: float = 0.3
+    FORECAST_LEAD_TIME_DAYS: int = 7
+    FORECAST_REVIEW_DAYS: int = 14
+    FORECAST_SERVICE_LEVEL_Z: float = 1.65
+
     # FIREBASE CREDENTIALS
     FIREBASE_TYPE: str
     FIREBASE_PROJECT_ID: str
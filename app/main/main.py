@@ -5,6 +5,12 @@ from contextlib import asynccontextmanager
 from fastapi import APIRouter, FastAPI
 from fastapi.staticfiles import StaticFiles
 from app.api.utils.backup_database import backup_database
+from app.api.utils.banner_scheduler import sync_banner_prices
+from app.api.utils.demand_forecasts import refresh_demand_forecasts
+from app.api.utils.effective_prices import refresh_effective_prices
+from app.api.utils.inventory_valuation import snapshot_inventory_valuation
+from app.api.utils.low_stock_alerts import notify_low_stock_alerts, start_low_stock_listener, stop_low_stock_listener
+from app.api.utils.stock_reservations import release_expired_reservations
 from app.core.settings import get_settings, Settings
 from starlette.middleware.cors import CORSMiddleware
 from app.api.routers.role import router as role_router
@@ -31,6 +37,8 @@ from app.api.routers.auth import router as auth_router
 from app.api.routers.order import router as order_router
 from app.api.routers.orderitem import router as order_item_router
 from app.api.routers.report import router as report_router
+from app.api.routers.analytics import router as analytics_router
+from app.api.routers.export import router as export_router
 from app.api.routers.file import router as file_router
 from app.api.routers.chat import router as chat_router
 from app.api.routers.notification.notification import router as notification_router
@@ -56,13 +64,21 @@ async def start_scheduler():
     print("Schuler started")
     await backup_database()
     scheduler.add_job(backup_database, 'interval', minutes=3600)
+    scheduler.add_job(refresh_effective_prices, 'interval', minutes=1)
+    scheduler.add_job(sync_banner_prices, 'interval', minutes=1)
+    scheduler.add_job(release_expired_reservations, 'interval', minutes=5)
+    scheduler.add_job(refresh_demand_forecasts, 'cron', hour=3, minute=0)
+    scheduler.add_job(snapshot_inventory_valuation, 'cron', hour=23, minute=50)
+    scheduler.add_job(notify_low_stock_alerts, 'interval', minutes=5)
     scheduler.start()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await init_postgres()
+    await start_low_stock_listener()
     yield
+    await stop_low_stock_listener()
     await close_postgres()
 
 
@@ -165,6 +181,12 @@ def create_app() -> CORSMiddleware:
     v1_router.include_router(
         report_router, prefix="/report", tags=["Report"]
     )
+    v1_router.include_router(
+        analytics_router, prefix="/analytics", tags=["Analytics"]
+    )
+    v1_router.include_router(
+        export_router, prefix="/export", tags=["Export"]
+    )
     v1_router.include_router(
         utils_router, prefix="/utils", tags=["Utils"]
     )
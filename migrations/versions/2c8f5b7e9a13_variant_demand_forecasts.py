@@ -0,0 +1,43 @@
+"""variant demand forecasts
+
+Revision ID: 2c8f5b7e9a13
+Revises: 9d4e7a2c1f58
+Create Date: 2026-10-19 14:02:47.553910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8f5b7e9a13'
+down_revision: Union[str, None] = '9d4e7a2c1f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'variant_demand_forecasts',
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('daily_demand', sa.Float(), nullable=False),
+        sa.Column('demand_std', sa.Float(), nullable=False),
+        sa.Column('stock', sa.Float(), nullable=False),
+        sa.Column('days_of_cover', sa.Float(), nullable=True),
+        sa.Column('stockout_date', sa.Date(), nullable=True),
+        sa.Column('reorder_point', sa.Float(), nullable=False),
+        sa.Column('suggested_order_quantity', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_variant_id')
+    )
+    op.create_index('ix_variant_demand_forecasts_warehouse_stockout', 'variant_demand_forecasts', ['warehouse_id', 'stockout_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_variant_demand_forecasts_warehouse_stockout', table_name='variant_demand_forecasts')
+    op.drop_table('variant_demand_forecasts')
@@ -0,0 +1,41 @@
+"""banner scheduling
+
+Revision ID: 3f6a8d21c5e4
+Revises: e2a9c6b14f07
+Create Date: 2026-10-19 11:24:48.590361
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6a8d21c5e4'
+down_revision: Union[str, None] = 'e2a9c6b14f07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('banners', sa.Column('is_applied', sa.Boolean(), server_default='false', nullable=False))
+    op.add_column('banner_products', sa.Column('original_price', sa.Float(), nullable=True))
+
+    # Banners created before scheduling already rewrote current_price and kept the base in old_price.
+    op.execute("""
+        UPDATE banner_products bp
+        SET original_price = pv.old_price
+        FROM product_variants pv
+        WHERE pv.id = bp.product_variant_id AND pv.old_price IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE banners b
+        SET is_applied = true
+        WHERE EXISTS (SELECT 1 FROM banner_products bp WHERE bp.banner_id = b.id AND bp.original_price IS NOT NULL)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('banner_products', 'original_price')
+    op.drop_column('banners', 'is_applied')
@@ -0,0 +1,47 @@
+"""product variant last sold at
+
+Revision ID: 3f7a9c1e5b28
+Revises: c8b2e5d91f47
+Create Date: 2026-10-19 17:02:15.473920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a9c1e5b28'
+down_revision: Union[str, None] = 'c8b2e5d91f47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('product_variants', sa.Column('last_sold_at', sa.DateTime(), nullable=True))
+
+    op.execute("""
+        UPDATE product_variants AS pv
+           SET last_sold_at = s.sold_at
+          FROM (
+                SELECT i.product_variant_id, max(o.created_at) AS sold_at
+                  FROM admin_order_items i
+                  JOIN admin_orders o ON o.id = i.order_id
+                 WHERE o.status = 'completed'
+                 GROUP BY i.product_variant_id
+               ) AS s
+         WHERE pv.id = s.product_variant_id
+    """)
+
+    op.create_index('ix_products_warehouse_id', 'products', ['warehouse_id'], unique=False)
+    op.create_index(
+        'ix_product_variants_in_stock_product_last_sold_at', 'product_variants', ['product_id', 'last_sold_at'],
+        unique=False, postgresql_where=sa.text('amount > 0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_variants_in_stock_product_last_sold_at', table_name='product_variants')
+    op.drop_index('ix_products_warehouse_id', table_name='products')
+    op.drop_column('product_variants', 'last_sold_at')
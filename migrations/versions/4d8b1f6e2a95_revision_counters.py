@@ -0,0 +1,144 @@
+"""revision counters
+
+Revision ID: 4d8b1f6e2a95
+Revises: e6c1a8f3b9d4
+Create Date: 2026-10-19 18:41:09.237514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d8b1f6e2a95'
+down_revision: Union[str, None] = 'e6c1a8f3b9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('revision_items', sa.Column('unit_cost', sa.Numeric(precision=10, scale=2), nullable=True))
+    op.execute("""
+        UPDATE revision_items AS ri
+           SET unit_cost = pv.come_in_price
+          FROM product_variants AS pv
+         WHERE pv.id = ri.product_variant_id
+    """)
+    op.alter_column('revision_items', 'unit_cost', nullable=False)
+
+    op.add_column('revisions', sa.Column('scanned_items', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('revisions', sa.Column('discrepancy_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('revisions', sa.Column('surplus_value', sa.Numeric(), server_default='0', nullable=False))
+    op.add_column('revisions', sa.Column('shortage_value', sa.Numeric(), server_default='0', nullable=False))
+
+    # Statement-level triggers fold a whole scan batch into one update per
+    # revision. Transition tables need one trigger per event, and each branch
+    # may only reference the tables its event provides.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION revision_items_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE revisions AS r
+                   SET scanned_items = r.scanned_items + d.scanned_items,
+                       discrepancy_count = r.discrepancy_count + d.discrepancy_count,
+                       surplus_value = r.surplus_value + d.surplus_value,
+                       shortage_value = r.shortage_value + d.shortage_value
+                  FROM (
+                        SELECT revision_id,
+                               sum(sign) AS scanned_items,
+                               COALESCE(sum(sign) FILTER (WHERE difference <> 0), 0) AS discrepancy_count,
+                               sum(sign * greatest(difference, 0) * unit_cost) AS surplus_value,
+                               sum(sign * greatest(-difference, 0) * unit_cost) AS shortage_value
+                          FROM (SELECT revision_id, 1 AS sign, difference, unit_cost FROM new_items) AS c
+                         GROUP BY revision_id
+                       ) AS d
+                 WHERE r.id = d.revision_id;
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE revisions AS r
+                   SET scanned_items = r.scanned_items + d.scanned_items,
+                       discrepancy_count = r.discrepancy_count + d.discrepancy_count,
+                       surplus_value = r.surplus_value + d.surplus_value,
+                       shortage_value = r.shortage_value + d.shortage_value
+                  FROM (
+                        SELECT revision_id,
+                               sum(sign) AS scanned_items,
+                               COALESCE(sum(sign) FILTER (WHERE difference <> 0), 0) AS discrepancy_count,
+                               sum(sign * greatest(difference, 0) * unit_cost) AS surplus_value,
+                               sum(sign * greatest(-difference, 0) * unit_cost) AS shortage_value
+                          FROM (SELECT revision_id, -1 AS sign, difference, unit_cost FROM old_items) AS c
+                         GROUP BY revision_id
+                       ) AS d
+                 WHERE r.id = d.revision_id;
+            ELSE
+                UPDATE revisions AS r
+                   SET scanned_items = r.scanned_items + d.scanned_items,
+                       discrepancy_count = r.discrepancy_count + d.discrepancy_count,
+                       surplus_value = r.surplus_value + d.surplus_value,
+                       shortage_value = r.shortage_value + d.shortage_value
+                  FROM (
+                        SELECT revision_id,
+                               sum(sign) AS scanned_items,
+                               COALESCE(sum(sign) FILTER (WHERE difference <> 0), 0) AS discrepancy_count,
+                               sum(sign * greatest(difference, 0) * unit_cost) AS surplus_value,
+                               sum(sign * greatest(-difference, 0) * unit_cost) AS shortage_value
+                          FROM (SELECT revision_id, 1 AS sign, difference, unit_cost FROM new_items
+                                UNION ALL
+                                SELECT revision_id, -1 AS sign, difference, unit_cost FROM old_items) AS c
+                         GROUP BY revision_id
+                       ) AS d
+                 WHERE r.id = d.revision_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_revision_items_counters_insert
+        AFTER INSERT ON revision_items
+        REFERENCING NEW TABLE AS new_items
+        FOR EACH STATEMENT EXECUTE FUNCTION revision_items_counters();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_revision_items_counters_update
+        AFTER UPDATE ON revision_items
+        REFERENCING OLD TABLE AS old_items NEW TABLE AS new_items
+        FOR EACH STATEMENT EXECUTE FUNCTION revision_items_counters();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_revision_items_counters_delete
+        AFTER DELETE ON revision_items
+        REFERENCING OLD TABLE AS old_items
+        FOR EACH STATEMENT EXECUTE FUNCTION revision_items_counters();
+    """)
+
+    op.execute("""
+        UPDATE revisions AS r
+           SET scanned_items = c.scanned_items,
+               discrepancy_count = c.discrepancy_count,
+               surplus_value = c.surplus_value,
+               shortage_value = c.shortage_value
+          FROM (
+                SELECT revision_id,
+                       count(*) AS scanned_items,
+                       count(*) FILTER (WHERE difference <> 0) AS discrepancy_count,
+                       COALESCE(sum(greatest(difference, 0) * unit_cost), 0) AS surplus_value,
+                       COALESCE(sum(greatest(-difference, 0) * unit_cost), 0) AS shortage_value
+                  FROM revision_items
+                 GROUP BY revision_id
+               ) AS c
+         WHERE r.id = c.revision_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_revision_items_counters_delete ON revision_items")
+    op.execute("DROP TRIGGER IF EXISTS trg_revision_items_counters_update ON revision_items")
+    op.execute("DROP TRIGGER IF EXISTS trg_revision_items_counters_insert ON revision_items")
+    op.execute("DROP FUNCTION IF EXISTS revision_items_counters()")
+    op.drop_column('revisions', 'shortage_value')
+    op.drop_column('revisions', 'surplus_value')
+    op.drop_column('revisions', 'discrepancy_count')
+    op.drop_column('revisions', 'scanned_items')
+    op.drop_column('revision_items', 'unit_cost')
@@ -0,0 +1,36 @@
+"""admin order item unit cost
+
+Revision ID: 5a3d8f6c2e17
+Revises: 7e1c4a9b3d62
+Create Date: 2026-10-19 15:48:31.690442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a3d8f6c2e17'
+down_revision: Union[str, None] = '7e1c4a9b3d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('admin_order_items', sa.Column('unit_cost', sa.DECIMAL(precision=10, scale=2), nullable=True))
+
+    # Historical cost prices were never recorded; the current come_in_price
+    # is the best available value for existing lines.
+    op.execute("""
+        UPDATE admin_order_items AS i
+           SET unit_cost = pv.come_in_price
+          FROM product_variants AS pv
+         WHERE pv.id = i.product_variant_id
+    """)
+    op.alter_column('admin_order_items', 'unit_cost', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('admin_order_items', 'unit_cost')
@@ -0,0 +1,26 @@
+"""admin order items order_id index
+
+Revision ID: 5d2e8b1c7a90
+Revises: cda8ef3df9a2
+Create Date: 2026-10-19 10:02:11.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8b1c7a90'
+down_revision: Union[str, None] = 'cda8ef3df9a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_admin_order_items_order_id'), 'admin_order_items', ['order_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_admin_order_items_order_id'), table_name='admin_order_items')
@@ -0,0 +1,30 @@
+"""dashboard indexes
+
+Revision ID: 6b19f3e0a8d5
+Revises: a4c7e91b2d36
+Create Date: 2026-10-19 12:20:36.071942
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b19f3e0a8d5'
+down_revision: Union[str, None] = 'a4c7e91b2d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_admin_orders_warehouse_created_at', 'admin_orders', ['warehouse_id', 'created_at'], unique=False)
+    op.create_index('ix_admin_orders_warehouse_status_created_at', 'admin_orders', ['warehouse_id', 'status', 'created_at'], unique=False)
+    op.create_index(op.f('ix_product_variants_created_at'), 'product_variants', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_product_variants_created_at'), table_name='product_variants')
+    op.drop_index('ix_admin_orders_warehouse_status_created_at', table_name='admin_orders')
+    op.drop_index('ix_admin_orders_warehouse_created_at', table_name='admin_orders')
@@ -0,0 +1,297 @@
+"""inventory valuation statement triggers
+
+Revision ID: 6f2c9e4a1d87
+Revises: 4d8b1f6e2a95
+Create Date: 2026-10-19 19:22:36.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f2c9e4a1d87'
+down_revision: Union[str, None] = '4d8b1f6e2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_products_valuation ON products")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_valuation ON product_variants")
+    op.execute("DROP FUNCTION IF EXISTS products_valuation()")
+    op.execute("DROP FUNCTION IF EXISTS product_variants_valuation()")
+    op.execute("DROP FUNCTION IF EXISTS apply_inventory_valuation(integer, integer, integer, numeric, numeric, numeric)")
+
+    # One upsert per statement: deltas are summed per (warehouse, subcategory)
+    # and applied in key order, so concurrent multi-variant statements lock
+    # the shared valuation rows in the same order and cannot deadlock.
+    # Transition tables need one trigger per event and allow no column list,
+    # so the update branch skips unchanged rows itself.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_variants_valuation() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO inventory_valuations AS v
+                    (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+                SELECT c.warehouse_id, c.subcategory_id, sum(c.variants), sum(c.quantity),
+                       sum(c.cost_value), sum(c.retail_value), timezone('Asia/Tashkent', now())
+                  FROM (
+                        SELECT p.warehouse_id, p.subcategory_id, 1 AS variants,
+                               r.amount::numeric AS quantity,
+                               (r.amount::numeric * r.come_in_price::numeric) AS cost_value,
+                               (r.amount::numeric * r.current_price::numeric) AS retail_value
+                          FROM new_rows AS r
+                          JOIN products AS p ON p.id = r.product_id
+                       ) AS c
+                 GROUP BY c.warehouse_id, c.subcategory_id
+                 ORDER BY c.warehouse_id, c.subcategory_id
+                ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                    variants = v.variants + EXCLUDED.variants,
+                    quantity = v.quantity + EXCLUDED.quantity,
+                    cost_value = v.cost_value + EXCLUDED.cost_value,
+                    retail_value = v.retail_value + EXCLUDED.retail_value,
+                    updated_at = EXCLUDED.updated_at;
+            ELSIF TG_OP = 'DELETE' THEN
+                INSERT INTO inventory_valuations AS v
+                    (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+                SELECT c.warehouse_id, c.subcategory_id, sum(c.variants), sum(c.quantity),
+                       sum(c.cost_value), sum(c.retail_value), timezone('Asia/Tashkent', now())
+                  FROM (
+                        SELECT p.warehouse_id, p.subcategory_id, -1 AS variants,
+                               -r.amount::numeric AS quantity,
+                               -(r.amount::numeric * r.come_in_price::numeric) AS cost_value,
+                               -(r.amount::numeric * r.current_price::numeric) AS retail_value
+                          FROM old_rows AS r
+                          JOIN products AS p ON p.id = r.product_id
+                       ) AS c
+                 GROUP BY c.warehouse_id, c.subcategory_id
+                 ORDER BY c.warehouse_id, c.subcategory_id
+                ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                    variants = v.variants + EXCLUDED.variants,
+                    quantity = v.quantity + EXCLUDED.quantity,
+                    cost_value = v.cost_value + EXCLUDED.cost_value,
+                    retail_value = v.retail_value + EXCLUDED.retail_value,
+                    updated_at = EXCLUDED.updated_at;
+            ELSE
+                INSERT INTO inventory_valuations AS v
+                    (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+                SELECT c.warehouse_id, c.subcategory_id, sum(c.variants), sum(c.quantity),
+                       sum(c.cost_value), sum(c.retail_value), timezone('Asia/Tashkent', now())
+                  FROM (
+                        SELECT p.warehouse_id, p.subcategory_id, -1 AS variants,
+                               -r.amount::numeric AS quantity,
+                               -(r.amount::numeric * r.come_in_price::numeric) AS cost_value,
+                               -(r.amount::numeric * r.current_price::numeric) AS retail_value
+                          FROM old_rows AS r
+                          JOIN products AS p ON p.id = r.product_id
+                          JOIN new_rows AS x ON x.id = r.id
+                         WHERE (r.amount, r.come_in_price, r.current_price, r.product_id)
+                               IS DISTINCT FROM (x.amount, x.come_in_price, x.current_price, x.product_id)
+                        UNION ALL
+                        SELECT p.warehouse_id, p.subcategory_id, 1 AS variants,
+                               r.amount::numeric AS quantity,
+                               (r.amount::numeric * r.come_in_price::numeric) AS cost_value,
+                               (r.amount::numeric * r.current_price::numeric) AS retail_value
+                          FROM new_rows AS r
+                          JOIN products AS p ON p.id = r.product_id
+                          JOIN old_rows AS x ON x.id = r.id
+                         WHERE (r.amount, r.come_in_price, r.current_price, r.product_id)
+                               IS DISTINCT FROM (x.amount, x.come_in_price, x.current_price, x.product_id)
+                       ) AS c
+                 GROUP BY c.warehouse_id, c.subcategory_id
+                 ORDER BY c.warehouse_id, c.subcategory_id
+                ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                    variants = v.variants + EXCLUDED.variants,
+                    quantity = v.quantity + EXCLUDED.quantity,
+                    cost_value = v.cost_value + EXCLUDED.cost_value,
+                    retail_value = v.retail_value + EXCLUDED.retail_value,
+                    updated_at = EXCLUDED.updated_at;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_valuation_insert
+        AFTER INSERT ON product_variants
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION product_variants_valuation();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_valuation_update
+        AFTER UPDATE ON product_variants
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION product_variants_valuation();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_valuation_delete
+        AFTER DELETE ON product_variants
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION product_variants_valuation();
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_valuation() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO inventory_valuations AS v
+                (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+            SELECT c.warehouse_id, c.subcategory_id, sum(c.variants), sum(c.quantity),
+                   sum(c.cost_value), sum(c.retail_value), timezone('Asia/Tashkent', now())
+              FROM (
+                    SELECT o.warehouse_id, o.subcategory_id, -count(*)::integer AS variants,
+                           -sum(pv.amount::numeric) AS quantity,
+                           -sum(pv.amount::numeric * pv.come_in_price::numeric) AS cost_value,
+                           -sum(pv.amount::numeric * pv.current_price::numeric) AS retail_value
+                      FROM old_products AS o
+                      JOIN new_products AS n ON n.id = o.id
+                      JOIN product_variants AS pv ON pv.product_id = n.id
+                     WHERE (o.warehouse_id, o.subcategory_id) IS DISTINCT FROM (n.warehouse_id, n.subcategory_id)
+                     GROUP BY o.warehouse_id, o.subcategory_id
+                    UNION ALL
+                    SELECT n.warehouse_id, n.subcategory_id, count(*)::integer AS variants,
+                           sum(pv.amount::numeric) AS quantity,
+                           sum(pv.amount::numeric * pv.come_in_price::numeric) AS cost_value,
+                           sum(pv.amount::numeric * pv.current_price::numeric) AS retail_value
+                      FROM old_products AS o
+                      JOIN new_products AS n ON n.id = o.id
+                      JOIN product_variants AS pv ON pv.product_id = n.id
+                     WHERE (o.warehouse_id, o.subcategory_id) IS DISTINCT FROM (n.warehouse_id, n.subcategory_id)
+                     GROUP BY n.warehouse_id, n.subcategory_id
+                   ) AS c
+             GROUP BY c.warehouse_id, c.subcategory_id
+             ORDER BY c.warehouse_id, c.subcategory_id
+            ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                variants = v.variants + EXCLUDED.variants,
+                quantity = v.quantity + EXCLUDED.quantity,
+                cost_value = v.cost_value + EXCLUDED.cost_value,
+                retail_value = v.retail_value + EXCLUDED.retail_value,
+                updated_at = EXCLUDED.updated_at;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_products_valuation
+        AFTER UPDATE ON products
+        REFERENCING OLD TABLE AS old_products NEW TABLE AS new_products
+        FOR EACH STATEMENT EXECUTE FUNCTION products_valuation();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_products_valuation ON products")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_valuation_delete ON product_variants")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_valuation_update ON product_variants")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_valuation_insert ON product_variants")
+    op.execute("DROP FUNCTION IF EXISTS products_valuation()")
+    op.execute("DROP FUNCTION IF EXISTS product_variants_valuation()")
+
+    # Row-level triggers from c8b2e5d91f47.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_inventory_valuation(
+            p_warehouse_id integer, p_subcategory_id integer, p_variants integer,
+            p_quantity numeric, p_cost_value numeric, p_retail_value numeric
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO inventory_valuations AS v
+                (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+            VALUES (p_warehouse_id, p_subcategory_id, p_variants, p_quantity, p_cost_value, p_retail_value,
+                    timezone('Asia/Tashkent', now()))
+            ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                variants = v.variants + EXCLUDED.variants,
+                quantity = v.quantity + EXCLUDED.quantity,
+                cost_value = v.cost_value + EXCLUDED.cost_value,
+                retail_value = v.retail_value + EXCLUDED.retail_value,
+                updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_variants_valuation() RETURNS trigger AS $$
+        DECLARE
+            v_old products%ROWTYPE;
+            v_new products%ROWTYPE;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                SELECT * INTO v_old FROM products WHERE id = OLD.product_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                SELECT * INTO v_new FROM products WHERE id = NEW.product_id;
+            END IF;
+
+            IF TG_OP = 'UPDATE' AND NEW.product_id = OLD.product_id THEN
+                IF NEW.amount IS NOT DISTINCT FROM OLD.amount
+                   AND NEW.come_in_price IS NOT DISTINCT FROM OLD.come_in_price
+                   AND NEW.current_price IS NOT DISTINCT FROM OLD.current_price THEN
+                    RETURN NULL;
+                END IF;
+                PERFORM apply_inventory_valuation(
+                    v_new.warehouse_id, v_new.subcategory_id, 0,
+                    NEW.amount::numeric - OLD.amount::numeric,
+                    NEW.amount::numeric * NEW.come_in_price::numeric - OLD.amount::numeric * OLD.come_in_price::numeric,
+                    NEW.amount::numeric * NEW.current_price::numeric - OLD.amount::numeric * OLD.current_price::numeric
+                );
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP <> 'INSERT' AND v_old.id IS NOT NULL THEN
+                PERFORM apply_inventory_valuation(
+                    v_old.warehouse_id, v_old.subcategory_id, -1,
+                    -OLD.amount::numeric,
+                    -(OLD.amount::numeric * OLD.come_in_price::numeric),
+                    -(OLD.amount::numeric * OLD.current_price::numeric)
+                );
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM apply_inventory_valuation(
+                    v_new.warehouse_id, v_new.subcategory_id, 1,
+                    NEW.amount::numeric,
+                    NEW.amount::numeric * NEW.come_in_price::numeric,
+                    NEW.amount::numeric * NEW.current_price::numeric
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_valuation
+        AFTER INSERT OR DELETE OR UPDATE OF amount, come_in_price, current_price, product_id ON product_variants
+        FOR EACH ROW EXECUTE FUNCTION product_variants_valuation();
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_valuation() RETURNS trigger AS $$
+        DECLARE
+            v_variants integer;
+            v_quantity numeric;
+            v_cost_value numeric;
+            v_retail_value numeric;
+        BEGIN
+            SELECT count(*), COALESCE(sum(amount::numeric), 0),
+                   COALESCE(sum(amount::numeric * come_in_price::numeric), 0),
+                   COALESCE(sum(amount::numeric * current_price::numeric), 0)
+              INTO v_variants, v_quantity, v_cost_value, v_retail_value
+              FROM product_variants
+             WHERE product_id = NEW.id;
+
+            IF v_variants > 0 THEN
+                PERFORM apply_inventory_valuation(
+                    OLD.warehouse_id, OLD.subcategory_id, -v_variants, -v_quantity, -v_cost_value, -v_retail_value
+                );
+                PERFORM apply_inventory_valuation(
+                    NEW.warehouse_id, NEW.subcategory_id, v_variants, v_quantity, v_cost_value, v_retail_value
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_products_valuation
+        AFTER UPDATE OF warehouse_id, subcategory_id ON products
+        FOR EACH ROW
+        WHEN (OLD.warehouse_id IS DISTINCT FROM NEW.warehouse_id OR OLD.subcategory_id IS DISTINCT FROM NEW.subcategory_id)
+        EXECUTE FUNCTION products_valuation();
+    """)
@@ -0,0 +1,146 @@
+"""low stock alerts
+
+Revision ID: 7e1c4a9b3d62
+Revises: 2c8f5b7e9a13
+Create Date: 2026-10-19 15:11:08.204715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1c4a9b3d62'
+down_revision: Union[str, None] = '2c8f5b7e9a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('product_variants', sa.Column('min_stock', sa.Float(), nullable=True))
+    op.add_column('warehouse_subcategories', sa.Column('min_stock', sa.Float(), nullable=True))
+
+    op.create_table(
+        'low_stock_alerts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('threshold', sa.Float(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('triggered_at', sa.DateTime(), nullable=False),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('notified_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_variant_id')
+    )
+    op.create_index(
+        'ix_low_stock_alerts_active_warehouse_triggered_at', 'low_stock_alerts', ['warehouse_id', 'triggered_at'],
+        unique=False, postgresql_where=sa.text('is_active')
+    )
+    op.create_index(
+        'ix_low_stock_alerts_unnotified', 'low_stock_alerts', ['id'],
+        unique=False, postgresql_where=sa.text('is_active AND notified_at IS NULL')
+    )
+
+    # Threshold: the variant's own, else its warehouse subcategory's, else 0
+    # (out of stock). A crossing into low stock notifies the application on
+    # commit; recovering above the threshold resolves the alert.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION evaluate_low_stock(p_variant_id integer) RETURNS void AS $$
+        DECLARE
+            v_amount double precision;
+            v_threshold double precision;
+            v_warehouse_id integer;
+            v_was_active boolean;
+            v_alert_id integer;
+        BEGIN
+            SELECT pv.amount, COALESCE(pv.min_stock, ws.min_stock, 0), p.warehouse_id
+              INTO v_amount, v_threshold, v_warehouse_id
+              FROM product_variants pv
+              JOIN products p ON p.id = pv.product_id
+              LEFT JOIN warehouse_subcategories ws
+                ON ws.warehouse_id = p.warehouse_id AND ws.subcategory_id = p.subcategory_id
+             WHERE pv.id = p_variant_id;
+
+            IF NOT FOUND THEN
+                RETURN;
+            END IF;
+
+            IF v_amount <= v_threshold THEN
+                SELECT is_active INTO v_was_active
+                  FROM low_stock_alerts
+                 WHERE product_variant_id = p_variant_id;
+
+                INSERT INTO low_stock_alerts (product_variant_id, warehouse_id, threshold, amount, is_active, triggered_at)
+                VALUES (p_variant_id, v_warehouse_id, v_threshold, v_amount, true, timezone('Asia/Tashkent', now()))
+                ON CONFLICT (product_variant_id) DO UPDATE SET
+                    warehouse_id = EXCLUDED.warehouse_id,
+                    threshold = EXCLUDED.threshold,
+                    amount = EXCLUDED.amount,
+                    is_active = true,
+                    resolved_at = NULL,
+                    triggered_at = CASE WHEN low_stock_alerts.is_active
+                        THEN low_stock_alerts.triggered_at ELSE EXCLUDED.triggered_at END,
+                    notified_at = CASE WHEN low_stock_alerts.is_active
+                        THEN low_stock_alerts.notified_at END
+                RETURNING id INTO v_alert_id;
+
+                IF NOT COALESCE(v_was_active, false) THEN
+                    PERFORM pg_notify('low_stock_alerts', v_alert_id::text);
+                END IF;
+            ELSE
+                UPDATE low_stock_alerts
+                   SET is_active = false,
+                       amount = v_amount,
+                       threshold = v_threshold,
+                       resolved_at = timezone('Asia/Tashkent', now())
+                 WHERE product_variant_id = p_variant_id AND is_active;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_variants_low_stock() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE'
+               AND NEW.amount IS NOT DISTINCT FROM OLD.amount
+               AND NEW.min_stock IS NOT DISTINCT FROM OLD.min_stock THEN
+                RETURN NULL;
+            END IF;
+            PERFORM evaluate_low_stock(NEW.id);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_low_stock
+        AFTER INSERT OR UPDATE OF amount, min_stock ON product_variants
+        FOR EACH ROW EXECUTE FUNCTION product_variants_low_stock();
+    """)
+
+    # Existing low stock becomes the initial feed; it is marked as notified so
+    # the upgrade does not push one message per variant.
+    op.execute("""
+        INSERT INTO low_stock_alerts (product_variant_id, warehouse_id, threshold, amount, is_active, triggered_at, notified_at)
+        SELECT pv.id, p.warehouse_id, 0, pv.amount, true,
+               timezone('Asia/Tashkent', now()), timezone('Asia/Tashkent', now())
+          FROM product_variants pv
+          JOIN products p ON p.id = pv.product_id
+         WHERE pv.amount <= 0
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_low_stock ON product_variants")
+    op.execute("DROP FUNCTION IF EXISTS product_variants_low_stock()")
+    op.execute("DROP FUNCTION IF EXISTS evaluate_low_stock(integer)")
+    op.drop_index('ix_low_stock_alerts_unnotified', table_name='low_stock_alerts')
+    op.drop_index('ix_low_stock_alerts_active_warehouse_triggered_at', table_name='low_stock_alerts')
+    op.drop_table('low_stock_alerts')
+    op.drop_column('warehouse_subcategories', 'min_stock')
+    op.drop_column('product_variants', 'min_stock')
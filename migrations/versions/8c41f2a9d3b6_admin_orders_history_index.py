@@ -0,0 +1,26 @@
+"""admin orders history index
+
+Revision ID: 8c41f2a9d3b6
+Revises: 5d2e8b1c7a90
+Create Date: 2026-10-19 10:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41f2a9d3b6'
+down_revision: Union[str, None] = '5d2e8b1c7a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_admin_orders_by_status_updated_at', 'admin_orders', ['by', 'status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_admin_orders_by_status_updated_at', table_name='admin_orders')
@@ -0,0 +1,36 @@
+"""revision items unique variant
+
+Revision ID: 9b4e2d7a6c13
+Revises: 3f7a9c1e5b28
+Create Date: 2026-10-19 17:38:44.105267
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b4e2d7a6c13'
+down_revision: Union[str, None] = '3f7a9c1e5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Concurrent scans could have inserted the same variant twice; keep the latest row.
+    op.execute("""
+        DELETE FROM revision_items AS ri
+         USING revision_items AS newer
+         WHERE newer.revision_id = ri.revision_id
+           AND newer.product_variant_id = ri.product_variant_id
+           AND newer.id > ri.id
+    """)
+    op.create_unique_constraint(
+        'uq_revision_items_revision_variant', 'revision_items', ['revision_id', 'product_variant_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_revision_items_revision_variant', 'revision_items', type_='unique')
@@ -0,0 +1,76 @@
+"""daily sales rollups
+
+Revision ID: 9d4e7a2c1f58
+Revises: 6b19f3e0a8d5
+Create Date: 2026-10-19 13:05:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e7a2c1f58'
+down_revision: Union[str, None] = '6b19f3e0a8d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_sales_rollups',
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('seller_id', sa.Integer(), nullable=False),
+        sa.Column('payment_type', postgresql.ENUM('cash', 'card', 'debt', name='payment_type', create_type=False), nullable=False),
+        sa.Column('quantity', sa.Numeric(), nullable=False),
+        sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.Column('discounted_revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.Column('cost', sa.DECIMAL(precision=14, scale=2), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('orders_attributed', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['seller_id'], ['admin_users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('warehouse_id', 'day', 'product_variant_id', 'seller_id', 'payment_type')
+    )
+    op.create_index('ix_daily_sales_rollups_warehouse_day', 'daily_sales_rollups', ['warehouse_id', 'day'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO daily_sales_rollups (
+            warehouse_id, day, product_variant_id, seller_id, payment_type,
+            quantity, revenue, discounted_revenue, cost, order_count, orders_attributed
+        )
+        SELECT
+            o.warehouse_id,
+            o.created_at::date,
+            i.product_variant_id,
+            coalesce(o.seller, o.by),
+            o.payment_type,
+            sum(i.quantity),
+            sum(i.total_amount),
+            sum(coalesce(i.total_amount_with_discount, i.total_amount)),
+            sum(i.quantity * v.come_in_price::numeric),
+            count(DISTINCT i.order_id),
+            count(DISTINCT i.order_id) FILTER (
+                WHERE i.product_variant_id = (
+                    SELECT min(other.product_variant_id) FROM admin_order_items other WHERE other.order_id = i.order_id
+                )
+            )
+        FROM admin_order_items i
+        JOIN admin_orders o ON o.id = i.order_id
+        JOIN product_variants v ON v.id = i.product_variant_id
+        WHERE o.status = 'completed'
+        GROUP BY o.warehouse_id, o.created_at::date, i.product_variant_id, coalesce(o.seller, o.by), o.payment_type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_daily_sales_rollups_warehouse_day', table_name='daily_sales_rollups')
+    op.drop_table('daily_sales_rollups')
@@ -0,0 +1,35 @@
+"""daily sales rollups seller fk
+
+Revision ID: a3e5c7b9d142
+Revises: 6f2c9e4a1d87
+Create Date: 2026-10-19 19:48:12.304517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e5c7b9d142'
+down_revision: Union[str, None] = '6f2c9e4a1d87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Deleting an admin must not silently erase sales history; like
+    # admin_orders.seller, the reference now blocks the delete instead.
+    op.drop_constraint('daily_sales_rollups_seller_id_fkey', 'daily_sales_rollups', type_='foreignkey')
+    op.create_foreign_key(
+        'daily_sales_rollups_seller_id_fkey', 'daily_sales_rollups', 'admin_users', ['seller_id'], ['id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('daily_sales_rollups_seller_id_fkey', 'daily_sales_rollups', type_='foreignkey')
+    op.create_foreign_key(
+        'daily_sales_rollups_seller_id_fkey', 'daily_sales_rollups', 'admin_users', ['seller_id'], ['id'],
+        ondelete='CASCADE'
+    )
@@ -0,0 +1,42 @@
+"""stock reservations
+
+Revision ID: a4c7e91b2d36
+Revises: 3f6a8d21c5e4
+Create Date: 2026-10-19 11:52:17.827140
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e91b2d36'
+down_revision: Union[str, None] = '3f6a8d21c5e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_reservations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Numeric(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['admin_orders.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_id', 'product_variant_id', name='uq_stock_reservation_order_variant')
+    )
+    op.create_index(op.f('ix_stock_reservations_expires_at'), 'stock_reservations', ['expires_at'], unique=False)
+    op.create_index('ix_stock_reservations_variant_expires_at', 'stock_reservations', ['product_variant_id', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_reservations_variant_expires_at', table_name='stock_reservations')
+    op.drop_index(op.f('ix_stock_reservations_expires_at'), table_name='stock_reservations')
+    op.drop_table('stock_reservations')
@@ -0,0 +1,28 @@
+"""admin orders idempotency key
+
+Revision ID: b7e3d0f45a12
+Revises: 8c41f2a9d3b6
+Create Date: 2026-10-19 10:31:05.662914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d0f45a12'
+down_revision: Union[str, None] = '8c41f2a9d3b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('admin_orders', sa.Column('idempotency_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_admin_orders_idempotency_key'), 'admin_orders', ['idempotency_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_admin_orders_idempotency_key'), table_name='admin_orders')
+    op.drop_column('admin_orders', 'idempotency_key')
@@ -0,0 +1,185 @@
+"""inventory valuations
+
+Revision ID: c8b2e5d91f47
+Revises: 5a3d8f6c2e17
+Create Date: 2026-10-19 16:24:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8b2e5d91f47'
+down_revision: Union[str, None] = '5a3d8f6c2e17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inventory_valuations',
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('subcategory_id', sa.Integer(), nullable=False),
+        sa.Column('variants', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Numeric(), nullable=False),
+        sa.Column('cost_value', sa.Numeric(), nullable=False),
+        sa.Column('retail_value', sa.Numeric(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['subcategory_id'], ['subcategories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('warehouse_id', 'subcategory_id')
+    )
+    op.create_table(
+        'inventory_valuation_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('subcategory_id', sa.Integer(), nullable=True),
+        sa.Column('variants', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Numeric(), nullable=False),
+        sa.Column('cost_value', sa.Numeric(), nullable=False),
+        sa.Column('retail_value', sa.Numeric(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['subcategory_id'], ['subcategories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_inventory_valuation_snapshots_warehouse_subcategory_day', 'inventory_valuation_snapshots',
+        ['warehouse_id', 'subcategory_id', 'day'], unique=False
+    )
+
+    # Values are computed in numeric so that repeated deltas do not drift.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION apply_inventory_valuation(
+            p_warehouse_id integer, p_subcategory_id integer, p_variants integer,
+            p_quantity numeric, p_cost_value numeric, p_retail_value numeric
+        ) RETURNS void AS $$
+        BEGIN
+            INSERT INTO inventory_valuations AS v
+                (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+            VALUES (p_warehouse_id, p_subcategory_id, p_variants, p_quantity, p_cost_value, p_retail_value,
+                    timezone('Asia/Tashkent', now()))
+            ON CONFLICT (warehouse_id, subcategory_id) DO UPDATE SET
+                variants = v.variants + EXCLUDED.variants,
+                quantity = v.quantity + EXCLUDED.quantity,
+                cost_value = v.cost_value + EXCLUDED.cost_value,
+                retail_value = v.retail_value + EXCLUDED.retail_value,
+                updated_at = EXCLUDED.updated_at;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_variants_valuation() RETURNS trigger AS $$
+        DECLARE
+            v_old products%ROWTYPE;
+            v_new products%ROWTYPE;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                SELECT * INTO v_old FROM products WHERE id = OLD.product_id;
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                SELECT * INTO v_new FROM products WHERE id = NEW.product_id;
+            END IF;
+
+            IF TG_OP = 'UPDATE' AND NEW.product_id = OLD.product_id THEN
+                IF NEW.amount IS NOT DISTINCT FROM OLD.amount
+                   AND NEW.come_in_price IS NOT DISTINCT FROM OLD.come_in_price
+                   AND NEW.current_price IS NOT DISTINCT FROM OLD.current_price THEN
+                    RETURN NULL;
+                END IF;
+                PERFORM apply_inventory_valuation(
+                    v_new.warehouse_id, v_new.subcategory_id, 0,
+                    NEW.amount::numeric - OLD.amount::numeric,
+                    NEW.amount::numeric * NEW.come_in_price::numeric - OLD.amount::numeric * OLD.come_in_price::numeric,
+                    NEW.amount::numeric * NEW.current_price::numeric - OLD.amount::numeric * OLD.current_price::numeric
+                );
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP <> 'INSERT' AND v_old.id IS NOT NULL THEN
+                PERFORM apply_inventory_valuation(
+                    v_old.warehouse_id, v_old.subcategory_id, -1,
+                    -OLD.amount::numeric,
+                    -(OLD.amount::numeric * OLD.come_in_price::numeric),
+                    -(OLD.amount::numeric * OLD.current_price::numeric)
+                );
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                PERFORM apply_inventory_valuation(
+                    v_new.warehouse_id, v_new.subcategory_id, 1,
+                    NEW.amount::numeric,
+                    NEW.amount::numeric * NEW.come_in_price::numeric,
+                    NEW.amount::numeric * NEW.current_price::numeric
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_product_variants_valuation
+        AFTER INSERT OR DELETE OR UPDATE OF amount, come_in_price, current_price, product_id ON product_variants
+        FOR EACH ROW EXECUTE FUNCTION product_variants_valuation();
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION products_valuation() RETURNS trigger AS $$
+        DECLARE
+            v_variants integer;
+            v_quantity numeric;
+            v_cost_value numeric;
+            v_retail_value numeric;
+        BEGIN
+            SELECT count(*), COALESCE(sum(amount::numeric), 0),
+                   COALESCE(sum(amount::numeric * come_in_price::numeric), 0),
+                   COALESCE(sum(amount::numeric * current_price::numeric), 0)
+              INTO v_variants, v_quantity, v_cost_value, v_retail_value
+              FROM product_variants
+             WHERE product_id = NEW.id;
+
+            IF v_variants > 0 THEN
+                PERFORM apply_inventory_valuation(
+                    OLD.warehouse_id, OLD.subcategory_id, -v_variants, -v_quantity, -v_cost_value, -v_retail_value
+                );
+                PERFORM apply_inventory_valuation(
+                    NEW.warehouse_id, NEW.subcategory_id, v_variants, v_quantity, v_cost_value, v_retail_value
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_products_valuation
+        AFTER UPDATE OF warehouse_id, subcategory_id ON products
+        FOR EACH ROW
+        WHEN (OLD.warehouse_id IS DISTINCT FROM NEW.warehouse_id OR OLD.subcategory_id IS DISTINCT FROM NEW.subcategory_id)
+        EXECUTE FUNCTION products_valuation();
+    """)
+
+    op.execute("""
+        INSERT INTO inventory_valuations
+            (warehouse_id, subcategory_id, variants, quantity, cost_value, retail_value, updated_at)
+        SELECT p.warehouse_id, p.subcategory_id, count(*),
+               COALESCE(sum(pv.amount::numeric), 0),
+               COALESCE(sum(pv.amount::numeric * pv.come_in_price::numeric), 0),
+               COALESCE(sum(pv.amount::numeric * pv.current_price::numeric), 0),
+               timezone('Asia/Tashkent', now())
+          FROM product_variants pv
+          JOIN products p ON p.id = pv.product_id
+         GROUP BY p.warehouse_id, p.subcategory_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_products_valuation ON products")
+    op.execute("DROP TRIGGER IF EXISTS trg_product_variants_valuation ON product_variants")
+    op.execute("DROP FUNCTION IF EXISTS products_valuation()")
+    op.execute("DROP FUNCTION IF EXISTS product_variants_valuation()")
+    op.execute("DROP FUNCTION IF EXISTS apply_inventory_valuation(integer, integer, integer, numeric, numeric, numeric)")
+    op.drop_index('ix_inventory_valuation_snapshots_warehouse_subcategory_day', table_name='inventory_valuation_snapshots')
+    op.drop_table('inventory_valuation_snapshots')
+    op.drop_table('inventory_valuations')
@@ -0,0 +1,32 @@
+"""admin orders idempotency key per warehouse
+
+Revision ID: d2b6f8a4c071
+Revises: a3e5c7b9d142
+Create Date: 2026-10-19 20:31:47.692318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b6f8a4c071'
+down_revision: Union[str, None] = 'a3e5c7b9d142'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keys are generated by each warehouse's clients, so they only need to be
+    # unique within the warehouse; a collision must not hide another's order.
+    op.create_index(
+        'uq_admin_orders_warehouse_idempotency_key', 'admin_orders', ['warehouse_id', 'idempotency_key'], unique=True
+    )
+    op.drop_index(op.f('ix_admin_orders_idempotency_key'), table_name='admin_orders')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_admin_orders_idempotency_key'), 'admin_orders', ['idempotency_key'], unique=True)
+    op.drop_index('uq_admin_orders_warehouse_idempotency_key', table_name='admin_orders')
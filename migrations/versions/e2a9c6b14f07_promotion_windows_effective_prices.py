@@ -0,0 +1,61 @@
+"""promotion windows and effective prices
+
+Revision ID: e2a9c6b14f07
+Revises: b7e3d0f45a12
+Create Date: 2026-10-19 10:58:22.304117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c6b14f07'
+down_revision: Union[str, None] = 'b7e3d0f45a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('promotions', sa.Column('start_date', sa.DateTime(), nullable=True))
+    op.add_column('promotions', sa.Column('end_date', sa.DateTime(), nullable=True))
+    op.add_column('promotions', sa.Column('priority', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('promotions', sa.Column('is_stackable', sa.Boolean(), server_default='false', nullable=False))
+
+    op.create_table(
+        'variant_effective_prices',
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('discount', sa.Float(), nullable=False),
+        sa.Column('promotion_id', sa.Integer(), nullable=True),
+        sa.Column('valid_until', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['promotion_id'], ['promotions.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_variant_id')
+    )
+    op.create_index(op.f('ix_variant_effective_prices_warehouse_id'), 'variant_effective_prices', ['warehouse_id'], unique=False)
+    op.create_index(op.f('ix_variant_effective_prices_valid_until'), 'variant_effective_prices', ['valid_until'], unique=False)
+
+    # Seed already expired rows so the refresh job computes real discounts on its first run.
+    op.execute("""
+        INSERT INTO variant_effective_prices (product_variant_id, warehouse_id, discount, valid_until, updated_at)
+        SELECT DISTINCT ON (ppv.product_variant_id) ppv.product_variant_id, p.warehouse_id, 0, now()::timestamp, now()
+        FROM promotion_product_variants ppv
+        JOIN promotions p ON p.id = ppv.promotion_id
+        WHERE p.is_active
+        ORDER BY ppv.product_variant_id, p.created_at DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_variant_effective_prices_valid_until'), table_name='variant_effective_prices')
+    op.drop_index(op.f('ix_variant_effective_prices_warehouse_id'), table_name='variant_effective_prices')
+    op.drop_table('variant_effective_prices')
+    op.drop_column('promotions', 'is_stackable')
+    op.drop_column('promotions', 'priority')
+    op.drop_column('promotions', 'end_date')
+    op.drop_column('promotions', 'start_date')
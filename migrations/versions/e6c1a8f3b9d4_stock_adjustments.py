@@ -0,0 +1,54 @@
+"""stock adjustments
+
+Revision ID: e6c1a8f3b9d4
+Revises: 9b4e2d7a6c13
+Create Date: 2026-10-19 18:05:27.661038
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6c1a8f3b9d4'
+down_revision: Union[str, None] = '9b4e2d7a6c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('revisions', sa.Column('applied_items', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('revisions', sa.Column('last_applied_item_id', sa.Integer(), nullable=True))
+
+    op.create_table(
+        'stock_adjustments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('revision_id', sa.Integer(), nullable=False),
+        sa.Column('product_variant_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse_id', sa.Integer(), nullable=False),
+        sa.Column('previous_amount', sa.Float(), nullable=False),
+        sa.Column('new_amount', sa.Float(), nullable=False),
+        sa.Column('difference', sa.Float(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['revision_id'], ['revisions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_variant_id'], ['product_variants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['created_by'], ['admin_users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_stock_adjustments_revision_id', 'stock_adjustments', ['revision_id'], unique=False)
+    op.create_index(
+        'ix_stock_adjustments_variant_created_at', 'stock_adjustments', ['product_variant_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_adjustments_variant_created_at', table_name='stock_adjustments')
+    op.drop_index('ix_stock_adjustments_revision_id', table_name='stock_adjustments')
+    op.drop_table('stock_adjustments')
+    op.drop_column('revisions', 'last_applied_item_id')
+    op.drop_column('revisions', 'applied_items')